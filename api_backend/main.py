@@ -4,33 +4,132 @@ FastAPI application exposing the Zomato AI recommendation pipeline.
 Endpoints:
 - GET  /health           : Basic health check.
 - GET  /cities           : List of available cities in the dataset.
+- GET  /price-range      : Min/max price for two in the dataset, or a
+                           city's price quantiles and histogram.
+- GET  /search           : Free-text restaurant search.
+- GET  /restaurants/{id}/similar : Precomputed similar restaurants.
+- GET  /metrics          : Candidate and LLM response cache counters.
 - POST /recommendations  : Full pipeline (Phases 2–5) with Groq LLM.
+
+Set ZOMATO_REFRESH_INTERVAL_SECONDS to refresh the data in the background;
+each refresh swaps in a new store version without a restart.
+
+POST /recommendations is a coroutine: candidate lookup runs in the thread
+pool and the LLM call is awaited, so a pending LLM response holds no
+thread. LLM responses are cached per store version (memory plus an
+on-disk SQLite tier shared by workers), so repeated prompts skip the LLM.
 """
 
 from __future__ import annotations
 
-from dataclasses import asdict
-from typing import List, Optional
+import os
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
 
-import pandas as pd
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
-from phase1_data_ingestion.pipeline import build_phase1_store
+from phase1_data_ingestion.config import DEFAULT_SNAPSHOT_CONFIG
+from phase1_data_ingestion.pipeline import build_phase1_store, refresh_phase1_store
+from phase1_data_ingestion.price_profiles import QUANTILE_LEVELS
+from phase1_data_ingestion.storage import RestaurantStore
+from phase2_user_input.city_resolution import CityResolver
 from phase2_user_input.models import RawUserInput
 from phase2_user_input.validation import InputNormalizer, InputValidator
+from phase3_integration.candidate_cache import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_ENTRIES,
+    CandidateCache,
+)
+from phase3_integration.candidate_view import CandidateView
+from phase3_integration.canonical import QueryCanonicalizer
 from phase3_integration.repository import RestaurantRepository
 from phase3_integration.service import RecommendationPreparationService
-from phase4_recommendation.llm_client import GroqAPIClient
+from phase4_recommendation.llm_cache import (
+    DEFAULT_MAX_DISK_ENTRIES,
+    DEFAULT_TTL_SECONDS,
+    CachingLLMClient,
+    DiskResponseStore,
+    LLMResponseCache,
+)
+from phase4_recommendation.llm_client import aclose_groq_client, get_groq_client
 from phase4_recommendation.models import RecommendedRestaurant
+from phase4_recommendation.ranking import RuleBasedRecommender, ScoringWeights
 from phase4_recommendation.service import (
     LLMRecommendationError,
     LLMRecommendationService,
 )
+from phase4_recommendation.single_flight import SingleFlight
+
+from .refresher import StoreRefresher
+
+# Seconds between background data refreshes; 0 disables refreshing.
+REFRESH_INTERVAL_SECONDS = float(os.getenv("ZOMATO_REFRESH_INTERVAL_SECONDS", "0"))
+
+# Candidate sets cached across requests for the current store version.
+CANDIDATE_CACHE = CandidateCache(
+    max_entries=int(os.getenv("ZOMATO_CANDIDATE_CACHE_ENTRIES", str(DEFAULT_MAX_ENTRIES))),
+    max_bytes=int(
+        float(os.getenv("ZOMATO_CANDIDATE_CACHE_MB", str(DEFAULT_MAX_BYTES >> 20))) * (1 << 20)
+    ),
+)
+
+
+def _llm_cache_path() -> str:
+    """
+    ZOMATO_LLM_CACHE_PATH as an absolute path, by default a file in the
+    snapshot directory; empty when the disk tier is off.
+    """
+    default = Path(DEFAULT_SNAPSHOT_CONFIG.directory) / "llm_cache.sqlite"
+    path = os.getenv("ZOMATO_LLM_CACHE_PATH", str(default))
+    return str(Path(path).expanduser().resolve()) if path else ""
+
+
+# LLM responses by prompt fingerprint; an empty ZOMATO_LLM_CACHE_PATH keeps
+# them in memory only. Resolved once, so a later chdir cannot move the file.
+_LLM_CACHE_PATH = _llm_cache_path()
+LLM_CACHE = LLMResponseCache(
+    max_entries=int(os.getenv("ZOMATO_LLM_CACHE_ENTRIES", "1024")),
+    ttl_seconds=float(os.getenv("ZOMATO_LLM_CACHE_TTL_SECONDS", str(DEFAULT_TTL_SECONDS))),
+    disk=(
+        DiskResponseStore(
+            _LLM_CACHE_PATH,
+            max_entries=int(
+                os.getenv("ZOMATO_LLM_CACHE_DISK_ENTRIES", str(DEFAULT_MAX_DISK_ENTRIES))
+            ),
+        )
+        if _LLM_CACHE_PATH
+        else None
+    ),
+)
+
+# Concurrent requests with the same prompt wait on one in-flight LLM call.
+LLM_FLIGHTS = SingleFlight()
+
+# Pre-ranking of candidates; a malformed ZOMATO_SCORE_WEIGHTS fails here,
+# at startup, rather than on every request.
+RANKER = RuleBasedRecommender(weights=ScoringWeights.from_env())
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    refresher = None
+    if REFRESH_INTERVAL_SECONDS > 0:
+        refresher = StoreRefresher(refresh_store, REFRESH_INTERVAL_SECONDS)
+        refresher.start()
+    try:
+        yield
+    finally:
+        if refresher is not None:
+            refresher.stop()
+        await aclose_groq_client()
 
 
-app = FastAPI(title="Zomato AI Recommendation Service")
+app = FastAPI(title="Zomato AI Recommendation Service", lifespan=_lifespan)
 
 # Allow local frontends (e.g., file://, localhost) to call the API during development.
 app.add_middleware(
@@ -44,53 +143,126 @@ app.add_middleware(
 
 # --- Startup: build dataset store and shared services ---
 
-_STORE = build_phase1_store()
-
 
-def _find_city_column(df: pd.DataFrame) -> Optional[str]:
-    for col in df.columns:
+def _find_city_column(columns: Sequence[str]) -> Optional[str]:
+    for col in columns:
         if str(col).strip().lower() == "city":
             return col
     return None
 
 
-def _find_price_column(df: pd.DataFrame) -> Optional[str]:
+def _find_price_column(columns: Sequence[str]) -> Optional[str]:
     target = "approx_cost(for two people)"
-    for col in df.columns:
+    for col in columns:
         if str(col).strip().lower() == target.lower():
             return col
     return None
 
 
-city_col = _find_city_column(_STORE.data)
-if city_col is not None:
-    _CITIES: List[str] = (
-        _STORE.data[city_col]
-        .dropna()
-        .astype(str)
-        .str.strip()
-        .str.lower()
-        .unique()
-        .tolist()
+@dataclass(frozen=True)
+class ServingState:
+    """
+    One store version plus everything derived from it.
+
+    Handlers read the current state once per request and use only that
+    object, so a refresh that swaps in a new state never mixes versions
+    within a request and needs no locks on the read path.
+    """
+
+    store: RestaurantStore
+    cities: List[str]
+    price_min: float
+    price_max: float
+    prep_service: RecommendationPreparationService
+
+
+def build_serving_state(store: RestaurantStore) -> ServingState:
+    city_col = _find_city_column(store.columns)
+    if city_col is not None:
+        cities: List[str] = list(
+            dict.fromkeys(str(c).strip().lower() for c in store.distinct_values(city_col))
+        )
+    else:
+        cities = []
+
+    price_col = _find_price_column(store.columns)
+    price_range = store.value_range(price_col) if price_col is not None else None
+    if price_range is not None:
+        price_min, price_max = price_range
+    else:
+        # Sensible defaults if column is missing.
+        price_min = 100.0
+        price_max = 3000.0
+
+    resolver = (
+        CityResolver(cities, localities=_locality_cities(store, city_col)) if cities else None
     )
-else:
-    _CITIES = []
-
-price_col = _find_price_column(_STORE.data)
-if price_col is not None:
-    _PRICE_MIN = float(_STORE.data[price_col].min())
-    _PRICE_MAX = float(_STORE.data[price_col].max())
-else:
-    # Sensible defaults if column is missing.
-    _PRICE_MIN = 100.0
-    _PRICE_MAX = 3000.0
-
-_validator = InputValidator(allowed_cities=_CITIES or None)
-_normalizer = InputNormalizer()
-_repository = RestaurantRepository(store=_STORE)
-_prep_service = RecommendationPreparationService(
-    repository=_repository, validator=_validator, normalizer=_normalizer
-)
+    validator = InputValidator(resolver=resolver)
+    normalizer = InputNormalizer(price_profiles=store.price_profiles)
+    repository = RestaurantRepository(store=store, cache=CANDIDATE_CACHE)
+    prep_service = RecommendationPreparationService(
+        repository=repository,
+        validator=validator,
+        normalizer=normalizer,
+        # Equivalent budgets share one prompt, and so one cached LLM answer.
+        canonicalizer=QueryCanonicalizer(),
+    )
+    return ServingState(
+        store=store,
+        cities=cities,
+        price_min=price_min,
+        price_max=price_max,
+        prep_service=prep_service,
+    )
+
+
+def _locality_cities(store: RestaurantStore, city_col: Optional[str]) -> Dict[str, str]:
+    """
+    Locality -> city, taking the city most listings of a locality are in.
+    """
+    if city_col is None or "location" not in store.columns or store.is_empty():
+        return {}
+    pairs = store.take(range(store.count()), ["location", city_col]).dropna()
+    pairs = pairs.astype(str)
+    counts = pairs.groupby(["location", city_col]).size().sort_values(ascending=False)
+    localities: Dict[str, str] = {}
+    for (location, city), _ in counts.items():
+        localities.setdefault(location, city)
+    return localities
+
+
+_STATE = build_serving_state(build_phase1_store())
+CANDIDATE_CACHE.activate(_STATE.store.version)
+LLM_CACHE.activate(_STATE.store.version)
+
+
+def current_state() -> ServingState:
+    return _STATE
+
+
+def swap_store(store: RestaurantStore) -> bool:
+    """
+    Publish a new store version. Returns False if it is already current.
+
+    The new state is fully built before a single reference assignment
+    makes it visible; in-flight requests keep the state they started with.
+    """
+    global _STATE
+    if store is _STATE.store or (store.version and store.version == _STATE.store.version):
+        return False
+    _STATE = build_serving_state(store)
+    # Candidate sets and LLM responses of the previous version are no
+    # longer served.
+    CANDIDATE_CACHE.activate(store.version)
+    LLM_CACHE.activate(store.version)
+    return True
+
+
+def refresh_store() -> bool:
+    """
+    Rebuild the store from the dataset (incrementally) and swap it in.
+    """
+    return swap_store(refresh_phase1_store(current_state().store))
 
 
 # --- Pydantic models ---
@@ -103,11 +275,55 @@ class RecommendationRequest(BaseModel):
         description="Budget text: '800' or '500-1200'. Optional.",
         examples=["800", "500-1200"],
     )
+    cuisine: Optional[str] = Field(
+        None,
+        description="Cuisine or comma-separated cuisines (any may match). Optional.",
+        examples=["North Indian", "Chinese, Thai"],
+    )
+    min_rating: Optional[float] = Field(
+        None, ge=0, le=5, description="Minimum rating out of 5. Optional."
+    )
+    online_order: Optional[bool] = Field(None, description="Must offer online ordering.")
+    book_table: Optional[bool] = Field(None, description="Must take table bookings.")
+    locality: Optional[str] = Field(
+        None, description="Neighbourhood within the city, e.g. 'Indiranagar'. Optional."
+    )
+    rest_type: Optional[str] = Field(
+        None,
+        description="Restaurant type(s), comma separated, e.g. 'Cafe'. Optional.",
+        examples=["Cafe", "Casual Dining, Bar"],
+    )
+    query: Optional[str] = Field(
+        None,
+        max_length=200,
+        description="Free-text description; candidates are ordered by relevance. Optional.",
+        examples=["rooftop biryani place good for groups"],
+    )
+
+    def to_raw_input(self) -> RawUserInput:
+        return RawUserInput(
+            city=self.city,
+            price_text=self.price_text or "",
+            cuisine_text=self.cuisine or "",
+            min_rating_text="" if self.min_rating is None else str(self.min_rating),
+            online_order_text=_yes_no_text(self.online_order),
+            book_table_text=_yes_no_text(self.book_table),
+            locality=self.locality or "",
+            rest_type_text=self.rest_type or "",
+            query_text=self.query or "",
+        )
+
+
+def _yes_no_text(value: Optional[bool]) -> str:
+    if value is None:
+        return ""
+    return "yes" if value else "no"
 
 
 class RecommendationError(BaseModel):
     field: str
     message: str
+    suggestions: List[str] = Field(default_factory=list)
 
 
 class RecommendationItem(BaseModel):
@@ -132,17 +348,125 @@ class ErrorResponse(BaseModel):
 
 @app.get("/health")
 def health() -> dict:
-    return {"status": "ok", "restaurants_loaded": _STORE.count()}
+    state = current_state()
+    return {
+        "status": "ok",
+        "restaurants_loaded": state.store.count(),
+        "store_version": state.store.version,
+    }
 
 
 @app.get("/cities")
 def list_cities() -> dict:
-    return {"cities": _CITIES}
+    return {"cities": current_state().cities}
 
 
 @app.get("/price-range")
-def get_price_range() -> dict:
-    return {"min": _PRICE_MIN, "max": _PRICE_MAX}
+def get_price_range(city: Optional[str] = None) -> dict:
+    state = current_state()
+    if city is None:
+        return {"min": state.price_min, "max": state.price_max}
+
+    profile = (state.store.price_profiles or {}).get(city.strip().lower())
+    if profile is None:
+        raise HTTPException(
+            status_code=404,
+            detail=[{"field": "city", "message": "No price data for this city."}],
+        )
+    return {
+        "min": profile.quantiles[0],
+        "max": profile.quantiles[-1],
+        "count": profile.count,
+        "quantiles": {
+            f"p{round(level * 100)}": value
+            for level, value in zip(QUANTILE_LEVELS, profile.quantiles)
+        },
+        "histogram": {
+            "edges": list(profile.histogram_edges),
+            "counts": list(profile.histogram_counts),
+        },
+    }
+
+
+@app.get("/search")
+def search_restaurants(q: str, city: Optional[str] = None, k: int = 10) -> dict:
+    """
+    Free-text search ("rooftop biryani place good for groups"), optionally
+    within one city; results carry their relevance score.
+    """
+    state = current_state()
+    if state.store.text_index is None:
+        raise HTTPException(
+            status_code=503,
+            detail=[{"field": "q", "message": "Free-text search is not available."}],
+        )
+    k = max(1, min(k, 100))
+    city_key = city.strip().lower() if city else None
+    view = state.prep_service.repository.search(q, k=k, city=city_key)
+    return {"query": q, "results": _restaurant_records(view)}
+
+
+@app.get("/restaurants/{restaurant_id}/similar")
+def similar_restaurants(restaurant_id: int, k: int = 10) -> dict:
+    """
+    Restaurants most like the given one (same city; cuisines, type, price
+    and rating), read from the lists precomputed at ingest.
+    """
+    state = current_state()
+    if state.store.neighbors is None:
+        raise HTTPException(
+            status_code=503,
+            detail=[
+                {"field": "restaurant_id", "message": "Similar restaurants are not available."}
+            ],
+        )
+    repository = state.prep_service.repository
+    view = repository.similar(restaurant_id, k=max(1, min(k, 100)))
+    if view is None:
+        raise HTTPException(
+            status_code=404,
+            detail=[{"field": "restaurant_id", "message": "Unknown restaurant."}],
+        )
+    restaurant = CandidateView(state.store, [repository.position_of(restaurant_id)])
+    return {
+        "restaurant": _restaurant_records(restaurant)[0],
+        "similar": _restaurant_records(view),
+    }
+
+
+def _restaurant_records(view: CandidateView) -> List[Dict[str, Any]]:
+    """
+    Display fields of each row of a view, plus its score when it has one.
+    """
+    columns = [
+        col
+        for col in (
+            "restaurant_id",
+            "name",
+            "city",
+            "cuisines",
+            "approx_cost(for two people)",
+            "aggregate_rating",
+        )
+        if col in view.columns
+    ]
+    rows = view.to_frame(columns).astype(object).where(lambda df: df.notna(), None)
+    records = rows.to_dict("records")
+    for position, record in enumerate(records):
+        record["price_for_two"] = record.pop("approx_cost(for two people)", None)
+        record["rating"] = record.pop("aggregate_rating", None)
+        if view.relevance is not None:
+            record["score"] = round(float(view.relevance[position]), 4)
+    return records
+
+
+@app.get("/metrics")
+def metrics() -> dict:
+    return {
+        "candidate_cache": CANDIDATE_CACHE.stats().to_dict(),
+        "llm_cache": LLM_CACHE.stats().to_dict(),
+        "llm_single_flight": LLM_FLIGHTS.stats().to_dict(),
+    }
 
 
 @app.post(
@@ -150,16 +474,18 @@ def get_price_range() -> dict:
     response_model=RecommendationResponse,
     responses={400: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
 )
-def get_recommendations(payload: RecommendationRequest):
-    # Phase 2–3: validate, normalize, and fetch candidates.
-    raw = RawUserInput(city=payload.city, price_text=payload.price_text or "")
-    prep_result = _prep_service.prepare(raw)
+async def get_recommendations(payload: RecommendationRequest):
+    # Phase 2–3: validate, normalize, and fetch candidates (CPU-bound, so
+    # off the event loop).
+    state = current_state()
+    raw = payload.to_raw_input()
+    prep_result = await run_in_threadpool(state.prep_service.prepare, raw)
 
     if not prep_result.is_valid:
         raise HTTPException(
             status_code=400,
             detail=[
-                {"field": err.field, "message": err.message}
+                {"field": err.field, "message": err.message, "suggestions": err.suggestions}
                 for err in prep_result.errors
             ],
         )
@@ -170,19 +496,25 @@ def get_recommendations(payload: RecommendationRequest):
     if prep_result.candidates.empty:
         return RecommendationResponse(recommendations=[])
 
-    # Phase 4: call Groq LLM via GroqAPIClient.
+    # Phase 4: call Groq LLM through the shared, connection-pooled client.
     try:
-        llm_client = GroqAPIClient()  # expects GROQ_API_KEY to be set
+        llm_client = get_groq_client()  # expects GROQ_API_KEY to be set
     except ValueError as exc:
         raise HTTPException(
             status_code=503,
             detail=[{"field": "llm", "message": str(exc)}],
         ) from exc
 
-    llm_service = LLMRecommendationService(llm_client=llm_client)
+    llm_service = LLMRecommendationService(
+        llm_client=CachingLLMClient(llm_client, LLM_CACHE),
+        ranker=RANKER,
+        flights=LLM_FLIGHTS,
+    )
     try:
-        recs: List[RecommendedRestaurant] = llm_service.recommend(
-            prep_result.normalized_input, prep_result.candidates
+        recs: List[RecommendedRestaurant] = await llm_service.arecommend(
+            prep_result.normalized_input,
+            prep_result.candidates,
+            cache_key=prep_result.cache_key,
         )
     except LLMRecommendationError as exc:
         raise HTTPException(
@@ -0,0 +1,63 @@
+"""
+Background data refresh for the API.
+
+Runs a refresh callable on a fixed interval in a daemon thread. The
+callable builds the next store version and swaps it in; failures are
+reported and retried on the next tick instead of killing the thread.
+"""
+
+from __future__ import annotations
+
+import threading
+import traceback
+from typing import Callable, Optional
+
+
+class StoreRefresher:
+    """
+    Calls `refresh()` every `interval_seconds` until stopped.
+    """
+
+    def __init__(self, refresh: Callable[[], bool], interval_seconds: float) -> None:
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive.")
+        self._refresh = refresh
+        self._interval = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refresh_count = 0
+        self.swap_count = 0
+        self.last_error: Optional[str] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="store-refresher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self) -> bool:
+        """
+        Run one refresh now. Returns True if a new version was swapped in.
+        """
+        try:
+            swapped = self._refresh()
+        except Exception:  # pragma: no cover - depends on network/data
+            self.last_error = traceback.format_exc()
+            return False
+        self.refresh_count += 1
+        self.last_error = None
+        if swapped:
+            self.swap_count += 1
+        return swapped
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.run_once()
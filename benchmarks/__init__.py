@@ -0,0 +1,8 @@
+"""
+Offline performance benchmarks.
+
+Each module is runnable on its own, e.g.:
+
+  python -m benchmarks.bench_parallel_cleaning
+  python -m benchmarks.bench_ingestion
+"""
@@ -0,0 +1,125 @@
+"""
+Benchmark: multi-attribute filters with a bitmap index vs. brute-force masks.
+
+For each dataset size, runs conjunctive queries over cuisines, restaurant
+type, online ordering and table booking two ways:
+
+- whole dataset: one pandas string mask per predicate over every row vs.
+  bitwise AND/OR of precomputed bitsets;
+- within a city/price window (the repository path): string matching on
+  the window's rows vs. bit tests on them.
+
+Results are checked to be identical before timing.
+
+Usage:
+  python -m benchmarks.bench_bitmap_filters [rows ...]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from typing import Callable, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from phase1_data_ingestion.data_cleaner import DataCleaner
+from phase1_data_ingestion.storage import InMemoryRestaurantStore
+from phase1_data_ingestion.synthetic import SyntheticZomatoGenerator
+from phase2_user_input.models import NormalizedUserInput
+from phase3_integration.bitmap_index import BitmapIndex
+from phase3_integration.repository import RestaurantRepository, _any_item_pattern, _text_mask
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+QUERIES = (
+    dict(cuisines=["north indian", "chinese"], online_order=True),
+    dict(cuisines=["cafe"], rest_types=["cafe", "dessert parlor"], book_table=False),
+    dict(cuisines=["biryani"], rest_types=["casual dining"], online_order=True, book_table=True),
+)
+
+REPEATS = 20
+
+
+def brute_force(df: pd.DataFrame, query: dict) -> np.ndarray:
+    mask = np.ones(len(df.index), dtype=bool)
+    if query.get("cuisines"):
+        mask &= _text_mask(df["cuisines"], _any_item_pattern(query["cuisines"]))
+    if query.get("rest_types"):
+        mask &= _text_mask(df["rest_type"], _any_item_pattern(query["rest_types"]))
+    for column in ("online_order", "book_table"):
+        if column in query:
+            mask &= _text_mask(df[column], "^yes$" if query[column] else "^no$")
+    return np.flatnonzero(mask)
+
+
+def bitmap_conditions(query: dict) -> list:
+    conditions = []
+    if query.get("cuisines"):
+        conditions.append(("cuisines", query["cuisines"]))
+    if query.get("rest_types"):
+        conditions.append(("rest_type", query["rest_types"]))
+    for column in ("online_order", "book_table"):
+        if column in query:
+            conditions.append((column, ["yes" if query[column] else "no"]))
+    return conditions
+
+
+def _per_call_ms(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn()
+    return (time.perf_counter() - start) / REPEATS * 1e3
+
+
+def run(rows: int) -> List[str]:
+    df = DataCleaner().clean(SyntheticZomatoGenerator(rows).load()).reset_index(drop=True)
+    store = InMemoryRestaurantStore(data=df)
+
+    start = time.perf_counter()
+    bitmaps = BitmapIndex.build(df)
+    build_s = time.perf_counter() - start
+    with_bitmaps = RestaurantRepository(store=store, bitmaps=bitmaps)
+    strings_only = RestaurantRepository(store=store, bitmaps=BitmapIndex.build(df, columns=()))
+
+    lines = [
+        f"rows={len(df.index)} bitmap_build={build_s:.3f}s "
+        f"bitmap_size={bitmaps.nbytes() / 2**20:.1f}MiB"
+    ]
+    for query in QUERIES:
+        conditions = bitmap_conditions(query)
+        expected = brute_force(df, query)
+        np.testing.assert_array_equal(bitmaps.select(conditions), expected)
+        scan_ms = _per_call_ms(lambda: brute_force(df, query))
+        bitmap_ms = _per_call_ms(lambda: bitmaps.select(conditions))
+
+        user_input = NormalizedUserInput(
+            city="bangalore", price_range=(300.0, 900.0), price_bucket=None, **query
+        )
+        pd.testing.assert_frame_equal(
+            with_bitmaps.get_candidates(user_input).to_frame(),
+            strings_only.get_candidates(user_input).to_frame(),
+        )
+        window_strings_ms = _per_call_ms(lambda: strings_only.get_candidates(user_input))
+        window_bitmap_ms = _per_call_ms(lambda: with_bitmaps.get_candidates(user_input))
+
+        lines.append(
+            f"  {sorted(query)} matches={len(expected)} "
+            f"full: mask={scan_ms:.2f}ms bitmap={bitmap_ms:.2f}ms | "
+            f"city+price: strings={window_strings_ms:.2f}ms bitmap={window_bitmap_ms:.2f}ms"
+        )
+    return lines
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    if argv is None:
+        argv = sys.argv[1:]
+    sizes = [int(arg) for arg in argv] or list(SIZES)
+    for rows in sizes:
+        for line in run(rows):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
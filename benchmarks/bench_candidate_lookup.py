@@ -0,0 +1,91 @@
+"""
+Benchmark: candidate lookup with full-frame masks vs. the city/price index.
+
+For each dataset size, times the old approach (boolean masks over the
+whole frame for city and both price bounds, then a copy) against
+`RestaurantRepository.get_candidates()`, which finds the city block and
+price window with a binary search and returns a lazy `CandidateView`.
+Both must return the same rows; the index's cost follows the number of
+matching rows, not the frame size.
+
+Usage:
+  python -m benchmarks.bench_candidate_lookup [rows ...]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from typing import List, Sequence
+
+import pandas as pd
+
+from phase1_data_ingestion.data_cleaner import DataCleaner
+from phase1_data_ingestion.storage import InMemoryRestaurantStore
+from phase1_data_ingestion.synthetic import SyntheticZomatoGenerator
+from phase2_user_input.models import NormalizedUserInput
+from phase3_integration.repository import RestaurantRepository
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+QUERIES = (
+    ("bangalore", (400.0, 600.0)),
+    ("mumbai", (1_000.0, 1_200.0)),
+    ("pune", (200.0, 300.0)),
+)
+
+REPEATS = 50
+
+
+def mask_lookup(df: pd.DataFrame, city: str, lower: float, upper: float) -> pd.DataFrame:
+    price = df["approx_cost(for two people)"]
+    df = df[df["city"] == city]
+    df = df[price.loc[df.index] >= lower]
+    df = df[price.loc[df.index] <= upper]
+    return df.reset_index(drop=True)
+
+
+def run(rows: int) -> str:
+    df = DataCleaner().clean(SyntheticZomatoGenerator(rows).load()).reset_index(drop=True)
+
+    start = time.perf_counter()
+    repo = RestaurantRepository(store=InMemoryRestaurantStore(data=df))
+    build_s = time.perf_counter() - start
+
+    mask_s = index_s = 0.0
+    matched = 0
+    for city, (lower, upper) in QUERIES:
+        user_input = NormalizedUserInput(city=city, price_range=(lower, upper), price_bucket=None)
+        expected = mask_lookup(df, city, lower, upper)
+        pd.testing.assert_frame_equal(repo.get_candidates(user_input).to_frame(), expected)
+        matched += len(expected.index)
+
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            mask_lookup(df, city, lower, upper)
+        mask_s += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            repo.get_candidates(user_input)
+        index_s += time.perf_counter() - start
+
+    per_query = REPEATS * len(QUERIES)
+    return (
+        f"rows={len(df.index)} matched={matched // len(QUERIES)}/query "
+        f"index_build={build_s:.3f}s "
+        f"mask={mask_s / per_query * 1e3:.3f}ms/query "
+        f"index={index_s / per_query * 1e3:.3f}ms/query"
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    if argv is None:
+        argv = sys.argv[1:]
+    sizes: List[int] = [int(arg) for arg in argv] or list(SIZES)
+    for rows in sizes:
+        print(run(rows))
+
+
+if __name__ == "__main__":
+    main()
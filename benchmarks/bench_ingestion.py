@@ -0,0 +1,127 @@
+"""
+Benchmark: Phase 1 ingestion at growing row counts, fully offline.
+
+For each size, a fresh process generates a synthetic Zomato-shaped
+dataset and times the three ingestion stages:
+
+- load:  generate the raw frame (stands in for the Hugging Face download)
+- clean: entity resolution, normalization and dtype compaction
+- index: build the store and everything ingest builds for serving:
+         price profiles, the repository's city/price and bitmap indexes,
+         the free-text index and the similar-restaurant lists
+
+Peak RSS is read after each stage, so the growth per stage is visible,
+and the index stage is broken down per structure. Each size runs in its
+own process because peak RSS never goes down. Similar-restaurant lists
+are quadratic in a city's size, so they dominate at large sizes.
+
+Usage:
+  python -m benchmarks.bench_ingestion [max_rows]
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence
+
+from phase1_data_ingestion.neighbors import build_neighbor_index
+from phase1_data_ingestion.pipeline import default_cleaner
+from phase1_data_ingestion.price_profiles import compute_price_profiles
+from phase1_data_ingestion.storage import InMemoryRestaurantStore
+from phase1_data_ingestion.synthetic import SyntheticZomatoGenerator
+from phase1_data_ingestion.text_index import build_text_index, iter_text_frames
+from phase3_integration.repository import RestaurantRepository
+
+# Index stage parts, in build order.
+INDEX_PARTS = ("profiles", "repository", "text", "neighbors")
+
+SIZES = (10_000, 100_000, 1_000_000, 10_000_000)
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build_indexes(store: InMemoryRestaurantStore) -> Dict[str, float]:
+    """
+    Build what ingest and serving build for a store version, as the
+    pipeline does; returns seconds per part.
+    """
+    timings: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    store.price_profiles = compute_price_profiles(store.data)
+    timings["profiles"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    RestaurantRepository(store=store)
+    timings["repository"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store.text_index = build_text_index(iter_text_frames(store))
+    timings["text"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store.neighbors = build_neighbor_index(store)
+    timings["neighbors"] = time.perf_counter() - start
+    return timings
+
+
+def measure(rows: int) -> Dict[str, float]:
+    """
+    Time each stage for one dataset size (run in a fresh process).
+    """
+    result: Dict[str, float] = {"rows": rows}
+
+    start = time.perf_counter()
+    raw = SyntheticZomatoGenerator(rows).load()
+    result["load_s"] = time.perf_counter() - start
+    result["load_rss_mb"] = _peak_rss_mb()
+
+    start = time.perf_counter()
+    cleaned = default_cleaner().clean(raw)
+    result["clean_s"] = time.perf_counter() - start
+    result["clean_rss_mb"] = _peak_rss_mb()
+    del raw
+
+    start = time.perf_counter()
+    store = InMemoryRestaurantStore(data=cleaned.reset_index(drop=True))
+    for part, seconds in build_indexes(store).items():
+        result[f"{part}_s"] = seconds
+    result["index_s"] = time.perf_counter() - start
+    result["index_rss_mb"] = _peak_rss_mb()
+    result["entities"] = store.count()
+    return result
+
+
+def run(sizes: Sequence[int]) -> List[str]:
+    lines = []
+    context = multiprocessing.get_context("spawn")
+    for rows in sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            r = pool.submit(measure, rows).result()
+        lines.append(
+            f"rows={rows} entities={r['entities']} "
+            f"load={r['load_s']:.3f}s clean={r['clean_s']:.3f}s index={r['index_s']:.3f}s "
+            f"peak_rss_mb load={r['load_rss_mb']:.0f} "
+            f"clean={r['clean_rss_mb']:.0f} index={r['index_rss_mb']:.0f} | index: "
+            + " ".join(f"{part}={r[f'{part}_s']:.2f}s" for part in INDEX_PARTS)
+        )
+    return lines
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    if argv is None:
+        argv = sys.argv[1:]
+    max_rows = int(argv[0]) if len(argv) >= 1 else 1_000_000
+    for line in run([rows for rows in SIZES if rows <= max_rows]):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
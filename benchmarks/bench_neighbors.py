@@ -0,0 +1,76 @@
+"""
+Benchmark: similar-restaurant lists for one large city.
+
+Every row of a synthetic dataset is put in the same city, the worst case
+for `build_neighbor_index` (cost is quadratic in a city's size). Each
+size runs in a fresh process and reports build time and the peak RSS
+growth of the build over the loaded store; with tiled distances the
+growth is the (rows, k) result plus one city's features, not rows^2.
+
+Usage:
+  python -m benchmarks.bench_neighbors [rows ...]
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence
+
+from phase1_data_ingestion.data_cleaner import DataCleaner
+from phase1_data_ingestion.neighbors import build_neighbor_index
+from phase1_data_ingestion.storage import InMemoryRestaurantStore
+from phase1_data_ingestion.synthetic import SyntheticZomatoGenerator
+
+SIZES = (10_000, 50_000, 100_000)
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(rows: int) -> Dict[str, float]:
+    """
+    Build the lists for a single city of `rows` rows (run in a fresh process).
+    """
+    df = DataCleaner().clean(SyntheticZomatoGenerator(rows).load()).reset_index(drop=True)
+    store = InMemoryRestaurantStore(data=df.assign(city="bangalore"))
+    before = _peak_rss_mb()
+
+    start = time.perf_counter()
+    index = build_neighbor_index(store)
+    return {
+        "rows": store.count(),
+        "build_s": time.perf_counter() - start,
+        "growth_mb": _peak_rss_mb() - before,
+        "result_mb": index.nbytes / 2**20,
+    }
+
+
+def run(sizes: Sequence[int]) -> List[str]:
+    lines = []
+    context = multiprocessing.get_context("spawn")
+    for rows in sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            r = pool.submit(measure, rows).result()
+        lines.append(
+            f"city rows={r['rows']} build={r['build_s']:.2f}s "
+            f"peak rss growth={r['growth_mb']:.0f}MiB (result {r['result_mb']:.0f}MiB)"
+        )
+    return lines
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    if argv is None:
+        argv = sys.argv[1:]
+    sizes: List[int] = [int(arg) for arg in argv] or list(SIZES)
+    for line in run(sizes):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
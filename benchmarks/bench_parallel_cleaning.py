@@ -0,0 +1,60 @@
+"""
+Benchmark: serial vs. process-pool cleaning in Phase 1.
+
+Cleans the same synthetic Zomato-shaped frame with 1..N worker processes, checks
+that every parallel result is identical to the serial one, and prints
+the speedup per core count.
+
+Usage:
+  python -m benchmarks.bench_parallel_cleaning [rows] [max_workers]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from typing import List, Sequence
+
+import pandas as pd
+
+from phase1_data_ingestion.data_cleaner import DataCleaner
+from phase1_data_ingestion.parallel import clean_parallel
+from phase1_data_ingestion.synthetic import SyntheticZomatoGenerator
+
+
+def _time(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(rows: int, worker_counts: Sequence[int]) -> List[str]:
+    raw = SyntheticZomatoGenerator(rows).load()
+    cleaner = DataCleaner()
+
+    serial = cleaner.clean(raw)
+    serial_s = _time(lambda: cleaner.clean(raw))
+    lines = [f"rows={rows} serial={serial_s:.3f}s"]
+
+    for workers in worker_counts:
+        result = clean_parallel(raw, cleaner, workers=workers, min_rows=0)
+        pd.testing.assert_frame_equal(result, serial)
+        elapsed = _time(lambda: clean_parallel(raw, cleaner, workers=workers, min_rows=0))
+        lines.append(f"workers={workers} time={elapsed:.3f}s speedup={serial_s / elapsed:.2f}x")
+    return lines
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    if argv is None:
+        argv = sys.argv[1:]
+    rows = int(argv[0]) if len(argv) >= 1 else 1_000_000
+    max_workers = int(argv[1]) if len(argv) >= 2 else (os.cpu_count() or 1)
+
+    counts = sorted({1, 2, 4, 8, 16, max_workers} & set(range(1, max_workers + 1)))
+    for line in run(rows, counts):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark: LLM cache hit rate with and without query canonicalization.
+
+Replays a synthetic query log through the serving path (preparation,
+prompt building, `CachingLLMClient`) against a counting stand-in LLM.
+The log draws intents (city, budget, cuisines) from a Zipf distribution,
+as real traffic does, and writes each request the way users do: the
+budget as "800", "790", "810" or "780-820", cuisines in any order and
+case. Without canonicalization each spelling is its own prompt; with it,
+requests that select the same restaurants share one cache key.
+
+Usage:
+  python -m benchmarks.bench_query_canonicalization [requests ...]
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from typing import List, Sequence
+
+import numpy as np
+
+from phase1_data_ingestion.data_cleaner import DataCleaner
+from phase1_data_ingestion.price_profiles import compute_price_profiles
+from phase1_data_ingestion.storage import InMemoryRestaurantStore
+from phase1_data_ingestion.synthetic import SyntheticZomatoGenerator
+from phase2_user_input.models import RawUserInput
+from phase2_user_input.validation import InputNormalizer, InputValidator
+from phase3_integration.canonical import QueryCanonicalizer
+from phase3_integration.repository import RestaurantRepository
+from phase3_integration.service import RecommendationPreparationService
+from phase4_recommendation.llm_cache import CachingLLMClient, LLMResponseCache
+from phase4_recommendation.service import LLMRecommendationService
+
+ROWS = 50_000
+REQUESTS = (1_000, 5_000)
+INTENTS = 400
+ZIPF_EXPONENT = 1.1
+SEED = 7
+
+CITIES = ("bangalore", "mumbai", "delhi", "pune", "hyderabad", "chennai", "kolkata")
+CUISINES = ("North Indian", "Chinese", "South Indian", "Italian", "Fast Food", "Cafe")
+BUDGETS = (300, 400, 500, 600, 800, 1_000, 1_200, 1_500, 2_000)
+
+
+class CountingLLM:
+    """
+    Stand-in LLM that counts calls and answers with an empty list.
+    """
+
+    model = "replay"
+    temperature = 0.4
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(self, prompt: str) -> str:
+        self.calls += 1
+        return json.dumps([])
+
+
+def query_log(requests: int, seed: int = SEED) -> List[RawUserInput]:
+    rng = np.random.default_rng(seed)
+    intents = [
+        (
+            CITIES[rng.integers(len(CITIES))],
+            BUDGETS[rng.integers(len(BUDGETS))],
+            list(rng.choice(CUISINES, size=rng.integers(0, 3), replace=False)),
+        )
+        for _ in range(INTENTS)
+    ]
+    weights = 1.0 / np.arange(1, INTENTS + 1) ** ZIPF_EXPONENT
+    picks = rng.choice(INTENTS, size=requests, p=weights / weights.sum())
+
+    log: List[RawUserInput] = []
+    for pick in picks:
+        city, budget, cuisines = intents[pick]
+        spelling = rng.integers(4)
+        if spelling == 0:
+            price_text = str(budget)
+        elif spelling == 1:
+            price_text = str(budget - 10)
+        elif spelling == 2:
+            price_text = str(budget + 10)
+        else:
+            price_text = f"{budget - 20}-{budget + 20}"
+        cuisines = list(rng.permutation(cuisines)) if cuisines else []
+        if rng.random() < 0.5:
+            cuisines = [cuisine.lower() for cuisine in cuisines]
+        log.append(
+            RawUserInput(
+                city=city.title(), price_text=price_text, cuisine_text=", ".join(cuisines)
+            )
+        )
+    return log
+
+
+def replay(
+    store: InMemoryRestaurantStore,
+    log: Sequence[RawUserInput],
+    canonical: bool,
+) -> str:
+    normalizer = InputNormalizer(price_profiles=store.price_profiles)
+    prep = RecommendationPreparationService(
+        repository=RestaurantRepository(store=store),
+        validator=InputValidator(allowed_cities=list(CITIES)),
+        normalizer=normalizer,
+        canonicalizer=QueryCanonicalizer() if canonical else None,
+    )
+    llm = CountingLLM()
+    cache = LLMResponseCache(max_entries=len(log))
+    service = LLMRecommendationService(llm_client=CachingLLMClient(llm, cache))
+
+    start = time.perf_counter()
+    for raw in log:
+        result = prep.prepare(raw)
+        service.recommend(result.normalized_input, result.candidates, cache_key=result.cache_key)
+    elapsed = time.perf_counter() - start
+
+    stats = cache.stats()
+    lookups = stats.hits + stats.misses
+    return (
+        f"hit rate={stats.hits / max(lookups, 1):.1%} llm calls={llm.calls} "
+        f"({elapsed / len(log) * 1e3:.2f}ms/request)"
+    )
+
+
+def run(requests: int, store: InMemoryRestaurantStore) -> str:
+    log = query_log(requests)
+    plain = replay(store, log, canonical=False)
+    canonical = replay(store, log, canonical=True)
+    return f"requests={requests} | raw: {plain} | canonical: {canonical}"
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    if argv is None:
+        argv = sys.argv[1:]
+    sizes: List[int] = [int(arg) for arg in argv] or list(REQUESTS)
+    df = DataCleaner().clean(SyntheticZomatoGenerator(ROWS).load()).reset_index(drop=True)
+    store = InMemoryRestaurantStore(data=df, price_profiles=compute_price_profiles(df))
+    for requests in sizes:
+        print(run(requests, store))
+
+
+if __name__ == "__main__":
+    main()
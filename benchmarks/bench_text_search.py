@@ -0,0 +1,98 @@
+"""
+Benchmark: free-text search with the int8 vector index.
+
+For each dataset size, builds the text index from synthetic data and
+times batches of queries three ways:
+
+- exact: every row scored with blocked matrix products;
+- IVF: only the rows of the `nprobe` nearest coarse lists are scored;
+- within a city (the candidate pipeline's case): only the city's rows.
+
+Recall@10 of IVF against exact search is reported alongside, counting a
+result as found when it scores at least the exact 10th best (synthetic
+data has many rows with identical text, so ids alone undercount).
+
+Usage:
+  python -m benchmarks.bench_text_search [rows ...]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from typing import Callable, List, Sequence
+
+import numpy as np
+
+from phase1_data_ingestion.data_cleaner import DataCleaner
+from phase1_data_ingestion.storage import InMemoryRestaurantStore
+from phase1_data_ingestion.synthetic import SyntheticZomatoGenerator
+from phase1_data_ingestion.text_index import build_text_index, iter_text_frames
+from phase3_integration.repository import RestaurantRepository
+
+SIZES = (10_000, 100_000)
+
+QUERIES = (
+    "rooftop biryani place good for groups",
+    "cafe with cold coffee and desserts",
+    "north indian buffet",
+    "cheap momos and noodles",
+    "seafood fine dining",
+    "pizza and pasta for family",
+    "south indian breakfast dosa",
+    "late night burgers",
+)
+
+REPEATS = 5
+K = 10
+
+
+def _per_query_ms(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn()
+    return (time.perf_counter() - start) / REPEATS / len(QUERIES) * 1e3
+
+
+def run(rows: int) -> str:
+    df = DataCleaner().clean(SyntheticZomatoGenerator(rows).load()).reset_index(drop=True)
+    store = InMemoryRestaurantStore(data=df)
+
+    start = time.perf_counter()
+    index = build_text_index(iter_text_frames(store))
+    build_s = time.perf_counter() - start
+    store.text_index = index
+    repo = RestaurantRepository(store=store)
+    everything = np.arange(index.rows)
+
+    exact = index.search(QUERIES, k=K, positions=everything)
+    probed = index.search(QUERIES, k=K)
+    recall = np.mean(
+        [
+            np.sum(found >= wanted[-1] - 1e-6) / len(wanted)
+            for (_, wanted), (_, found) in zip(exact, probed)
+            if len(wanted)
+        ]
+    )
+
+    exact_ms = _per_query_ms(lambda: index.search(QUERIES, k=K, positions=everything))
+    ivf_ms = _per_query_ms(lambda: index.search(QUERIES, k=K))
+    city_ms = _per_query_ms(lambda: repo.search_batch(QUERIES, k=K, city="bangalore"))
+    lists = 0 if index.centroids is None else len(index.centroids)
+    return (
+        f"rows={index.rows} dims={index.dimensions} lists={lists} build={build_s:.2f}s "
+        f"size={index.nbytes / 2**20:.1f}MiB | per query: exact={exact_ms:.2f}ms "
+        f"ivf={ivf_ms:.2f}ms (recall@{K}={recall:.2f}) city={city_ms:.2f}ms"
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    if argv is None:
+        argv = sys.argv[1:]
+    sizes: List[int] = [int(arg) for arg in argv] or list(SIZES)
+    for rows in sizes:
+        print(run(rows))
+
+
+if __name__ == "__main__":
+    main()
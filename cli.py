@@ -19,16 +19,17 @@ from phase2_user_input.cli_prompt import prompt_user_for_input
 from phase2_user_input.validation import InputNormalizer, InputValidator
 from phase3_integration.repository import RestaurantRepository
 from phase3_integration.service import RecommendationPreparationService
-from phase4_recommendation.llm_client import GroqAPIClient
+from phase4_recommendation.llm_client import get_groq_client
+from phase4_recommendation.ranking import RuleBasedRecommender, ScoringWeights
 from phase4_recommendation.service import LLMRecommendationService
 from phase5_display.presenter import format_recommendations_text
 
 
-def _find_city_column(df) -> Optional[str]:
+def _find_city_column(columns) -> Optional[str]:
     """
     Try to find a column that represents city, in a case-insensitive way.
     """
-    for col in df.columns:
+    for col in columns:
         if str(col).strip().lower() == "city":
             return col
     return None
@@ -43,13 +44,13 @@ def _build_validator_from_store() -> InputValidator:
         # No data; validator will accept any city (not ideal, but safe).
         return InputValidator()
 
-    city_col = _find_city_column(store.data)
+    city_col = _find_city_column(store.columns)
     if city_col is None:
         # Fallback: no city column discovered, accept any city.
         return InputValidator()
 
-    cities: List[str] = (
-        store.data[city_col].dropna().astype(str).str.strip().str.lower().unique().tolist()
+    cities: List[str] = list(
+        dict.fromkeys(str(c).strip().lower() for c in store.distinct_values(city_col))
     )
     return InputValidator(allowed_cities=cities)
 
@@ -80,7 +81,7 @@ def main(argv: Sequence[str] | None = None) -> None:
     print(f"Loaded {store.count()} restaurants.\n")
 
     validator = _build_validator_from_store()
-    normalizer = InputNormalizer()
+    normalizer = InputNormalizer(price_profiles=store.price_profiles)
     repository = RestaurantRepository(store=store)
     prep_service = RecommendationPreparationService(
         repository=repository, validator=validator, normalizer=normalizer
@@ -105,7 +106,7 @@ def main(argv: Sequence[str] | None = None) -> None:
 
     # Phase 4 – call Groq LLM for recommendations.
     try:
-        llm_client = GroqAPIClient()  # expects GROQ_API_KEY in environment
+        llm_client = get_groq_client()  # expects GROQ_API_KEY in environment
     except ValueError as exc:
         print(
             "\nGroq API key is not configured. "
@@ -114,7 +115,10 @@ def main(argv: Sequence[str] | None = None) -> None:
         print(f"Details: {exc}")
         return
 
-    rec_service = LLMRecommendationService(llm_client=llm_client)
+    rec_service = LLMRecommendationService(
+        llm_client=llm_client,
+        ranker=RuleBasedRecommender(weights=ScoringWeights.from_env()),
+    )
     recommendations = rec_service.recommend(result.normalized_input, candidates)
 
     # Phase 5 – present results.
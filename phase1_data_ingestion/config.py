@@ -2,7 +2,21 @@
 Configuration for Phase 1 data ingestion.
 """
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Free-text columns that the request path never reads.
+DEFAULT_HEAVY_COLUMNS = ("reviews_list", "menu_item", "dish_liked")
+
+
+def _snapshot_directory() -> str:
+    """
+    ZOMATO_SNAPSHOT_DIR (default `.zomato_snapshots`) as an absolute path.
+    """
+    path = os.getenv("ZOMATO_SNAPSHOT_DIR") or ".zomato_snapshots"
+    return str(Path(path).expanduser().resolve())
 
 
 @dataclass(frozen=True)
@@ -17,6 +31,42 @@ class DatasetConfig:
     # Split to load; most tabular datasets expose 'train'
     split: str = "train"
 
+    # Dataset revision (branch, tag or commit sha); None means the default
+    # branch, which snapshots cannot tell apart from later upstream commits
+    revision: Optional[str] = field(
+        default_factory=lambda: os.getenv("ZOMATO_DATASET_REVISION") or None
+    )
 
-DEFAULT_CONFIG = DatasetConfig()
+    # "huggingface", or "synthetic" for generated offline data
+    source: str = field(default_factory=lambda: os.getenv("ZOMATO_DATA_SOURCE", "huggingface"))
+
+    # Size and seed of the synthetic dataset (only used when source="synthetic")
+    synthetic_rows: int = field(
+        default_factory=lambda: int(os.getenv("ZOMATO_SYNTHETIC_ROWS", "50000"))
+    )
+    synthetic_seed: int = 0
+
+
+@dataclass(frozen=True)
+class SnapshotConfig:
+    """
+    Where and whether to keep local columnar snapshots of the cleaned data.
+    """
+
+    # Directory holding one sub-directory per snapshot fingerprint, resolved
+    # to an absolute path when the config is created
+    directory: str = field(default_factory=_snapshot_directory)
+
+    # Set to False to always rebuild from the remote dataset
+    enabled: bool = True
 
+    # Columns kept out of RAM in a memory-mapped sidecar next to the snapshot
+    heavy_columns: Tuple[str, ...] = DEFAULT_HEAVY_COLUMNS
+
+    # "memory" (pandas), "sqlite" (indexed database file next to the snapshot)
+    # or "shared" (one memory-mapped copy for all worker processes)
+    backend: str = field(default_factory=lambda: os.getenv("ZOMATO_STORE_BACKEND", "memory"))
+
+
+DEFAULT_CONFIG = DatasetConfig()
+DEFAULT_SNAPSHOT_CONFIG = SnapshotConfig()
@@ -4,10 +4,27 @@ Data cleaning and normalization for the Zomato dataset (Phase 1).
 
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
+import numpy as np
 import pandas as pd
 
+from .entity_resolution import EntityResolver
+
+# Bump whenever cleaning rules change so that cached snapshots are rebuilt.
+CLEANER_VERSION = 4
+
+# Low-cardinality text fields stored as pandas categoricals.
+DEFAULT_CATEGORICAL_COLUMNS = (
+    "city",
+    "location",
+    "rest_type",
+    "listed_in(type)",
+    "listed_in(city)",
+    "online_order",
+    "book_table",
+)
+
 
 class DataCleaner:
     """
@@ -18,23 +35,139 @@ class DataCleaner:
         self,
         city_column: str = "city",
         price_column: str = "approx_cost(for two people)",
+        rate_column: str = "rate",
+        rating_column: str = "aggregate_rating",
+        votes_column: str = "votes",
+        categorical_columns: Sequence[str] = DEFAULT_CATEGORICAL_COLUMNS,
+        compact_dtypes: bool = True,
+        entity_resolver: Optional[EntityResolver] = None,
     ) -> None:
         self.city_column = city_column
         self.price_column = price_column
+        self.rate_column = rate_column
+        self.rating_column = rating_column
+        self.votes_column = votes_column
+        self.categorical_columns = tuple(categorical_columns)
+        self.compact_dtypes = compact_dtypes
+        self.entity_resolver = entity_resolver
+
+    def settings(self) -> Dict[str, Any]:
+        """
+        Return the settings that determine the cleaned output.
+
+        Used to fingerprint snapshots of cleaned data.
+        """
+        return {
+            "version": CLEANER_VERSION,
+            "city_column": self.city_column,
+            "price_column": self.price_column,
+            "rate_column": self.rate_column,
+            "rating_column": self.rating_column,
+            "votes_column": self.votes_column,
+            "categorical_columns": list(self.categorical_columns),
+            "compact_dtypes": self.compact_dtypes,
+            "entity_resolver": (
+                self.entity_resolver.settings() if self.entity_resolver is not None else None
+            ),
+        }
 
     def clean(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Return a cleaned copy of the DataFrame.
 
         Operations:
-        - Drop exact duplicate rows.
+        - Drop exact duplicate rows, or collapse listings into restaurant
+          entities when an entity resolver is configured.
         - Standardize city names (strip + lowercase).
         - Normalize price column to numeric, dropping rows where price is missing.
+        - Parse ratings ("4.1/5", "NEW", "-") and votes to numbers.
+        - Optionally compact dtypes (categoricals, downcast numerics).
+        """
+        df_clean = self.normalize(self.deduplicate(df))
+
+        if self.compact_dtypes:
+            df_clean = self.compact(df_clean)
+
+        return df_clean
+
+    def deduplicate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Drop duplicate raw rows, or resolve them into entities.
+
+        Entities are resolved among the rows with a valid price only (the
+        rows `normalize()` keeps), so a restaurant whose first listing has
+        no price is represented by its first priced one, exactly as in a
+        streamed build, which resolves entities after cleaning.
+
+        Returns a new frame that later stages may modify in place.
+        """
+        if self.entity_resolver is not None:
+            return self.entity_resolver.resolve(df[self.has_price(df)])
+        return df.drop_duplicates()
+
+    def has_price(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Boolean mask of the rows `normalize()` keeps: those with a valid
+        price (all rows when there is no price column).
         """
-        df_clean = df.copy()
+        if self.price_column not in df.columns:
+            return np.ones(len(df.index), dtype=bool)
+        return self._parse_price(df[self.price_column]).notna().to_numpy()
 
-        # Drop perfect duplicates.
-        df_clean = df_clean.drop_duplicates()
+    def clean_batch(self, df: pd.DataFrame, deduplicator: RowDeduplicator) -> pd.DataFrame:
+        """
+        Clean one batch of a streamed dataset.
+
+        Duplicates are dropped against every row seen so far via the shared
+        `deduplicator`. Entity resolution and dtype compaction are left to
+        `finalize()`, since entities, categories and value ranges are only
+        known once all batches are in.
+
+        Rows are normalized before the duplicate check, so the hashes the
+        deduplicator keeps line up with the rows returned.
+        """
+        normalized, hashes = self.normalize_with_hashes(df)
+        return normalized[deduplicator.keep_mask(hashes)]
+
+    def normalize_with_hashes(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        `normalize(df)` plus the raw-row hash of each surviving row.
+
+        Index labels of `df` are kept.
+        """
+        hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        labels = df.index
+        normalized = self.normalize(df.reset_index(drop=True))
+        positions = normalized.index.to_numpy()
+        normalized.index = labels[positions]
+        return normalized, hashes[positions]
+
+    def source_hashes(self, df: pd.DataFrame, row_hashes: np.ndarray) -> np.ndarray:
+        """
+        Source hash of each row of `deduplicate(df)`, given the raw-row
+        hash of each row of `df`.
+
+        Exact repeats count once and an entity's hash covers all of its
+        rows, so a streamed build (which drops repeats across batches and
+        resolves entities last) and a full build agree on the same data.
+        """
+        row_hashes = np.asarray(row_hashes, dtype=np.uint64)
+        fresh = ~pd.Series(row_hashes).duplicated().to_numpy()
+        if self.entity_resolver is None or df.empty:
+            return row_hashes[fresh]
+        # Only priced rows take part in entities, as in `deduplicate()`.
+        fresh &= self.has_price(df)
+        return self.entity_resolver.source_hashes(df[fresh], row_hashes[fresh])
+
+    def normalize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Row-wise normalization of city, price, rating and votes.
+
+        Each row is handled independently, so this stage can run on any
+        slice of the data. The input frame is modified in place and
+        returned with rows lacking a valid price removed.
+        """
+        df_clean = df
 
         # Standardize city names when column exists.
         if self.city_column in df_clean.columns:
@@ -47,18 +180,126 @@ class DataCleaner:
 
         # Normalize price column if present.
         if self.price_column in df_clean.columns:
-            df_clean[self.price_column] = (
-                df_clean[self.price_column]
+            df_clean[self.price_column] = self._parse_price(df_clean[self.price_column])
+
+        # Parse "4.1/5"-style ratings; "NEW", "-" and blanks become NaN.
+        if self.rate_column in df_clean.columns:
+            df_clean[self.rating_column] = pd.to_numeric(
+                df_clean[self.rate_column]
                 .astype(str)
-                .str.replace(",", "", regex=False)
-            )
-            df_clean[self.price_column] = pd.to_numeric(
-                df_clean[self.price_column], errors="coerce"
+                .str.extract(r"^\s*(\d+(?:\.\d+)?)", expand=False),
+                errors="coerce",
+            ).astype("float32")
+
+        if self.votes_column in df_clean.columns:
+            df_clean[self.votes_column] = pd.to_numeric(
+                df_clean[self.votes_column], errors="coerce"
             )
+
+        if self.price_column in df_clean.columns:
             df_clean = df_clean.dropna(subset=[self.price_column])
 
         return df_clean
 
+    @staticmethod
+    def _parse_price(prices: pd.Series) -> pd.Series:
+        # "1,200" -> 1200.0; anything unparseable -> NaN.
+        return pd.to_numeric(prices.astype(str).str.replace(",", "", regex=False), errors="coerce")
+
+    def finalize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Whole-frame steps for batch-cleaned data: entity resolution (when
+        configured) followed by dtype compaction (when enabled).
+
+        For streamed data, entities are resolved among the rows that
+        survived cleaning.
+        """
+        if self.entity_resolver is not None and not df.empty:
+            df = self.entity_resolver.resolve(df)
+        return self.compact(df) if self.compact_dtypes else df
+
+    def compact(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Shrink the frame's memory footprint.
+
+        Low-cardinality text columns become categoricals (so equality
+        filters compare integer codes) and numeric columns are downcast
+        to the smallest type that holds their values. This needs the
+        whole frame, since categories and value ranges are global.
+        """
+        for col in self.categorical_columns:
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("category")
+
+        for col in (self.price_column, self.votes_column):
+            if col in df.columns:
+                df[col] = _downcast_numeric(df[col])
+
+        return df
+
+
+class RowDeduplicator:
+    """
+    Drops rows already seen, across any number of batches.
+
+    Keeps one 64-bit hash per distinct row rather than the rows themselves,
+    so memory grows with the number of unique rows, not the data size.
+    The kept hashes are also recorded in order (`row_hashes()`), giving a
+    streamed snapshot its source hashes without hashing the rows again.
+    """
+
+    def __init__(self) -> None:
+        self._seen: Set[int] = set()
+        self._kept: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def row_hashes(self) -> np.ndarray:
+        """
+        Hashes of the rows kept so far, in the order they were kept.
+        """
+        if not self._kept:
+            return np.empty(0, dtype=np.uint64)
+        return np.concatenate(self._kept)
+
+    def filter(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return the rows of `df` not seen before, keeping first occurrences.
+        """
+        if df.empty:
+            return df
+        hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        return df[self.keep_mask(hashes)]
+
+    def keep_mask(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Boolean mask of row hashes not seen before; marks them as seen.
+        """
+        seen = self._seen
+        keep = np.fromiter(
+            (h not in seen for h in hashes.tolist()), dtype=bool, count=len(hashes)
+        )
+        # Also drop repeats within this batch.
+        keep &= ~pd.Series(hashes, dtype="uint64").duplicated().to_numpy()
+        kept = hashes[keep]
+        seen.update(kept.tolist())
+        self._kept.append(kept)
+        return keep
+
+
+def _downcast_numeric(series: pd.Series) -> pd.Series:
+    """
+    Downcast to the smallest integer type when values are whole and
+    non-null, otherwise to float32.
+    """
+    if series.empty:
+        return series
+    if series.notna().all() and (series % 1 == 0).all():
+        kind = "unsigned" if series.min() >= 0 else "integer"
+        return pd.to_numeric(series.astype("int64"), downcast=kind)
+    return pd.to_numeric(series, downcast="float")
+
 
 def required_columns_present(df: pd.DataFrame, required: Iterable[str]) -> bool:
     """
@@ -66,4 +307,3 @@ def required_columns_present(df: pd.DataFrame, required: Iterable[str]) -> bool:
     """
     missing = [col for col in required if col not in df.columns]
     return len(missing) == 0
-
@@ -2,18 +2,23 @@
 Dataset loading for Phase 1.
 
 This module is responsible only for:
-- Downloading/loading the Zomato dataset from Hugging Face.
-- Exposing it as a pandas DataFrame for downstream cleaning.
+- Downloading/loading the Zomato dataset from Hugging Face, or generating
+  a synthetic stand-in when `DatasetConfig.source` is "synthetic".
+- Exposing it as a pandas DataFrame (or a stream of DataFrame batches)
+  for downstream cleaning.
 """
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Iterator, Optional
 
 import pandas as pd
 from datasets import load_dataset
 
 from .config import DatasetConfig, DEFAULT_CONFIG
+from .synthetic import SyntheticZomatoGenerator
+
+SYNTHETIC_SOURCE = "synthetic"
 
 
 class HFDatasetLoader:
@@ -35,7 +40,36 @@ class HFDatasetLoader:
         Returns:
             A pandas DataFrame containing the raw dataset.
         """
-        dataset = load_dataset(self._config.hf_dataset_name, split=self._config.split)
+        if self._config.source == SYNTHETIC_SOURCE:
+            return self._synthetic().load()
+        dataset = load_dataset(
+            self._config.hf_dataset_name,
+            split=self._config.split,
+            revision=self._config.revision,
+        )
         # Convert to pandas for easier downstream manipulation.
         return dataset.to_pandas()
 
+    def iter_batches(self, batch_size: int = 10_000) -> Iterator[pd.DataFrame]:
+        """
+        Stream the configured split as DataFrames of at most `batch_size` rows.
+
+        Uses Hugging Face streaming mode, so the full split is never
+        materialized in memory.
+        """
+        if self._config.source == SYNTHETIC_SOURCE:
+            yield from self._synthetic().iter_batches(batch_size)
+            return
+        dataset = load_dataset(
+            self._config.hf_dataset_name,
+            split=self._config.split,
+            revision=self._config.revision,
+            streaming=True,
+        )
+        for batch in dataset.iter(batch_size=batch_size):
+            yield pd.DataFrame(batch)
+
+    def _synthetic(self) -> SyntheticZomatoGenerator:
+        return SyntheticZomatoGenerator(
+            rows=self._config.synthetic_rows, seed=self._config.synthetic_seed
+        )
@@ -0,0 +1,166 @@
+"""
+Entity resolution for the Zomato dataset (Phase 1).
+
+The export lists the same physical restaurant once per listing context
+(`listed_in(type)` such as Delivery / Dine-out, and `listed_in(city)`).
+`EntityResolver` collapses those rows into one row per restaurant, keyed
+by a hash of the normalized name, address and location, and keeps the
+listing contexts as comma-separated multi-valued attributes (the same
+convention the dataset already uses for `cuisines`).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_KEY_COLUMNS = ("name", "address", "location")
+DEFAULT_MULTI_VALUED_COLUMNS = ("listed_in(type)", "listed_in(city)")
+
+MULTI_VALUE_SEPARATOR = ", "
+
+# Ids stay below 2**53 so JSON clients (JavaScript numbers) read them exactly.
+ID_BITS = 53
+_ID_MASK = np.uint64((1 << ID_BITS) - 1)
+
+
+class EntityResolver:
+    """
+    Collapses listing rows into canonical restaurant entities.
+
+    The first row of each entity (in input order) provides every
+    single-valued field; multi-valued columns hold the sorted union of the
+    values across all of the entity's rows. Each entity gets a stable,
+    non-negative integer `restaurant_id` below 2**53, derived from its key.
+    """
+
+    def __init__(
+        self,
+        key_columns: Sequence[str] = DEFAULT_KEY_COLUMNS,
+        multi_valued_columns: Sequence[str] = DEFAULT_MULTI_VALUED_COLUMNS,
+        id_column: str = "restaurant_id",
+    ) -> None:
+        self.key_columns = tuple(key_columns)
+        self.multi_valued_columns = tuple(multi_valued_columns)
+        self.id_column = id_column
+
+    def settings(self) -> Dict[str, Any]:
+        return {
+            "key_columns": list(self.key_columns),
+            "multi_valued_columns": list(self.multi_valued_columns),
+            "id_column": self.id_column,
+            "id_bits": ID_BITS,
+        }
+
+    def entity_ids(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Stable int64 id per row, equal for rows of the same restaurant
+        and distinct for different restaurants in `df`.
+        """
+        return compact_ids(self.entity_keys(df))
+
+    def entity_keys(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        64-bit hash per row of its normalized key columns.
+        """
+        keys = pd.DataFrame(
+            {col: _normalize_key(df[col]) for col in self.key_columns if col in df.columns},
+            index=df.index,
+        )
+        if keys.columns.empty:
+            raise ValueError("None of the entity key columns are present.")
+        return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+    def source_hashes(self, df: pd.DataFrame, row_hashes: np.ndarray) -> np.ndarray:
+        """
+        One hash per entity, in the order `resolve(df)` returns them,
+        combining the `row_hashes` (one per row of `df`) of all its rows
+        and their order.
+        """
+        keys = self.entity_keys(df)
+        rank = pd.Series(keys).groupby(keys, sort=False).cumcount().to_numpy()
+        members = pd.DataFrame({"row": np.asarray(row_hashes, dtype=np.uint64), "rank": rank})
+        mixed = pd.Series(pd.util.hash_pandas_object(members, index=False).to_numpy())
+        # uint64 sums wrap around, which is fine for a hash.
+        return mixed.groupby(keys, sort=False).sum().to_numpy()
+
+    def resolve(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return one row per entity, in order of first appearance.
+
+        Index labels of the returned rows are those of each entity's
+        first row in `df`.
+        """
+        ids = self.entity_ids(df)
+        first = ~pd.Series(ids).duplicated().to_numpy()
+        entities = df[first].copy()
+
+        for col in self.multi_valued_columns:
+            if col in df.columns:
+                merged = _merge_values(ids, df[col])
+                entities[col] = merged.reindex(ids[first]).to_numpy()
+
+        if self.id_column in entities.columns:
+            entities[self.id_column] = ids[first]
+        else:
+            entities.insert(0, self.id_column, ids[first])
+        return entities
+
+
+def compact_ids(keys: np.ndarray) -> np.ndarray:
+    """
+    Map 64-bit keys to ids below 2**53: the low bits of each key.
+
+    Distinct keys sharing their low bits (rare: about n^2 / 2^54 for n
+    entities) are told apart by probing to the next free id, in order of
+    the full key, so the result depends only on the set of keys.
+    """
+    unique, inverse = np.unique(np.asarray(keys, dtype=np.uint64), return_inverse=True)
+    ids = (unique & _ID_MASK).astype(np.int64)
+    collided = pd.Series(ids).duplicated().to_numpy()
+    if collided.any():
+        used = set(ids.tolist())
+        for position in np.flatnonzero(collided):
+            candidate = int(ids[position])
+            while candidate in used:
+                candidate = (candidate + 1) & int(_ID_MASK)
+            used.add(candidate)
+            ids[position] = candidate
+    return ids[inverse]
+
+
+def split_multi_value(value: object) -> List[str]:
+    """
+    Split a comma-separated multi-valued field into stripped tokens.
+    """
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return []
+    return [token.strip() for token in str(value).split(",") if token.strip()]
+
+
+def _normalize_key(series: pd.Series) -> pd.Series:
+    return (
+        series.astype(str)
+        .str.lower()
+        .str.replace(r"[^\w\s]", " ", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def _merge_values(ids: np.ndarray, values: pd.Series) -> pd.Series:
+    """
+    Sorted union of (comma-separated) values per entity id.
+    """
+    pairs = pd.DataFrame({"id": ids, "value": values.to_numpy(dtype=object)})
+    pairs = pairs.drop_duplicates()
+    pairs["value"] = pairs["value"].map(split_multi_value)
+    pairs = pairs.explode("value").dropna(subset=["value"]).drop_duplicates()
+    merged = (
+        pairs.sort_values(["id", "value"], kind="stable")
+        .groupby("id", sort=False)["value"]
+        .agg(MULTI_VALUE_SEPARATOR.join)
+    )
+    return merged
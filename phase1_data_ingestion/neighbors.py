@@ -0,0 +1,384 @@
+"""
+Precomputed "similar restaurants" lists (Phase 1).
+
+At ingest every restaurant gets its `k` nearest neighbors within its own
+city, over cuisines, restaurant type, price and rating. Each row becomes
+a small feature vector: unit-length multi-hot cuisines and restaurant
+types, log2 of the price for two (so doubling the price is one unit) and
+the rating, each scaled by the square root of its weight. The weighted
+squared distance between two rows is then
+
+    |x|^2 + |y|^2 - 2 x.y
+
+so a city's distances come from matrix products over tiles of rows and
+columns, and each row keeps a running top-k across its column tiles:
+memory per city is one tile plus the top-k, however large the city.
+Features are built per city from that city's rows only. Cities are
+independent and are spread across a process pool.
+
+The result is two (rows, k) arrays saved with the snapshot, so serving a
+restaurant's neighbors is a single row read.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .entity_resolution import split_multi_value
+from .parallel import MIN_ROWS_FOR_PARALLEL, default_workers
+
+DEFAULT_NEIGHBORS = 10
+
+# Distances are computed BLOCK_ROWS x TILE_COLUMNS at a time (8 MiB of
+# float32), whatever the city's size.
+BLOCK_ROWS = 512
+TILE_COLUMNS = 4_096
+
+# Rows of the city column read per block when grouping rows by city.
+CITY_READ_ROWS = 65_536
+
+# Squared-distance weights. Disjoint cuisines cost 2 * CUISINE_WEIGHT,
+# disjoint restaurant types 2 * REST_TYPE_WEIGHT, a doubled price
+# PRICE_WEIGHT and one rating star RATING_WEIGHT.
+CUISINE_WEIGHT = 1.0
+REST_TYPE_WEIGHT = 0.5
+PRICE_WEIGHT = 0.5
+RATING_WEIGHT = 1.0
+
+_META_FILE = "meta.json"
+_ARRAYS = ("neighbors", "scores")
+
+# Running top-k slots not filled yet; sort after every real key.
+_EMPTY = np.iinfo(np.uint64).max
+_POSITION_MASK = np.uint64(0xFFFFFFFF)
+
+
+@dataclass(frozen=True)
+class NeighborIndex:
+    """
+    Nearest neighbors of every store row, by position.
+
+    `neighbors[i]` holds the positions of row `i`'s most similar rows in
+    the same city, best first, padded with -1; `scores[i]` their
+    similarity in (0, 1], `1 / (1 + distance)`.
+    """
+
+    neighbors: np.ndarray
+    scores: np.ndarray
+
+    @property
+    def rows(self) -> int:
+        return int(self.neighbors.shape[0])
+
+    @property
+    def k(self) -> int:
+        return int(self.neighbors.shape[1])
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.neighbors.nbytes + self.scores.nbytes)
+
+    def similar(self, position: int, k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (positions, scores) of up to `k` neighbors of the row, best first.
+        """
+        stop = self.k if k is None else max(0, min(k, self.k))
+        neighbors = np.asarray(self.neighbors[position, :stop], dtype=np.int64)
+        found = neighbors >= 0
+        return neighbors[found], np.asarray(self.scores[position, :stop])[found]
+
+    def save(self, directory: str | Path, version: str = "") -> Path:
+        """
+        Write the lists as .npy files, renamed into place as a whole, with
+        `version`, the store version they were built from.
+        """
+        directory = Path(directory)
+        tmp = directory.with_name(f".{directory.name}.{os.getpid()}.tmp")
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        tmp.mkdir(parents=True)
+        for name in _ARRAYS:
+            np.save(tmp / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+        with open(tmp / _META_FILE, "w", encoding="utf-8") as fh:
+            json.dump({"rows": self.rows, "k": self.k, "version": version}, fh)
+        if directory.exists():
+            shutil.rmtree(directory)
+        os.replace(tmp, directory)
+        return directory
+
+    @classmethod
+    def load(cls, directory: str | Path) -> Optional["NeighborIndex"]:
+        """
+        Memory-map lists written by `save`, or None if there are none.
+        """
+        directory = Path(directory)
+        if not (directory / _META_FILE).is_file():
+            return None
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in _ARRAYS}
+        return cls(**arrays)
+
+    @staticmethod
+    def saved_version(directory: str | Path) -> Optional[str]:
+        """
+        Store version recorded by `save`, or None if there are no lists.
+        """
+        path = Path(directory) / _META_FILE
+        if not path.is_file():
+            return None
+        with open(path, encoding="utf-8") as fh:
+            return str(json.load(fh).get("version", ""))
+
+
+def build_neighbor_index(
+    store,
+    k: int = DEFAULT_NEIGHBORS,
+    workers: int = 1,
+    city_column: str = "city",
+    cuisine_column: str = "cuisines",
+    rest_type_column: str = "rest_type",
+    price_column: str = "approx_cost(for two people)",
+    rating_column: str = "aggregate_rating",
+    min_rows: int = MIN_ROWS_FOR_PARALLEL,
+) -> NeighborIndex:
+    """
+    Neighbor lists for every row of a `RestaurantStore`.
+
+    Rows without a city get no neighbors. Missing prices and ratings take
+    their city's median. Only one city's feature columns are read at a
+    time (per worker). With `workers > 1` (0 for one per core) and at
+    least `min_rows` rows, cities are processed in a process pool; the
+    result is identical to the serial one.
+    """
+    total = store.count()
+    neighbors = np.full((total, k), -1, dtype=np.int32)
+    scores = np.zeros((total, k), dtype=np.float32)
+    if total == 0 or k <= 0 or city_column not in store.columns:
+        return NeighborIndex(neighbors=neighbors, scores=scores)
+
+    columns = [
+        col
+        for col in (city_column, cuisine_column, rest_type_column, price_column, rating_column)
+        if col in store.columns
+    ]
+    task = partial(
+        neighbors_of_city,
+        k=k,
+        cuisine_column=cuisine_column,
+        rest_type_column=rest_type_column,
+        price_column=price_column,
+        rating_column=rating_column,
+    )
+    # Largest cities first, so the pool's stragglers are the small ones.
+    cities = sorted(_city_rows(store, city_column), key=len, reverse=True)
+
+    def read(rows: np.ndarray) -> pd.DataFrame:
+        return store.take(rows, columns).reset_index(drop=True)
+
+    workers = workers or default_workers()
+    if workers > 1 and total >= min_rows and len(cities) > 1:
+        results = _map_bounded(task, cities, read, min(workers, len(cities)))
+    else:
+        results = ((rows, task(read(rows))) for rows in cities)
+
+    for rows, (local, distances) in results:
+        found = local >= 0
+        neighbors[rows] = np.where(found, rows[np.maximum(local, 0)], -1)
+        scores[rows] = np.where(found, 1.0 / (1.0 + distances), 0.0)
+    return NeighborIndex(neighbors=neighbors, scores=scores)
+
+
+def neighbors_of_city(
+    frame: pd.DataFrame,
+    k: int,
+    cuisine_column: str = "cuisines",
+    rest_type_column: str = "rest_type",
+    price_column: str = "approx_cost(for two people)",
+    rating_column: str = "aggregate_rating",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Worker task: features of one city's rows, then `city_neighbors`.
+    """
+    parts = [np.zeros((len(frame.index), 0), dtype=np.float32)]
+    for column, weight in ((cuisine_column, CUISINE_WEIGHT), (rest_type_column, REST_TYPE_WEIGHT)):
+        if column in frame.columns:
+            parts.append(_multi_hot(frame[column], weight))
+    parts.append(_numeric(frame, price_column, rating_column))
+    return city_neighbors(np.hstack(parts), k)
+
+
+def city_neighbors(
+    features: np.ndarray,
+    k: int,
+    block_rows: int = BLOCK_ROWS,
+    tile_columns: int = TILE_COLUMNS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The `k` nearest other rows of each row of one city.
+
+    Distances are computed a (block_rows, tile_columns) tile at a time,
+    and each row keeps a running top-k across its column tiles, so memory
+    does not grow with the city. Returns (local positions, squared
+    distances), best first and padded with -1 / inf; ties break by
+    position.
+    """
+    count = len(features)
+    width = min(k, count - 1)
+    local = np.full((count, k), -1, dtype=np.int64)
+    distances = np.full((count, k), np.inf, dtype=np.float32)
+    if width <= 0:
+        return local, distances
+
+    features = np.asarray(features, dtype=np.float32)
+    norms = np.einsum("ij,ij->i", features, features)
+    for start in range(0, count, block_rows):
+        stop = min(start + block_rows, count)
+        best = np.full((stop - start, width), _EMPTY, dtype=np.uint64)
+        for column_start in range(0, count, tile_columns):
+            column_stop = min(column_start + tile_columns, count)
+            # In place: a tile is (block_rows, tile_columns) float32.
+            tile = features[start:stop] @ features[column_start:column_stop].T
+            tile *= -2.0
+            tile += norms[None, column_start:column_stop]
+            tile += norms[start:stop, None]
+            np.maximum(tile, 0.0, out=tile)
+            rows = np.arange(max(start, column_start), min(stop, column_stop))
+            tile[rows - start, rows - column_start] = np.inf
+            best = _merge_top_k(best, tile, column_start)
+        local[start:stop, :width] = (best & _POSITION_MASK).astype(np.int64)
+        distances[start:stop, :width] = _key_distances(best)
+    return local, distances
+
+
+def _merge_top_k(best: np.ndarray, tile: np.ndarray, first_column: int) -> np.ndarray:
+    """
+    Each row's `best` keys (sorted) updated with one tile of distances.
+
+    Keys are uint64 with the float32 distance bits high and the position
+    low; non-negative float bit patterns order like their values, so keys
+    order by (distance, position). Columns only grow from tile to tile,
+    so once a row's top-k is full only entries strictly closer than its
+    current k-th can enter; those few are merged with a sort.
+    """
+    rows, width = best.shape
+    if best[0, -1] == _EMPTY:
+        # First tile(s): dense top-k over everything seen so far.
+        positions = np.arange(first_column, first_column + tile.shape[1])
+        keys = np.concatenate([best, _keys(tile, positions[None, :])], axis=1)
+        merged = np.partition(keys, width - 1, axis=1)[:, :width]
+        merged.sort(axis=1)
+        return merged
+
+    hits = np.flatnonzero(tile < _key_distances(best[:, -1])[:, None])
+    if len(hits) == 0:
+        return best
+    hit_rows, hit_columns = np.divmod(hits, tile.shape[1])
+    owners = np.concatenate([np.repeat(np.arange(rows), width), hit_rows])
+    keys = np.concatenate(
+        [best.ravel(), _keys(tile[hit_rows, hit_columns], hit_columns + first_column)]
+    )
+    order = np.lexsort((keys, owners))
+    owners = owners[order]
+    rank = np.arange(len(order)) - np.searchsorted(owners, owners)
+    return keys[order][rank < width].reshape(rows, width)
+
+
+def _keys(distances: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    bits = np.ascontiguousarray(distances).view(np.uint32) & np.uint32(0x7FFFFFFF)  # -0.0 -> 0.0
+    return (bits.astype(np.uint64) << np.uint64(32)) | positions.astype(np.uint64)
+
+
+def _key_distances(keys: np.ndarray) -> np.ndarray:
+    return (keys >> np.uint64(32)).astype(np.uint32).view(np.float32)
+
+
+def _city_rows(store, city_column: str, block_rows: int = CITY_READ_ROWS) -> List[np.ndarray]:
+    """
+    Positions of each city's rows, reading the city column in blocks.
+    """
+    total = store.count()
+    codes = np.full(total, -1, dtype=np.int32)
+    known: Dict[object, int] = {}
+    for start in range(0, total, block_rows):
+        positions = np.arange(start, min(start + block_rows, total))
+        values = store.take(positions, [city_column])[city_column].astype(object)
+        block_codes, uniques = pd.factorize(values.where(values.notna(), None))
+        if len(uniques) == 0:
+            continue
+        mapping = np.array([known.setdefault(city, len(known)) for city in uniques], dtype=np.int32)
+        codes[positions] = np.where(block_codes >= 0, mapping[np.maximum(block_codes, 0)], -1)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(known) + 1))
+    return [order[lo:hi].astype(np.int64) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+def _map_bounded(
+    task: Callable[[pd.DataFrame], Tuple[np.ndarray, np.ndarray]],
+    cities: List[np.ndarray],
+    read: Callable[[np.ndarray], pd.DataFrame],
+    workers: int,
+) -> Iterator[Tuple[np.ndarray, Tuple[np.ndarray, np.ndarray]]]:
+    """
+    (rows, task(read(rows))) per city from a process pool, with at most
+    one city per worker read and in flight at a time.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Tuple[np.ndarray, Future]] = deque()
+        for rows in cities:
+            if len(pending) >= workers:
+                done, future = pending.popleft()
+                yield done, future.result()
+            pending.append((rows, pool.submit(task, read(rows))))
+        while pending:
+            done, future = pending.popleft()
+            yield done, future.result()
+
+
+def _multi_hot(values: pd.Series, weight: float) -> np.ndarray:
+    """
+    Unit-length multi-hot rows over the comma-separated values of a
+    column (lowercased), scaled by sqrt(weight).
+    """
+    tokens = values.astype(object).map(
+        lambda value: sorted({token.lower() for token in split_multi_value(value)})
+    )
+    exploded = tokens.explode().dropna()
+    codes, vocabulary = pd.factorize(exploded)
+    matrix = np.zeros((len(values.index), len(vocabulary)), dtype=np.float32)
+    matrix[np.asarray(exploded.index, dtype=np.int64), codes] = 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0) * np.float32(np.sqrt(weight))
+
+
+def _numeric(frame: pd.DataFrame, price_column: str, rating_column: str) -> np.ndarray:
+    """
+    Price (log2) and rating columns of one city's rows, weighted; missing
+    values take the city median.
+    """
+    columns: List[np.ndarray] = []
+    for column, weight, transform in (
+        (price_column, PRICE_WEIGHT, lambda v: np.log2(np.maximum(v, 1.0))),
+        (rating_column, RATING_WEIGHT, lambda v: v),
+    ):
+        if column not in frame.columns:
+            continue
+        values = pd.to_numeric(frame[column], errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+        known = ~np.isnan(values)
+        fill = np.median(values[known]) if known.any() else 0.0
+        values = transform(np.where(known, values, fill))
+        columns.append((values * np.sqrt(weight)).astype(np.float32))
+    if not columns:
+        return np.zeros((len(frame.index), 0), dtype=np.float32)
+    return np.column_stack(columns)
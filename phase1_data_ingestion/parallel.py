@@ -0,0 +1,110 @@
+"""
+Multi-core cleaning for the Phase 1 pipeline.
+
+Row-wise normalization (string stripping, price parsing, rating parsing)
+is independent per row, so shards of the data are normalized in a
+process pool. Deduplication (or entity resolution) needs the whole frame
+and runs once up front in the parent; dtype compaction runs once at the
+end. The result is identical to `DataCleaner.clean()` on the same input.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Deque, Iterable, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_cleaner import DataCleaner, RowDeduplicator
+
+# Frames smaller than this are cleaned serially; pool start-up would dominate.
+MIN_ROWS_FOR_PARALLEL = 20_000
+
+
+def default_workers() -> int:
+    return max(os.cpu_count() or 1, 1)
+
+
+def clean_parallel(
+    df: pd.DataFrame,
+    cleaner: DataCleaner,
+    workers: int | None = None,
+    min_rows: int = MIN_ROWS_FOR_PARALLEL,
+) -> pd.DataFrame:
+    """
+    Clean `df` across `workers` processes (default: one per core).
+    """
+    workers = workers or default_workers()
+    if workers <= 1 or len(df.index) < min_rows:
+        return cleaner.clean(df)
+
+    combined = normalize_parallel(cleaner.deduplicate(df), cleaner, workers, min_rows=0)
+    return cleaner.compact(combined) if cleaner.compact_dtypes else combined
+
+
+def normalize_parallel(
+    df: pd.DataFrame,
+    cleaner: DataCleaner,
+    workers: int | None = None,
+    min_rows: int = MIN_ROWS_FOR_PARALLEL,
+) -> pd.DataFrame:
+    """
+    `cleaner.normalize(df)` across `workers` processes, keeping index labels.
+    """
+    workers = workers or default_workers()
+    if workers <= 1 or len(df.index) < min_rows:
+        return cleaner.normalize(df)
+
+    bounds = np.linspace(0, len(df.index), num=workers + 1, dtype=np.int64)
+    shards = [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(normalize_shard, [cleaner] * len(shards), shards))
+    return pd.concat([normalized for normalized, _ in results])
+
+
+def clean_batches_parallel(
+    batches: Iterable[pd.DataFrame],
+    cleaner: DataCleaner,
+    deduplicator: RowDeduplicator,
+    workers: int | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Normalize streamed batches across a process pool, yielding cleaned
+    batches in input order with duplicates (across all batches) removed.
+
+    At most two batches per worker are in flight, so memory stays bounded
+    however long the stream is.
+    """
+    workers = workers or default_workers()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for normalized, hashes in _bounded_map(pool, cleaner, batches, window=2 * workers):
+            yield normalized[deduplicator.keep_mask(hashes)]
+
+
+def normalize_shard(
+    cleaner: DataCleaner, shard: pd.DataFrame
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Worker task: normalize a shard and return it with the raw-row hashes
+    of the rows that survived normalization.
+    """
+    return cleaner.normalize_with_hashes(shard)
+
+
+def _bounded_map(
+    pool: Executor,
+    cleaner: DataCleaner,
+    batches: Iterable[pd.DataFrame],
+    window: int,
+) -> Iterator[Tuple[pd.DataFrame, np.ndarray]]:
+    pending: Deque[Future] = deque()
+    for batch in batches:
+        pending.append(pool.submit(normalize_shard, cleaner, batch))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
@@ -1,28 +1,363 @@
 """
 End-to-end Phase 1 pipeline:
-- Load raw data from Hugging Face.
-- Clean and normalize it.
-- Return an in-memory store.
+- Load a cached snapshot of the cleaned data when one exists.
+- Otherwise load raw data from Hugging Face, clean and normalize it,
+  and write a snapshot for the next start.
+- Return an in-memory store whose heavy text columns stay on disk, an
+  indexed SQLite store (backend "sqlite"), or a store mapped from a file
+  shared by all worker processes (backend "shared").
+
+A streaming mode cleans the dataset batch by batch for exports that do
+not fit in memory, and either mode can spread cleaning across processes.
 """
 
 from __future__ import annotations
 
+import sqlite3
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+import numpy as np
 import pandas as pd
 
-from .data_cleaner import DataCleaner
+from .config import DatasetConfig, SnapshotConfig
+from .data_cleaner import DataCleaner, RowDeduplicator
 from .data_loader import HFDatasetLoader
-from .storage import InMemoryRestaurantStore
+from .entity_resolution import EntityResolver
+from .neighbors import NeighborIndex, build_neighbor_index
+from .parallel import clean_batches_parallel
+from .price_profiles import compute_price_profiles, profiles_to_json
+from .refresh import compute_store_version, rebuild_incrementally
+from .snapshot import SnapshotStore, SnapshotWriter, compute_fingerprint
+from .storage import InMemoryRestaurantStore, ProjectedRestaurantStore, RestaurantStore
+from .text_index import build_text_index, iter_text_frames
+
+DEFAULT_BATCH_SIZE = 10_000
+
+MEMORY_BACKEND = "memory"
+SQLITE_BACKEND = "sqlite"
+SHARED_BACKEND = "shared"
+
+T = TypeVar("T")
+
+
+def build_phase1_store(
+    dataset_config: DatasetConfig | None = None,
+    snapshot_config: SnapshotConfig | None = None,
+    streaming: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = 1,
+    rebuild: bool = False,
+) -> RestaurantStore:
+    """
+    Run the full Phase 1 ingestion pipeline and return a restaurant store.
+
+    When snapshots are enabled and one matches the dataset/cleaner
+    fingerprint, it is loaded directly and no network access is needed.
+    Heavy free-text columns are then served from a memory-mapped sidecar
+    instead of being held in every process.
+
+    With `streaming=True` the raw dataset is never materialized: batches
+    of `batch_size` rows are cleaned one at a time and appended to the
+    snapshot on disk.
+
+    Listings of the same restaurant are collapsed into one entity row
+    with a stable `restaurant_id` (see `EntityResolver`).
+
+    `workers > 1` cleans shards (or batches) in a process pool with output
+    identical to the serial path. `rebuild=True` ignores an existing
+    snapshot and replaces it, e.g. for scheduled re-ingestion.
+
+    Per-city price profiles, the free-text vector index and each
+    restaurant's similar-restaurant list are computed from the cleaned
+    data and stored with the snapshot (`store.price_profiles`,
+    `store.text_index`, `store.neighbors`); `workers` also spreads the
+    neighbor computation across cities.
+
+    With the "sqlite" backend the snapshot also gets an indexed database
+    file, and a later start opens that file without loading any data.
+    With the "shared" backend the first worker process publishes the hot
+    columns to a memory-mapped file that every worker attaches to.
+    """
+    loader = HFDatasetLoader(config=dataset_config)
+    cleaner = default_cleaner()
+    snapshots = SnapshotStore(snapshot_config)
+    heavy_columns = snapshots.config.heavy_columns
+    fingerprint = compute_fingerprint(loader.config, cleaner, heavy_columns)
+    backend = snapshots.config.backend if snapshots.config.enabled else MEMORY_BACKEND
+
+    if backend == SHARED_BACKEND:
+        # One process builds and publishes; the others wait, then attach.
+        with snapshots.lock(fingerprint):
+            shared = None if rebuild else _try_open(snapshots.open_shared, fingerprint)
+            if shared is not None:
+                return shared
+            store = _load_or_build(
+                loader, cleaner, snapshots, fingerprint, streaming, batch_size, workers, rebuild
+            )
+            return snapshots.publish_shared(fingerprint, store)
+
+    if backend == SQLITE_BACKEND and not rebuild and snapshots.exists(fingerprint):
+        database = _try_open(snapshots.open_database, fingerprint)
+        if database is not None:
+            return database
+
+    store = _load_or_build(
+        loader, cleaner, snapshots, fingerprint, streaming, batch_size, workers, rebuild
+    )
+    return _serving_store(snapshots, fingerprint, store)
+
+
+def refresh_phase1_store(
+    previous: RestaurantStore,
+    dataset_config: DatasetConfig | None = None,
+    snapshot_config: SnapshotConfig | None = None,
+) -> RestaurantStore:
+    """
+    Re-read the dataset and return the next store version.
+
+    Only rows whose raw source changed since `previous` are cleaned again.
+    If nothing changed, `previous` itself is returned, so callers can
+    compare versions to decide whether to swap. The snapshot is rewritten
+    so the next cold start sees the refreshed data.
+    """
+    loader = HFDatasetLoader(config=dataset_config)
+    cleaner = default_cleaner()
+    snapshots = SnapshotStore(snapshot_config)
+    fingerprint = compute_fingerprint(loader.config, cleaner, snapshots.config.heavy_columns)
+
+    if snapshots.config.enabled and snapshots.config.backend == SHARED_BACKEND:
+        with snapshots.lock(fingerprint):
+            # Another worker may already have published a newer version.
+            shared = _try_open(snapshots.open_shared, fingerprint)
+            if shared is not None and shared.version != previous.version:
+                return shared
+            return _refresh(previous, loader, cleaner, snapshots, fingerprint)
+    return _refresh(previous, loader, cleaner, snapshots, fingerprint)
+
+
+def _refresh(
+    previous: RestaurantStore,
+    loader: HFDatasetLoader,
+    cleaner: DataCleaner,
+    snapshots: SnapshotStore,
+    fingerprint: str,
+) -> RestaurantStore:
+    raw_df: pd.DataFrame = loader.load()
+    cleaned_df, row_hashes = rebuild_incrementally(previous, raw_df, cleaner)
+    if compute_store_version(fingerprint, row_hashes) == previous.version:
+        return previous
+    store = _publish(snapshots, fingerprint, cleaner, cleaned_df, row_hashes)
+    return _serving_store(snapshots, fingerprint, store)
+
+
+def default_cleaner() -> DataCleaner:
+    """
+    Cleaner used by the pipeline: default rules plus entity resolution.
+    """
+    return DataCleaner(entity_resolver=EntityResolver())
 
 
-def build_phase1_store() -> InMemoryRestaurantStore:
+def _load_or_build(
+    loader: HFDatasetLoader,
+    cleaner: DataCleaner,
+    snapshots: SnapshotStore,
+    fingerprint: str,
+    streaming: bool,
+    batch_size: int,
+    workers: int,
+    rebuild: bool,
+) -> InMemoryRestaurantStore:
     """
-    Run the full Phase 1 ingestion pipeline and return an in-memory store.
+    Load the matching snapshot, or build (and snapshot) the store.
     """
-    loader = HFDatasetLoader()
+    if not rebuild and snapshots.config.enabled and snapshots.exists(fingerprint):
+        try:
+            return snapshots.load_store(fingerprint)
+        except (OSError, ValueError):
+            # Unreadable snapshot: fall through and rebuild it.
+            pass
+
+    if streaming:
+        return _build_streaming(loader, cleaner, snapshots, fingerprint, batch_size, workers)
+
     raw_df: pd.DataFrame = loader.load()
+    # A full build is an incremental rebuild against an empty store.
+    empty = InMemoryRestaurantStore(data=pd.DataFrame())
+    cleaned_df, row_hashes = rebuild_incrementally(empty, raw_df, cleaner, workers)
+    return _publish(snapshots, fingerprint, cleaner, cleaned_df, row_hashes, workers)
+
+
+def _try_open(open_fn: Callable[[str], Optional[T]], fingerprint: str) -> Optional[T]:
+    try:
+        return open_fn(fingerprint)
+    except (OSError, ValueError, sqlite3.Error):
+        # Unreadable file: treat as missing so it gets rebuilt.
+        return None
+
+
+def _serving_store(
+    snapshots: SnapshotStore, fingerprint: str, store: InMemoryRestaurantStore
+) -> RestaurantStore:
+    """
+    Return the store in the configured backend, building its database or
+    shared file on first use.
+    """
+    if not snapshots.config.enabled:
+        return store
+    if snapshots.config.backend == SQLITE_BACKEND:
+        return snapshots.open_database(fingerprint) or snapshots.build_database(
+            fingerprint, store
+        )
+    if snapshots.config.backend == SHARED_BACKEND:
+        return snapshots.publish_shared(fingerprint, store)
+    return store
+
+
+def _publish(
+    snapshots: SnapshotStore,
+    fingerprint: str,
+    cleaner: DataCleaner,
+    cleaned_df: pd.DataFrame,
+    row_hashes: np.ndarray | None,
+    workers: int = 1,
+) -> InMemoryRestaurantStore:
+    """
+    Version, profile and index the cleaned data, write its snapshot and
+    return the store.
+    """
+    version = compute_store_version(fingerprint, row_hashes)
+    profiles = compute_price_profiles(cleaned_df, cleaner.city_column, cleaner.price_column)
+    cleaned_store = InMemoryRestaurantStore(data=cleaned_df)
+    text_index = build_text_index(iter_text_frames(cleaned_store))
+    neighbors = _build_neighbors(cleaned_store, cleaner, workers)
+    if not snapshots.config.enabled:
+        return InMemoryRestaurantStore(
+            data=cleaned_df,
+            version=version,
+            row_hashes=row_hashes,
+            price_profiles=profiles,
+            text_index=text_index,
+            neighbors=neighbors,
+        )
+
+    heavy_columns = snapshots.config.heavy_columns
+    snapshots.save(
+        fingerprint,
+        cleaned_df,
+        metadata={"version": version, "price_profiles": profiles_to_json(profiles)},
+        heavy_columns=heavy_columns,
+        row_hashes=row_hashes,
+        text_index=text_index,
+        neighbors=neighbors,
+    )
+    hot_df = cleaned_df.drop(columns=[c for c in heavy_columns if c in cleaned_df.columns])
+    return ProjectedRestaurantStore(
+        data=hot_df,
+        version=version,
+        row_hashes=row_hashes,
+        price_profiles=profiles,
+        text_index=snapshots.load_text_index(fingerprint),
+        neighbors=snapshots.load_neighbors(fingerprint),
+        sidecar=snapshots.open_sidecar(fingerprint),
+    )
+
+
+def _describe(cleaner: DataCleaner) -> Callable[[pd.DataFrame], Dict[str, Any]]:
+    """
+    Manifest entries derived from the final cleaned frame.
+    """
+
+    def describe(df: pd.DataFrame) -> Dict[str, Any]:
+        profiles = compute_price_profiles(df, cleaner.city_column, cleaner.price_column)
+        return {"price_profiles": profiles_to_json(profiles)}
+
+    return describe
+
+
+def _build_streaming(
+    loader: HFDatasetLoader,
+    cleaner: DataCleaner,
+    snapshots: SnapshotStore,
+    fingerprint: str,
+    batch_size: int,
+    workers: int,
+) -> InMemoryRestaurantStore:
+    """
+    Clean the dataset batch by batch, deduplicating across batches.
+
+    Entities are resolved once all batches are in, among the rows that
+    survived cleaning. The text index is then built from the written
+    rows, block by block, and the neighbor lists from their hot columns,
+    both before the manifest marks the snapshot complete.
+    The store gets source hashes and a content version like a full build,
+    so refreshing unchanged data keeps it.
+    """
+    finalize = cleaner.finalize
+    deduplicator = RowDeduplicator()
+    cleaned_batches = _clean_stream(
+        loader.iter_batches(batch_size), cleaner, deduplicator, workers
+    )
+
+    def source_hashes(staged: pd.DataFrame) -> np.ndarray:
+        # The deduplicator kept one raw-row hash per staged row, in order.
+        return cleaner.source_hashes(staged, deduplicator.row_hashes())
+
+    if not snapshots.config.enabled:
+        # Without a snapshot directory only the cleaned rows are kept.
+        batches = list(cleaned_batches)
+        staged = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame()
+        row_hashes = source_hashes(staged)
+        data = finalize(staged)
+        store = InMemoryRestaurantStore(
+            data=data,
+            version=compute_store_version(fingerprint, row_hashes),
+            row_hashes=row_hashes,
+            price_profiles=compute_price_profiles(
+                data, cleaner.city_column, cleaner.price_column
+            ),
+        )
+        store.text_index = build_text_index(iter_text_frames(store))
+        store.neighbors = _build_neighbors(store, cleaner, workers)
+        return store
+
+    writer = SnapshotWriter(snapshots, fingerprint, snapshots.config.heavy_columns)
+    try:
+        for batch in cleaned_batches:
+            writer.append(batch)
+        writer.finish(
+            finalize=finalize,
+            describe=_describe(cleaner),
+            source_hashes=source_hashes,
+            indexes=lambda written: (
+                build_text_index(iter_text_frames(written)),
+                _build_neighbors(written, cleaner, workers),
+            ),
+        )
+    except BaseException:
+        writer.abort()
+        raise
+
+    return snapshots.load_store(fingerprint)
+
 
-    cleaner = DataCleaner()
-    cleaned_df = cleaner.clean(raw_df)
+def _build_neighbors(
+    store: RestaurantStore, cleaner: DataCleaner, workers: int
+) -> NeighborIndex:
+    return build_neighbor_index(
+        store,
+        workers=workers,
+        city_column=cleaner.city_column,
+        price_column=cleaner.price_column,
+        rating_column=cleaner.rating_column,
+    )
 
-    return InMemoryRestaurantStore(data=cleaned_df)
 
+def _clean_stream(
+    batches: Iterator[pd.DataFrame],
+    cleaner: DataCleaner,
+    deduplicator: RowDeduplicator,
+    workers: int,
+) -> Iterator[pd.DataFrame]:
+    if workers > 1:
+        return clean_batches_parallel(batches, cleaner, deduplicator, workers)
+    return (cleaner.clean_batch(batch, deduplicator) for batch in batches)
@@ -0,0 +1,165 @@
+"""
+Per-city price profiles computed at ingest (Phase 1).
+
+A profile summarizes one city's "approx cost for two" distribution as a
+fixed set of quantiles plus a histogram. Profiles are computed once when a
+snapshot is written and stored with it, so user budgets can be read
+relative to each city: "800" is a mid-range budget in one city and a
+high one in another, and a single-number budget selects a similar share
+of each city's restaurants instead of a fixed ±20% price band.
+
+Every lookup is a binary search over the sorted quantiles.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Quantile levels kept per city (every 5th percentile).
+QUANTILE_LEVELS: Tuple[float, ...] = tuple(i / 20 for i in range(21))
+
+HISTOGRAM_BINS = 20
+
+# Percentile cut points between the "low", "mid" and "high" buckets.
+BUCKET_CUTS: Tuple[float, ...] = (1 / 3, 2 / 3)
+BUCKET_LABELS: Tuple[str, ...] = ("low", "mid", "high")
+
+# Share of a city's restaurants on each side of a single-number budget.
+DEFAULT_BAND_WIDTH = 0.1
+
+
+@dataclass(frozen=True)
+class PriceProfile:
+    """
+    Price distribution of one city.
+
+    `quantiles[i]` is the price at `QUANTILE_LEVELS[i]`; the histogram has
+    `len(histogram_edges) - 1` bins.
+    """
+
+    count: int
+    quantiles: Tuple[float, ...]
+    histogram_edges: Tuple[float, ...]
+    histogram_counts: Tuple[int, ...]
+
+    @classmethod
+    def from_prices(cls, prices: np.ndarray, bins: int = HISTOGRAM_BINS) -> "PriceProfile":
+        prices = np.asarray(prices, dtype=np.float64)
+        prices = prices[~np.isnan(prices)]
+        if prices.size == 0:
+            raise ValueError("Cannot profile an empty price column.")
+        quantiles = np.quantile(prices, QUANTILE_LEVELS)
+        counts, edges = np.histogram(prices, bins=bins)
+        return cls(
+            count=int(prices.size),
+            quantiles=tuple(float(q) for q in quantiles),
+            histogram_edges=tuple(float(e) for e in edges),
+            histogram_counts=tuple(int(c) for c in counts),
+        )
+
+    def percentile_of(self, price: float) -> float:
+        """
+        Share of the city's restaurants priced at or below `price` (0..1),
+        interpolated between the stored quantiles.
+        """
+        q = self.quantiles
+        if price < q[0]:
+            return 0.0
+        if price >= q[-1]:
+            return 1.0
+        # Ties span several quantiles; land in the middle of the run.
+        lo = bisect_left(q, price)
+        hi = bisect_right(q, price)
+        if lo < hi:
+            return (QUANTILE_LEVELS[lo] + QUANTILE_LEVELS[hi - 1]) / 2
+        left, right = q[hi - 1], q[hi]
+        share = (price - left) / (right - left)
+        return QUANTILE_LEVELS[hi - 1] + share * (QUANTILE_LEVELS[hi] - QUANTILE_LEVELS[hi - 1])
+
+    def price_at(self, percentile: float) -> float:
+        """
+        Price at a percentile (0..1), interpolated between quantiles.
+        """
+        percentile = min(max(percentile, 0.0), 1.0)
+        i = bisect_right(QUANTILE_LEVELS, percentile)
+        if i >= len(QUANTILE_LEVELS):
+            return self.quantiles[-1]
+        left_level, right_level = QUANTILE_LEVELS[i - 1], QUANTILE_LEVELS[i]
+        left, right = self.quantiles[i - 1], self.quantiles[i]
+        return left + (percentile - left_level) / (right_level - left_level) * (right - left)
+
+    def bucket(self, price: float) -> str:
+        """
+        "low", "mid" or "high" relative to this city's prices.
+        """
+        return BUCKET_LABELS[bisect_right(BUCKET_CUTS, self.percentile_of(price))]
+
+    def band(self, price: float, width: float = DEFAULT_BAND_WIDTH) -> Tuple[float, float]:
+        """
+        Price range holding roughly `2 * width` of the city's restaurants
+        around `price`. The range always includes `price` itself.
+        """
+        percentile = self.percentile_of(price)
+        lower = self.price_at(percentile - width)
+        upper = self.price_at(percentile + width)
+        return min(lower, price), max(upper, price)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "quantiles": list(self.quantiles),
+            "histogram_edges": list(self.histogram_edges),
+            "histogram_counts": list(self.histogram_counts),
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> "PriceProfile":
+        return cls(
+            count=int(payload["count"]),
+            quantiles=tuple(float(q) for q in payload["quantiles"]),
+            histogram_edges=tuple(float(e) for e in payload["histogram_edges"]),
+            histogram_counts=tuple(int(c) for c in payload["histogram_counts"]),
+        )
+
+
+def compute_price_profiles(
+    df: pd.DataFrame,
+    city_column: str = "city",
+    price_column: str = "approx_cost(for two people)",
+) -> Dict[str, PriceProfile]:
+    """
+    Profile the price distribution of every city in a cleaned frame.
+
+    Returns an empty mapping when either column is missing.
+    """
+    if city_column not in df.columns or price_column not in df.columns or df.empty:
+        return {}
+    prices = pd.to_numeric(df[price_column], errors="coerce").to_numpy(
+        dtype=np.float64, na_value=np.nan
+    )
+    cities = df[city_column].astype(str).to_numpy()
+    profiles: Dict[str, PriceProfile] = {}
+    for city, positions in pd.Series(cities).groupby(cities, sort=True).indices.items():
+        city_prices = prices[positions]
+        if np.isnan(city_prices).all():
+            continue
+        profiles[str(city)] = PriceProfile.from_prices(city_prices)
+    return profiles
+
+
+def profiles_to_json(profiles: Mapping[str, PriceProfile]) -> Dict[str, Any]:
+    return {city: profile.to_dict() for city, profile in profiles.items()}
+
+
+def profiles_from_json(payload: Optional[Mapping[str, Any]]) -> Optional[Dict[str, PriceProfile]]:
+    """
+    Inverse of `profiles_to_json`; None when nothing was stored.
+    """
+    if payload is None:
+        return None
+    return {city: PriceProfile.from_dict(profile) for city, profile in payload.items()}
@@ -0,0 +1,132 @@
+"""
+Cross-process sharing of the cleaned dataset (Phase 1).
+
+With several API worker processes, the first one to start takes a file
+lock, builds the store once and publishes its columns as an uncompressed
+Arrow IPC file. Every worker (including the publisher) then memory-maps
+that file and wraps the buffers in a DataFrame without copying, so the
+page cache holds one copy of the data however many workers attach.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from .storage import ProjectedRestaurantStore
+
+try:  # POSIX only; elsewhere publishing is not coordinated.
+    import fcntl
+except ImportError:  # pragma: no cover - platform specific
+    fcntl = None  # type: ignore[assignment]
+
+_VERSION_KEY = b"zomato_store_version"
+
+
+@contextlib.contextmanager
+def file_lock(path: str | Path) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock on `path` (created if missing).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def write_shared_frame(df: pd.DataFrame, path: str | Path, version: str) -> Path:
+    """
+    Write `df` as a mappable Arrow IPC file tagged with the store version.
+
+    Float columns keep NaN as a value rather than an Arrow null, so they
+    map straight back to NumPy arrays without a copy.
+    """
+    path = Path(path)
+    arrays = []
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_float_dtype(series.dtype) and not isinstance(
+            series.dtype, pd.ArrowDtype
+        ):
+            arrays.append(pa.array(series.to_numpy(), from_pandas=False))
+        else:
+            arrays.append(pa.array(series, from_pandas=True))
+    table = pa.Table.from_arrays(arrays, names=[str(col) for col in df.columns])
+    table = table.replace_schema_metadata({_VERSION_KEY: version.encode("utf-8")})
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+    return path
+
+
+def shared_frame_version(path: str | Path) -> Optional[str]:
+    """
+    Store version a shared file was published for, or None if unreadable.
+    """
+    try:
+        with pa.memory_map(str(path), "r") as source:
+            metadata = ipc.open_file(source).schema.metadata or {}
+    except (OSError, ValueError):
+        return None
+    raw = metadata.get(_VERSION_KEY)
+    return raw.decode("utf-8") if raw is not None else None
+
+
+def map_shared_frame(path: str | Path) -> pd.DataFrame:
+    """
+    Zero-copy DataFrame over a shared file.
+
+    Numeric columns become read-only NumPy views of the mapped pages;
+    strings and categoricals stay Arrow-backed (`pd.ArrowDtype`).
+    """
+    source = pa.memory_map(str(path), "r")
+    table = ipc.open_file(source).read_all()
+    return table.to_pandas(types_mapper=_arrow_backed, split_blocks=True)
+
+
+@dataclass
+class SharedRestaurantStore(ProjectedRestaurantStore):
+    """
+    Store whose hot columns live in a shared memory-mapped file.
+    """
+
+    shared_path: Optional[Path] = None
+
+    def memory_usage(self) -> Dict[str, int]:
+        # Every column is mapped (shared page cache), not private memory.
+        return {col: 0 for col in self.columns}
+
+    def mapped_usage(self) -> Dict[str, int]:
+        usage = {
+            str(col): int(nbytes)
+            for col, nbytes in self.data.memory_usage(index=False, deep=False).items()
+        }
+        usage.update(super().mapped_usage())
+        return usage
+
+
+def _arrow_backed(arrow_type: pa.DataType) -> Optional[pd.ArrowDtype]:
+    if (
+        pa.types.is_dictionary(arrow_type)
+        or pa.types.is_string(arrow_type)
+        or pa.types.is_large_string(arrow_type)
+    ):
+        return pd.ArrowDtype(arrow_type)
+    # Let pyarrow convert the rest (zero-copy for null-free primitives).
+    return None
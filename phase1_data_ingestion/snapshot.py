@@ -0,0 +1,633 @@
+"""
+Local columnar snapshots of the cleaned dataset (Phase 1).
+
+A snapshot is a directory holding the hot columns of the cleaned DataFrame
+as Parquet, the heavy free-text columns as a memory-mappable Arrow IPC
+sidecar, the free-text vector index and the similar-restaurant lists as
+memory-mappable .npy files, and a small JSON manifest (which also carries
+the per-city price profiles computed at ingest). Snapshots are keyed by a
+fingerprint of the dataset source and the cleaner settings, so a new
+revision or a changed cleaning rule never reuses stale data, while an
+unchanged setup can start fully offline without touching Hugging Face.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from .config import DEFAULT_SNAPSHOT_CONFIG, DatasetConfig, SnapshotConfig
+from .data_cleaner import DataCleaner
+from .neighbors import NeighborIndex
+from .price_profiles import PriceProfile, profiles_from_json
+from .refresh import compute_store_version
+from .shared import (
+    SharedRestaurantStore,
+    file_lock,
+    map_shared_frame,
+    shared_frame_version,
+    write_shared_frame,
+)
+from .sqlite_store import SQLiteRestaurantStore
+from .storage import HeavyColumnSidecar, InMemoryRestaurantStore, ProjectedRestaurantStore
+from .text_index import TextIndex
+
+# Bump when the on-disk layout changes.
+SNAPSHOT_FORMAT_VERSION = 6
+
+_DATA_FILE = "data.parquet"
+_HEAVY_FILE = "heavy.arrow"
+_ROW_HASHES_FILE = "row_hashes.npy"
+_MANIFEST_FILE = "manifest.json"
+_DATABASE_FILE = "restaurants.sqlite"
+_SHARED_FILE = "shared.arrow"
+_TEXT_INDEX_DIR = "text_index"
+_NEIGHBORS_DIR = "neighbors"
+_LOCK_FILE = ".lock"
+
+# Text index and neighbor lists built for a snapshot.
+_Indexes = Tuple[Optional[TextIndex], Optional[NeighborIndex]]
+
+# Heavy rows gathered per write when a whole-frame step reorders rows.
+HEAVY_FILTER_ROWS = 65_536
+
+
+def compute_fingerprint(
+    dataset_config: DatasetConfig,
+    cleaner: DataCleaner,
+    heavy_columns: Sequence[str] = (),
+) -> str:
+    """
+    Return a short, stable fingerprint of the dataset source, cleaner
+    settings and column layout.
+    """
+    payload = {
+        "format": SNAPSHOT_FORMAT_VERSION,
+        "dataset": asdict(dataset_config),
+        "cleaner": cleaner.settings(),
+        "heavy_columns": list(heavy_columns),
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class SnapshotStore:
+    """
+    Reads and writes cleaned-data snapshots under a local directory.
+    """
+
+    def __init__(self, config: SnapshotConfig | None = None) -> None:
+        self._config = config or DEFAULT_SNAPSHOT_CONFIG
+
+    @property
+    def config(self) -> SnapshotConfig:
+        return self._config
+
+    def path_for(self, fingerprint: str) -> Path:
+        return Path(self._config.directory) / fingerprint
+
+    def exists(self, fingerprint: str) -> bool:
+        """
+        A snapshot is complete once its manifest has been written.
+        """
+        return (self.path_for(fingerprint) / _MANIFEST_FILE).is_file()
+
+    def load(self, fingerprint: str) -> pd.DataFrame:
+        """
+        Load the hot columns of the cleaned DataFrame stored under the
+        given fingerprint.
+        """
+        return pd.read_parquet(self.path_for(fingerprint) / _DATA_FILE)
+
+    def open_sidecar(self, fingerprint: str) -> Optional[HeavyColumnSidecar]:
+        path = self.path_for(fingerprint) / _HEAVY_FILE
+        return HeavyColumnSidecar(path) if path.is_file() else None
+
+    def load_store(self, fingerprint: str) -> InMemoryRestaurantStore:
+        """
+        Load a snapshot as a store, mapping heavy columns when present.
+        """
+        return self.open_store(fingerprint, self.read_manifest(fingerprint))
+
+    def open_store(
+        self, fingerprint: str, manifest: Dict[str, Any]
+    ) -> InMemoryRestaurantStore:
+        """
+        Store over the snapshot's data files as described by `manifest`,
+        which need not have been written yet.
+        """
+        data = self.load(fingerprint)
+        version = _manifest_version(fingerprint, manifest)
+        hashes_path = self.path_for(fingerprint) / _ROW_HASHES_FILE
+        row_hashes = np.load(hashes_path) if hashes_path.is_file() else None
+        profiles = profiles_from_json(manifest.get("price_profiles"))
+        text_index = self._text_index(fingerprint, manifest)
+        neighbors = self._neighbors(fingerprint, manifest)
+        sidecar = self.open_sidecar(fingerprint)
+        if sidecar is None:
+            return InMemoryRestaurantStore(
+                data=data,
+                version=version,
+                row_hashes=row_hashes,
+                price_profiles=profiles,
+                text_index=text_index,
+                neighbors=neighbors,
+            )
+        return ProjectedRestaurantStore(
+            data=data,
+            version=version,
+            row_hashes=row_hashes,
+            price_profiles=profiles,
+            text_index=text_index,
+            neighbors=neighbors,
+            sidecar=sidecar,
+        )
+
+    def load_price_profiles(self, fingerprint: str) -> Optional[Dict[str, PriceProfile]]:
+        """
+        Per-city price profiles stored with the snapshot, if any.
+        """
+        return profiles_from_json(self.read_manifest(fingerprint).get("price_profiles"))
+
+    def load_text_index(self, fingerprint: str) -> Optional[TextIndex]:
+        """
+        Memory-map the snapshot's free-text index, if it has one that was
+        built from the snapshot's version and matches its rows.
+        """
+        return self._text_index(fingerprint, self.read_manifest(fingerprint))
+
+    def save_text_index(self, fingerprint: str, index: TextIndex) -> Path:
+        version = _manifest_version(fingerprint, self.read_manifest(fingerprint))
+        return index.save(self.path_for(fingerprint) / _TEXT_INDEX_DIR, version)
+
+    def load_neighbors(self, fingerprint: str) -> Optional[NeighborIndex]:
+        """
+        Memory-map the snapshot's similar-restaurant lists, if it has lists
+        that were built from the snapshot's version and match its rows.
+        """
+        return self._neighbors(fingerprint, self.read_manifest(fingerprint))
+
+    def save_neighbors(self, fingerprint: str, neighbors: NeighborIndex) -> Path:
+        version = _manifest_version(fingerprint, self.read_manifest(fingerprint))
+        return neighbors.save(self.path_for(fingerprint) / _NEIGHBORS_DIR, version)
+
+    def _text_index(self, fingerprint: str, manifest: Dict[str, Any]) -> Optional[TextIndex]:
+        # A stale index from an earlier build may have the same row count.
+        path = self.path_for(fingerprint) / _TEXT_INDEX_DIR
+        if TextIndex.saved_version(path) != _manifest_version(fingerprint, manifest):
+            return None
+        index = TextIndex.load(path)
+        if index is None or index.rows != manifest.get("rows"):
+            return None
+        return index
+
+    def _neighbors(self, fingerprint: str, manifest: Dict[str, Any]) -> Optional[NeighborIndex]:
+        path = self.path_for(fingerprint) / _NEIGHBORS_DIR
+        if NeighborIndex.saved_version(path) != _manifest_version(fingerprint, manifest):
+            return None
+        neighbors = NeighborIndex.load(path)
+        if neighbors is None or neighbors.rows != manifest.get("rows"):
+            return None
+        return neighbors
+
+    def open_database(self, fingerprint: str) -> Optional[SQLiteRestaurantStore]:
+        """
+        Open the snapshot's SQLite database if it holds the current version.
+        """
+        path = self.path_for(fingerprint) / _DATABASE_FILE
+        if not path.is_file():
+            return None
+        database = SQLiteRestaurantStore(path)
+        version = str(self.read_manifest(fingerprint).get("version") or fingerprint)
+        if database.version != version:
+            database.close()
+            return None
+        database.text_index = self.load_text_index(fingerprint)
+        database.neighbors = self.load_neighbors(fingerprint)
+        return database
+
+    def build_database(
+        self, fingerprint: str, store: InMemoryRestaurantStore
+    ) -> SQLiteRestaurantStore:
+        """
+        Write `store` (a loaded snapshot) to the snapshot's SQLite database.
+        """
+        database = SQLiteRestaurantStore.build(
+            store, self.path_for(fingerprint) / _DATABASE_FILE, row_hashes=store.row_hashes
+        )
+        database.text_index = store.text_index
+        database.neighbors = store.neighbors
+        return database
+
+    def lock(self, fingerprint: str):
+        """
+        Exclusive cross-process lock for building/publishing a snapshot.
+        """
+        return file_lock(self.path_for(fingerprint) / _LOCK_FILE)
+
+    def open_shared(self, fingerprint: str) -> Optional[SharedRestaurantStore]:
+        """
+        Attach to the published shared file if it holds the current version.
+        """
+        path = self.path_for(fingerprint) / _SHARED_FILE
+        if not path.is_file() or not self.exists(fingerprint):
+            return None
+        version = str(self.read_manifest(fingerprint).get("version") or fingerprint)
+        if shared_frame_version(path) != version:
+            return None
+        hashes_path = self.path_for(fingerprint) / _ROW_HASHES_FILE
+        return SharedRestaurantStore(
+            data=map_shared_frame(path),
+            version=version,
+            row_hashes=np.load(hashes_path, mmap_mode="r") if hashes_path.is_file() else None,
+            price_profiles=self.load_price_profiles(fingerprint),
+            text_index=self.load_text_index(fingerprint),
+            neighbors=self.load_neighbors(fingerprint),
+            sidecar=self.open_sidecar(fingerprint),
+            shared_path=path,
+        )
+
+    def publish_shared(
+        self, fingerprint: str, store: InMemoryRestaurantStore
+    ) -> SharedRestaurantStore:
+        """
+        Publish the hot columns of a loaded snapshot for other processes and
+        attach to them.
+        """
+        path = self.path_for(fingerprint) / _SHARED_FILE
+        write_shared_frame(store.data, path, store.version)
+        shared = self.open_shared(fingerprint)
+        if shared is None:
+            raise ValueError(f"Store version {store.version} is not the current snapshot.")
+        return shared
+
+    def read_manifest(self, fingerprint: str) -> Dict[str, Any]:
+        with open(self.path_for(fingerprint) / _MANIFEST_FILE, encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def save(
+        self,
+        fingerprint: str,
+        df: pd.DataFrame,
+        metadata: Optional[Dict[str, Any]] = None,
+        heavy_columns: Sequence[str] = (),
+        row_hashes: Optional[np.ndarray] = None,
+        text_index: Optional[TextIndex] = None,
+        neighbors: Optional[NeighborIndex] = None,
+    ) -> Path:
+        """
+        Write the DataFrame and its manifest.
+
+        Columns listed in `heavy_columns` go to the Arrow sidecar instead of
+        the Parquet file. `row_hashes`, if given, is stored alongside so a
+        later refresh can rebuild incrementally, as are `text_index` and
+        `neighbors`.
+
+        Each file is written to a temporary name and renamed into place, and
+        the manifest is written last, so concurrent readers never observe a
+        half-written snapshot.
+        """
+        directory = self.path_for(fingerprint)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        heavy = [col for col in heavy_columns if col in df.columns]
+        heavy_path = directory / _HEAVY_FILE
+        if heavy:
+            HeavyColumnSidecar.write(df[heavy], heavy_path)
+        elif heavy_path.exists():
+            heavy_path.unlink()
+
+        _save_row_hashes(directory / _ROW_HASHES_FILE, row_hashes)
+        _save_indexes(
+            directory, _manifest_version(fingerprint, metadata or {}), text_index, neighbors
+        )
+
+        data_path = directory / _DATA_FILE
+        tmp_data = _tmp_path(data_path)
+        df.drop(columns=heavy).to_parquet(tmp_data)
+        os.replace(tmp_data, data_path)
+
+        self.write_manifest(
+            fingerprint,
+            rows=len(df.index),
+            columns=[str(col) for col in df.columns],
+            heavy_columns=heavy,
+            metadata=metadata,
+        )
+        return directory
+
+    def write_manifest(
+        self,
+        fingerprint: str,
+        rows: int,
+        columns: List[str],
+        heavy_columns: List[str],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Mark a snapshot as complete. Call only after all data files exist.
+        """
+        manifest = self.manifest(fingerprint, rows, columns, heavy_columns, metadata)
+        self._write_json(self.path_for(fingerprint) / _MANIFEST_FILE, manifest)
+
+    def manifest(
+        self,
+        fingerprint: str,
+        rows: int,
+        columns: List[str],
+        heavy_columns: List[str],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Manifest entries for a snapshot, as `write_manifest` writes them.
+        """
+        manifest = {
+            "fingerprint": fingerprint,
+            "format": SNAPSHOT_FORMAT_VERSION,
+            "rows": int(rows),
+            "columns": columns,
+            "heavy_columns": heavy_columns,
+        }
+        if metadata:
+            manifest.update(metadata)
+        return manifest
+
+    def _write_json(self, path: Path, payload: Dict[str, Any]) -> None:
+        tmp = _tmp_path(path)
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+
+
+class SnapshotWriter:
+    """
+    Appends cleaned batches to a snapshot without holding them all in memory.
+
+    Hot columns are staged in a Parquet file and heavy columns are appended
+    straight to the Arrow sidecar. `finish()` reloads only the hot columns,
+    applies an optional whole-frame step (e.g. dtype compaction) and
+    publishes the snapshot.
+    """
+
+    def __init__(
+        self,
+        snapshots: SnapshotStore,
+        fingerprint: str,
+        heavy_columns: Sequence[str] = (),
+    ) -> None:
+        self._snapshots = snapshots
+        self._fingerprint = fingerprint
+        self._requested_heavy = tuple(heavy_columns)
+        self._directory = snapshots.path_for(fingerprint)
+        self._staging_path = _tmp_path(self._directory / "staging.parquet")
+        self._heavy_tmp = _tmp_path(self._directory / _HEAVY_FILE)
+        self._schema: Optional[pa.Schema] = None
+        self._hot: List[str] = []
+        self._heavy: List[str] = []
+        self._hot_writer: Optional[pq.ParquetWriter] = None
+        self._heavy_sink: Optional[pa.OSFile] = None
+        self._heavy_writer: Optional[ipc.RecordBatchFileWriter] = None
+        self._rows = 0
+
+    @property
+    def rows_written(self) -> int:
+        return self._rows
+
+    def append(self, df: pd.DataFrame) -> None:
+        """
+        Append one cleaned batch. All batches must share the same columns.
+        """
+        if df.empty:
+            return
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._schema is None:
+            self._open(table.schema)
+        assert self._schema is not None and self._hot_writer is not None
+        table = table.select(self._schema.names).cast(self._schema)
+
+        self._hot_writer.write_table(table.select(self._hot))
+        if self._heavy_writer is not None:
+            self._heavy_writer.write_table(table.select(self._heavy))
+        self._rows += table.num_rows
+
+    def finish(
+        self,
+        finalize: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+        describe: Optional[Callable[[pd.DataFrame], Dict[str, Any]]] = None,
+        source_hashes: Optional[Callable[[pd.DataFrame], np.ndarray]] = None,
+        indexes: Optional[Callable[[InMemoryRestaurantStore], _Indexes]] = None,
+    ) -> Path:
+        """
+        Close the staged files and publish the snapshot.
+
+        `describe`, if given, returns extra manifest entries computed from
+        the final hot columns (e.g. price profiles). `source_hashes`, if
+        given, maps the staged hot columns to the source hash of each final
+        row; the hashes are stored with the snapshot and its manifest gets
+        the matching content `version`, as a full build's does. `indexes`,
+        if given, builds the text index and neighbor lists from a store
+        over the written rows. Everything is on disk before the manifest
+        marks the snapshot complete.
+        """
+        self._close_writers()
+        if self._schema is None:
+            # No rows at all: publish an empty snapshot.
+            empty = pd.DataFrame()
+            row_hashes = source_hashes(empty) if source_hashes else None
+            empty = finalize(empty) if finalize else empty
+            text_index, neighbors = (
+                indexes(InMemoryRestaurantStore(data=empty)) if indexes else (None, None)
+            )
+            return self._snapshots.save(
+                self._fingerprint,
+                empty,
+                metadata=self._metadata(empty, describe, row_hashes),
+                row_hashes=row_hashes,
+                text_index=text_index,
+                neighbors=neighbors,
+            )
+
+        hot_df = pd.read_parquet(self._staging_path)
+        # Hashed before `finalize`, which may modify the frame in place.
+        row_hashes = source_hashes(hot_df) if source_hashes else None
+        if finalize is not None:
+            hot_df = finalize(hot_df)
+        if len(hot_df.index) != self._rows:
+            # The whole-frame step dropped rows (e.g. entity resolution):
+            # keep the matching heavy rows, found by the surviving labels.
+            self._filter_heavy(hot_df.index.to_numpy())
+            hot_df = hot_df.reset_index(drop=True)
+
+        data_path = self._directory / _DATA_FILE
+        tmp_data = _tmp_path(data_path)
+        hot_df.to_parquet(tmp_data)
+        os.replace(tmp_data, data_path)
+        heavy_path = self._directory / _HEAVY_FILE
+        if self._heavy:
+            os.replace(self._heavy_tmp, heavy_path)
+        elif heavy_path.exists():
+            heavy_path.unlink()
+        self._staging_path.unlink()
+        _save_row_hashes(self._directory / _ROW_HASHES_FILE, row_hashes)
+
+        entries = dict(
+            rows=len(hot_df.index),
+            columns=[str(col) for col in hot_df.columns] + self._heavy,
+            heavy_columns=self._heavy,
+            metadata=self._metadata(hot_df, describe, row_hashes),
+        )
+        manifest = self._snapshots.manifest(self._fingerprint, **entries)
+        text_index, neighbors = (
+            indexes(self._snapshots.open_store(self._fingerprint, manifest))
+            if indexes
+            else (None, None)
+        )
+        _save_indexes(
+            self._directory, _manifest_version(self._fingerprint, manifest), text_index, neighbors
+        )
+        self._snapshots.write_manifest(self._fingerprint, **entries)
+        return self._directory
+
+    def _metadata(
+        self,
+        df: pd.DataFrame,
+        describe: Optional[Callable[[pd.DataFrame], Dict[str, Any]]],
+        row_hashes: Optional[np.ndarray],
+    ) -> Dict[str, Any]:
+        metadata = dict(describe(df)) if describe else {}
+        if row_hashes is not None:
+            if len(row_hashes) != len(df.index):
+                raise ValueError("source_hashes must return one hash per final row.")
+            metadata["version"] = compute_store_version(self._fingerprint, row_hashes)
+        return metadata
+
+    def abort(self) -> None:
+        """
+        Discard any staged files.
+        """
+        self._close_writers()
+        for path in (self._staging_path, self._heavy_tmp):
+            if path.exists():
+                path.unlink()
+
+    def _filter_heavy(self, positions: np.ndarray) -> None:
+        """
+        Rewrite the sidecar keeping the rows at `positions`, in that order,
+        without loading it whole.
+        """
+        if not self._heavy:
+            return
+        positions = np.asarray(positions, dtype=np.int64)
+        filtered_tmp = _tmp_path(self._directory / f"filtered.{_HEAVY_FILE}")
+        with pa.memory_map(str(self._heavy_tmp), "r") as source:
+            reader = ipc.open_file(source)
+            with pa.OSFile(str(filtered_tmp), "wb") as sink:
+                with ipc.new_file(sink, reader.schema) as writer:
+                    if np.all(positions[1:] > positions[:-1]):
+                        # Rows only dropped: filter each batch as it is read.
+                        start = 0
+                        for i in range(reader.num_record_batches):
+                            batch = reader.get_batch(i)
+                            stop = start + batch.num_rows
+                            lo, hi = np.searchsorted(positions, [start, stop])
+                            if hi > lo:
+                                writer.write_batch(batch.take(pa.array(positions[lo:hi] - start)))
+                            start = stop
+                    else:
+                        # Rows reordered: gather a chunk of output rows at a
+                        # time (read_all on a memory map does not copy).
+                        table = reader.read_all()
+                        for lo in range(0, len(positions), HEAVY_FILTER_ROWS):
+                            writer.write_table(table.take(positions[lo : lo + HEAVY_FILTER_ROWS]))
+        os.replace(filtered_tmp, self._heavy_tmp)
+
+    def _open(self, schema: pa.Schema) -> None:
+        self._schema = _widen_schema(schema)
+        self._heavy = [name for name in self._requested_heavy if name in schema.names]
+        self._hot = [name for name in schema.names if name not in self._heavy]
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+        hot_schema = pa.schema([self._schema.field(name) for name in self._hot])
+        self._hot_writer = pq.ParquetWriter(str(self._staging_path), hot_schema)
+        if self._heavy:
+            heavy_schema = pa.schema([self._schema.field(name) for name in self._heavy])
+            self._heavy_sink = pa.OSFile(str(self._heavy_tmp), "wb")
+            self._heavy_writer = ipc.new_file(self._heavy_sink, heavy_schema)
+
+    def _close_writers(self) -> None:
+        if self._hot_writer is not None:
+            self._hot_writer.close()
+            self._hot_writer = None
+        if self._heavy_writer is not None:
+            self._heavy_writer.close()
+            self._heavy_writer = None
+        if self._heavy_sink is not None:
+            self._heavy_sink.close()
+            self._heavy_sink = None
+
+
+def _widen_schema(schema: pa.Schema) -> pa.Schema:
+    """
+    Make a batch schema safe for later batches.
+
+    Integer columns may gain missing values in a later batch and all-null
+    columns may gain strings, so both are widened up front.
+    """
+    fields = []
+    for field in schema:
+        if pa.types.is_integer(field.type):
+            field = field.with_type(pa.float64())
+        elif pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field.with_nullable(True))
+    return pa.schema(fields)
+
+
+def _manifest_version(fingerprint: str, manifest: Dict[str, Any]) -> str:
+    return str(manifest.get("version") or fingerprint)
+
+
+def _save_indexes(
+    directory: Path,
+    version: str,
+    text_index: Optional[TextIndex],
+    neighbors: Optional[NeighborIndex],
+) -> None:
+    """
+    Write the text index and neighbor lists for `version`, or remove stale
+    ones when there are none.
+    """
+    for name, artifact in ((_TEXT_INDEX_DIR, text_index), (_NEIGHBORS_DIR, neighbors)):
+        path = directory / name
+        if artifact is not None:
+            artifact.save(path, version)
+        elif path.exists():
+            shutil.rmtree(path)
+
+
+def _save_row_hashes(path: Path, row_hashes: Optional[np.ndarray]) -> None:
+    """
+    Write `row_hashes` to `path`, or remove a stale file when there are none.
+    """
+    if row_hashes is not None:
+        tmp_hashes = _tmp_path(path)
+        with open(tmp_hashes, "wb") as fh:
+            np.save(fh, row_hashes)
+        os.replace(tmp_hashes, path)
+    elif path.exists():
+        path.unlink()
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
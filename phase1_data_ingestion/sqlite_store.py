@@ -0,0 +1,330 @@
+"""
+SQLite-backed restaurant store (Phase 1, storage "Option B").
+
+The cleaned dataset is written once to an on-disk SQLite database with
+composite indexes on the columns the repository filters by. API workers
+then open the same file read-only instead of each holding a pandas copy,
+and startup only has to open a file. Queries are plain parameterized SQL
+(see `RestaurantRepository.compile_query`).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .neighbors import NeighborIndex
+from .price_profiles import PriceProfile, profiles_from_json, profiles_to_json
+from .storage import RestaurantStore
+from .text_index import TextIndex
+
+TABLE = "restaurants"
+
+# Row position in the source store; also SQLite's rowid.
+POSITION_COLUMN = "_pos"
+
+# Raw source hash per row, kept so refreshes can rebuild incrementally.
+ROW_HASH_COLUMN = "_row_hash"
+
+# Composite indexes for the repository's filters: equality on city, then
+# a range on price or rating.
+DEFAULT_INDEXES: Tuple[Tuple[str, ...], ...] = (
+    ("city", "approx_cost(for two people)"),
+    ("city", "aggregate_rating"),
+)
+
+# Rows copied per INSERT batch when building the database.
+_WRITE_CHUNK_ROWS = 50_000
+
+# Stay under SQLite's bound-parameter limit in `take()`.
+_MAX_PARAMS = 900
+
+
+def quote_identifier(name: str) -> str:
+    """
+    Quote a column or table name for SQL ("approx_cost(for two people)").
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class SQLiteRestaurantStore:
+    """
+    Read-only view of a restaurant database file.
+
+    Each thread gets its own connection, so the store can be shared by the
+    API's worker threads; separate processes simply open the same file.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        if not self._path.is_file():
+            raise FileNotFoundError(f"No restaurant database at {self._path}")
+        self._local = threading.local()
+        meta = dict(self._execute("SELECT key, value FROM store_meta").fetchall())
+        self.version: str = meta.get("version", "")
+        self._count = int(meta.get("rows", 0))
+        self._columns: List[str] = json.loads(meta.get("columns", "[]"))
+        self._heavy_columns: List[str] = json.loads(meta.get("heavy_columns", "[]"))
+        self.price_profiles: Optional[Dict[str, PriceProfile]] = profiles_from_json(
+            json.loads(meta.get("price_profiles", "null"))
+        )
+        self._row_hashes: Optional[np.ndarray] = None
+        # Kept beside the database file; attached by the snapshot store.
+        self.text_index: Optional[TextIndex] = None
+        self.neighbors: Optional[NeighborIndex] = None
+
+    @classmethod
+    def build(
+        cls,
+        store: RestaurantStore,
+        path: str | Path,
+        row_hashes: Optional[np.ndarray] = None,
+        indexes: Sequence[Sequence[str]] = DEFAULT_INDEXES,
+    ) -> "SQLiteRestaurantStore":
+        """
+        Copy any store into a new database file and open it.
+
+        Rows are copied in chunks, so heavy columns of a projected store are
+        never materialized all at once. Indexes whose columns are missing
+        are skipped. The file is written under a temporary name and renamed
+        into place, so readers of a previous file are not disturbed.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        if tmp.exists():
+            tmp.unlink()
+
+        columns = store.columns
+        conn = sqlite3.connect(str(tmp))
+        try:
+            conn.execute("PRAGMA journal_mode=OFF")
+            conn.execute("PRAGMA synchronous=OFF")
+            first = store.take(range(min(store.count(), 1)))
+            column_defs = [f"{quote_identifier(POSITION_COLUMN)} INTEGER PRIMARY KEY"]
+            column_defs += [
+                f"{quote_identifier(col)} {_sql_type(first[col])}" for col in columns
+            ]
+            if row_hashes is not None:
+                column_defs.append(f"{quote_identifier(ROW_HASH_COLUMN)} INTEGER")
+            conn.execute(f"CREATE TABLE {TABLE} ({', '.join(column_defs)})")
+
+            names = [POSITION_COLUMN] + columns
+            if row_hashes is not None:
+                names.append(ROW_HASH_COLUMN)
+            insert = (
+                f"INSERT INTO {TABLE} ({', '.join(quote_identifier(n) for n in names)}) "
+                f"VALUES ({', '.join('?' * len(names))})"
+            )
+            for start, chunk in _chunks(store, columns):
+                chunk.insert(0, POSITION_COLUMN, np.arange(start, start + len(chunk.index)))
+                if row_hashes is not None:
+                    # SQLite integers are signed 64-bit.
+                    chunk[ROW_HASH_COLUMN] = (
+                        row_hashes[start : start + len(chunk.index)].view(np.int64)
+                    )
+                conn.executemany(insert, _sql_rows(chunk))
+
+            for index_columns in indexes:
+                if not all(col in columns for col in index_columns):
+                    continue
+                name = "idx_" + "_".join(
+                    "".join(ch if ch.isalnum() else "_" for ch in col).strip("_")
+                    for col in index_columns
+                )
+                conn.execute(
+                    f"CREATE INDEX {quote_identifier(name)} ON {TABLE} "
+                    f"({', '.join(quote_identifier(col) for col in index_columns)})"
+                )
+            conn.execute("ANALYZE")
+
+            conn.execute("CREATE TABLE store_meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.executemany(
+                "INSERT INTO store_meta VALUES (?, ?)",
+                [
+                    ("version", getattr(store, "version", "") or ""),
+                    ("rows", str(store.count())),
+                    ("columns", json.dumps(columns)),
+                    ("heavy_columns", json.dumps(list(getattr(store, "heavy_columns", [])))),
+                    (
+                        "price_profiles",
+                        json.dumps(
+                            profiles_to_json(store.price_profiles)
+                            if store.price_profiles is not None
+                            else None
+                        ),
+                    ),
+                ],
+            )
+            conn.commit()
+        except BaseException:
+            conn.close()
+            tmp.unlink(missing_ok=True)
+            raise
+        conn.close()
+        os.replace(tmp, path)
+        return cls(path)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def heavy_columns(self) -> List[str]:
+        """
+        Large free-text columns, left out of query results by default.
+        """
+        return list(self._heavy_columns)
+
+    @property
+    def hot_columns(self) -> List[str]:
+        return [col for col in self._columns if col not in self._heavy_columns]
+
+    @property
+    def row_hashes(self) -> Optional[np.ndarray]:
+        """
+        Raw source hash per row, or None if the database has none.
+        """
+        if self._row_hashes is None and self._has_column(ROW_HASH_COLUMN):
+            rows = self._execute(
+                f"SELECT {quote_identifier(ROW_HASH_COLUMN)} FROM {TABLE} "
+                f"ORDER BY {quote_identifier(POSITION_COLUMN)}"
+            ).fetchall()
+            self._row_hashes = np.array([r[0] for r in rows], dtype=np.int64).view(np.uint64)
+        return self._row_hashes
+
+    def is_empty(self) -> bool:
+        return self._count == 0
+
+    def count(self) -> int:
+        return self._count
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        return self.query(
+            f"SELECT {self._select_list(self.hot_columns)} FROM {TABLE} "
+            f"ORDER BY {quote_identifier(POSITION_COLUMN)} LIMIT ?",
+            [int(n)],
+        )
+
+    def take(
+        self, positions: Sequence[int], columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Fetch rows by position, in the order given.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        names = list(columns) if columns is not None else self.columns
+        select = ", ".join(
+            [quote_identifier(POSITION_COLUMN)] + [quote_identifier(c) for c in names]
+        )
+        parts = []
+        unique = np.unique(positions)
+        for start in range(0, len(unique), _MAX_PARAMS):
+            batch = unique[start : start + _MAX_PARAMS].tolist()
+            parts.append(
+                self.query(
+                    f"SELECT {select} FROM {TABLE} "
+                    f"WHERE {quote_identifier(POSITION_COLUMN)} IN ({', '.join('?' * len(batch))})",
+                    batch,
+                )
+            )
+        if not parts:
+            return pd.DataFrame(columns=names)
+        found = pd.concat(parts, ignore_index=True).set_index(POSITION_COLUMN)
+        return found.reindex(positions).reset_index(drop=True)[names]
+
+    def distinct_values(self, column: str) -> List[Any]:
+        col = quote_identifier(column)
+        rows = self._execute(
+            f"SELECT {col} FROM {TABLE} WHERE {col} IS NOT NULL "
+            f"GROUP BY {col} ORDER BY MIN({quote_identifier(POSITION_COLUMN)})"
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def value_range(self, column: str) -> Optional[Tuple[float, float]]:
+        col = quote_identifier(column)
+        low, high = self._execute(f"SELECT MIN({col}), MAX({col}) FROM {TABLE}").fetchone()
+        if low is None:
+            return None
+        return float(low), float(high)
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> pd.DataFrame:
+        """
+        Run a parameterized SELECT and return the rows as a DataFrame.
+        """
+        cursor = self._execute(sql, params)
+        names = [d[0] for d in cursor.description]
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=names)
+
+    def explain(self, sql: str, params: Sequence[Any] = ()) -> List[str]:
+        """
+        SQLite's query plan for a statement, e.g. to check index use.
+        """
+        return [row[-1] for row in self._execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _select_list(self, columns: Sequence[str]) -> str:
+        return ", ".join(quote_identifier(c) for c in columns)
+
+    def _has_column(self, name: str) -> bool:
+        info = self._execute(f"PRAGMA table_info({TABLE})").fetchall()
+        return any(row[1] == name for row in info)
+
+    def _execute(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+        return self._connection().execute(sql, list(params))
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                f"{self._path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+            )
+            conn.execute("PRAGMA query_only=ON")
+            self._local.conn = conn
+        return conn
+
+
+def _chunks(store: RestaurantStore, columns: List[str]) -> Iterator[Tuple[int, pd.DataFrame]]:
+    total = store.count()
+    for start in range(0, total, _WRITE_CHUNK_ROWS):
+        stop = min(start + _WRITE_CHUNK_ROWS, total)
+        yield start, store.take(range(start, stop), columns).reset_index(drop=True)
+
+
+def _sql_type(series: pd.Series) -> str:
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        dtype = dtype.categories.dtype
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+def _sql_rows(df: pd.DataFrame) -> Iterator[Tuple[Any, ...]]:
+    """
+    Rows as tuples of plain Python values, with missing values as NULL.
+    """
+    columns = []
+    for col in df.columns:
+        values = df[col].astype(object)
+        columns.append(values.where(df[col].notna(), None).tolist())
+    return zip(*columns)
+
@@ -1,22 +1,84 @@
 """
-Simple in-memory storage abstraction for Phase 1.
+Storage abstractions for Phase 1.
+
+`RestaurantStore` is the interface later phases program against; the
+in-memory stores here and `SQLiteRestaurantStore` implement it.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple, runtime_checkable
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from .config import DEFAULT_HEAVY_COLUMNS
+from .neighbors import NeighborIndex
+from .price_profiles import PriceProfile
+from .text_index import TextIndex
+
+
+@runtime_checkable
+class RestaurantStore(Protocol):
+    """
+    Read interface shared by all restaurant store backends.
+
+    Rows are addressed by position (0..count()-1) in a stable order.
+    """
+
+    version: str
+    row_hashes: Optional[np.ndarray]
+    # Per-city price distributions computed at ingest, when known.
+    price_profiles: Optional[Dict[str, PriceProfile]]
+    # Free-text vectors of every row (by position), when built.
+    text_index: Optional[TextIndex]
+    # Precomputed similar-restaurant lists of every row, when built.
+    neighbors: Optional[NeighborIndex]
+
+    def is_empty(self) -> bool: ...
+
+    def count(self) -> int: ...
+
+    def head(self, n: int = 5) -> pd.DataFrame: ...
+
+    @property
+    def columns(self) -> List[str]: ...
+
+    def take(
+        self, positions: Sequence[int], columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame: ...
+
+    def distinct_values(self, column: str) -> List[Any]: ...
+
+    def value_range(self, column: str) -> Optional[Tuple[float, float]]: ...
 
 
 @dataclass
 class InMemoryRestaurantStore:
     """
     Holds the cleaned restaurant dataset in memory.
+
+    `version` identifies the data (not the object), so two stores built
+    from identical inputs share a version. `row_hashes`, when known, holds
+    the hash of the raw source row behind each row of `data` and lets a
+    refresh reuse rows that did not change. `price_profiles` maps each
+    city to its price distribution (see `compute_price_profiles`),
+    `text_index` holds the free-text vectors of each row (see
+    `build_text_index`) and `neighbors` each row's most similar rows (see
+    `build_neighbor_index`).
     """
 
     data: pd.DataFrame
+    version: str = ""
+    row_hashes: Optional[np.ndarray] = field(default=None, repr=False)
+    price_profiles: Optional[Dict[str, PriceProfile]] = field(default=None, repr=False)
+    text_index: Optional[TextIndex] = field(default=None, repr=False)
+    neighbors: Optional[NeighborIndex] = field(default=None, repr=False)
 
     def is_empty(self) -> bool:
         return self.data.empty
@@ -27,3 +89,194 @@ class InMemoryRestaurantStore:
     def head(self, n: int = 5) -> pd.DataFrame:
         return self.data.head(n)
 
+    @property
+    def columns(self) -> List[str]:
+        return [str(col) for col in self.data.columns]
+
+    def take(
+        self, positions: Sequence[int], columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Materialize the given row positions, optionally only some columns.
+        """
+        frame = self.data if columns is None else self.data[list(columns)]
+        return frame.iloc[np.asarray(positions, dtype=np.int64)]
+
+    def distinct_values(self, column: str) -> List[Any]:
+        """
+        Non-null values of a column, in order of first appearance.
+        """
+        return self.data[column].dropna().unique().tolist()
+
+    def value_range(self, column: str) -> Optional[Tuple[float, float]]:
+        """
+        (min, max) of a numeric column, or None when it has no values.
+        """
+        values = self.data[column]
+        if values.dropna().empty:
+            return None
+        return float(values.min()), float(values.max())
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Resident bytes per column, including string payloads.
+        """
+        usage = self.data.memory_usage(index=False, deep=True)
+        return {str(col): int(nbytes) for col, nbytes in usage.items()}
+
+
+class HeavyColumnSidecar:
+    """
+    Memory-mapped Arrow IPC file holding large free-text columns.
+
+    Rows are stored in the same order as the store's DataFrame, so a row
+    position in `store.data` addresses the same row here. Only the pages
+    backing rows that are actually read get paged in.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._source = pa.memory_map(str(self._path), "r")
+        self._table = ipc.open_file(self._source).read_all()
+
+    @staticmethod
+    def write(df: pd.DataFrame, path: str | Path) -> Path:
+        """
+        Write the given columns as an uncompressed Arrow IPC file.
+
+        Compression is disabled on purpose: it would force a full decode
+        instead of letting reads map straight onto the file.
+        """
+        path = Path(path)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with pa.OSFile(str(tmp), "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+        return path
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._table.column_names)
+
+    def __len__(self) -> int:
+        return self._table.num_rows
+
+    def take(
+        self, positions: Sequence[int], columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Materialize the requested rows (by position) and columns.
+        """
+        table = self._table
+        if columns is not None:
+            table = table.select(list(columns))
+        indices = pa.array(np.asarray(positions, dtype=np.int64))
+        return table.take(indices).to_pandas()
+
+    def mapped_usage(self) -> Dict[str, int]:
+        """
+        Bytes per column backed by the mapped file (not resident memory).
+        """
+        return {
+            name: int(self._table.column(name).nbytes) for name in self._table.column_names
+        }
+
+
+@dataclass
+class ProjectedRestaurantStore(InMemoryRestaurantStore):
+    """
+    Store that keeps only hot columns resident and serves heavy text
+    columns lazily from a memory-mapped sidecar file.
+    """
+
+    sidecar: Optional[HeavyColumnSidecar] = None
+
+    @property
+    def heavy_columns(self) -> List[str]:
+        return self.sidecar.columns if self.sidecar is not None else []
+
+    @property
+    def columns(self) -> List[str]:
+        return super().columns + self.heavy_columns
+
+    def fetch_heavy(
+        self, positions: Sequence[int], columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Read heavy columns for the given row positions of `data`.
+        """
+        if self.sidecar is None:
+            return pd.DataFrame(index=range(len(positions)))
+        return self.sidecar.take(positions, columns)
+
+    def take(
+        self, positions: Sequence[int], columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Like the base implementation, but heavy columns are read from the
+        sidecar when requested (all columns when `columns` is None).
+        """
+        heavy_names = self.heavy_columns
+        if columns is None:
+            hot_cols = [str(col) for col in self.data.columns]
+            wanted_heavy = heavy_names
+        else:
+            hot_cols = [col for col in columns if col not in heavy_names]
+            wanted_heavy = [col for col in columns if col in heavy_names]
+
+        hot = super().take(positions, hot_cols)
+        if not wanted_heavy:
+            return hot
+        heavy = self.fetch_heavy(positions, wanted_heavy)
+        heavy.index = hot.index
+        combined = pd.concat([hot, heavy], axis=1)
+        return combined if columns is None else combined[list(columns)]
+
+    def memory_usage(self) -> Dict[str, int]:
+        usage = super().memory_usage()
+        # Sidecar columns are mapped, not resident.
+        for name in self.heavy_columns:
+            usage[name] = 0
+        return usage
+
+    def mapped_usage(self) -> Dict[str, int]:
+        return self.sidecar.mapped_usage() if self.sidecar is not None else {}
+
+
+def project_store(
+    store: InMemoryRestaurantStore,
+    sidecar_path: str | Path,
+    heavy_columns: Sequence[str] = DEFAULT_HEAVY_COLUMNS,
+) -> ProjectedRestaurantStore:
+    """
+    Move heavy columns of an existing store into a sidecar file.
+
+    Columns listed in `heavy_columns` but absent from the data are ignored.
+    """
+    present = [col for col in heavy_columns if col in store.data.columns]
+    if not present:
+        return ProjectedRestaurantStore(
+            data=store.data,
+            version=store.version,
+            row_hashes=store.row_hashes,
+            price_profiles=store.price_profiles,
+            text_index=store.text_index,
+            neighbors=store.neighbors,
+        )
+
+    HeavyColumnSidecar.write(store.data[present], sidecar_path)
+    return ProjectedRestaurantStore(
+        data=store.data.drop(columns=present),
+        version=store.version,
+        row_hashes=store.row_hashes,
+        price_profiles=store.price_profiles,
+        text_index=store.text_index,
+        neighbors=store.neighbors,
+        sidecar=HeavyColumnSidecar(sidecar_path),
+    )
@@ -0,0 +1,260 @@
+"""
+Synthetic Zomato-shaped data for offline development and benchmarks (Phase 1).
+
+`SyntheticZomatoGenerator` produces raw rows with the same columns and
+the same kinds of mess as the Hugging Face export: prices with thousands
+separators and stray whitespace, ratings such as "4.1/5", "3.9 /5",
+"NEW" and "-", mixed-case city names, restaurants listed several times
+under different `listed_in(type)` values, and exact duplicate rows.
+
+Rows are generated in fixed-size chunks, each from its own seeded random
+stream, so any slice of the dataset is reproducible on its own and a
+10M-row dataset can be streamed without ever being held in memory.
+Attributes of a restaurant (price, rating, cuisines, ...) are derived
+from its id with a stateless hash, so its listings agree with each other
+wherever they land.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator, List
+
+import numpy as np
+import pandas as pd
+
+# Rows generated per random stream; also the unit of reproducibility.
+CHUNK_ROWS = 100_000
+
+# Average number of listings per restaurant in the real export.
+LISTINGS_PER_RESTAURANT = 2.5
+
+_CITIES = np.array(["Bangalore", "Mumbai", "Delhi", "Pune", "Hyderabad", "Chennai", "Kolkata"])
+_CITY_WEIGHTS = np.array([0.55, 0.12, 0.11, 0.07, 0.06, 0.05, 0.04])
+_CITY_SPELLINGS = np.array(["{}", "{} ", " {}", "{upper}", "{lower}"])
+
+_LOCATIONS = np.array(
+    [
+        "BTM", "Koramangala 5th Block", "HSR", "Indiranagar", "JP Nagar",
+        "Jayanagar", "Whitefield", "Marathahalli", "Bellandur", "MG Road",
+        "Church Street", "Electronic City", "Bandra", "Andheri", "Saket",
+        "Hauz Khas", "Koregaon Park", "Banjara Hills", "T Nagar", "Park Street",
+    ]
+)
+_REST_TYPES = np.array(
+    ["Quick Bites", "Casual Dining", "Cafe", "Delivery", "Dessert Parlor",
+     "Takeaway, Delivery", "Bakery", "Bar", "Casual Dining, Bar", "Fine Dining"]
+)
+_REST_TYPE_WEIGHTS = np.array([0.36, 0.22, 0.08, 0.08, 0.05, 0.05, 0.04, 0.04, 0.04, 0.04])
+_CUISINES = np.array(
+    ["North Indian", "Chinese", "South Indian", "Fast Food", "Biryani",
+     "Continental", "Desserts", "Cafe", "Beverages", "Italian",
+     "Street Food", "Mughlai", "Pizza", "Bakery", "Seafood", "Andhra"]
+)
+_LISTING_TYPES = np.array(
+    ["Delivery", "Dine-out", "Desserts", "Cafes", "Drinks & nightlife", "Buffet", "Pubs and bars"]
+)
+_LISTING_WEIGHTS = np.array([0.50, 0.34, 0.07, 0.03, 0.03, 0.02, 0.01])
+_NAME_HEADS = np.array(
+    ["Spice", "Royal", "Green", "Urban", "Little", "Golden", "Hotel", "Cafe",
+     "The", "New", "Sri", "Chai", "Tandoor", "Dosa", "Biryani", "Burger"]
+)
+_NAME_TAILS = np.array(
+    ["Kitchen", "Garden", "Point", "Corner", "House", "Palace", "Express",
+     "Bistro", "Dhaba", "Diner", "Junction", "Hub", "Bar", "Bay", "Story", "Co"]
+)
+_DISHES = np.array(
+    ["Biryani", "Paneer Tikka", "Masala Dosa", "Butter Chicken", "Pasta",
+     "Momos", "Burgers", "Cold Coffee", "Brownie", "Pizza", "Noodles", "Rolls"]
+)
+
+
+class SyntheticZomatoGenerator:
+    """
+    Deterministic generator of raw Zomato-shaped rows.
+
+    The same `rows`, `seed` and `chunk_rows` always produce the same data,
+    whether read with `load()` or in batches of any size with
+    `iter_batches()`.
+    """
+
+    def __init__(self, rows: int, seed: int = 0, chunk_rows: int = CHUNK_ROWS) -> None:
+        if rows < 0:
+            raise ValueError("rows must be non-negative.")
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive.")
+        self.rows = rows
+        self.seed = seed
+        self.chunk_rows = chunk_rows
+        self.restaurants = max(int(rows / LISTINGS_PER_RESTAURANT), 1)
+
+    def load(self) -> pd.DataFrame:
+        """
+        The whole dataset as a single DataFrame.
+        """
+        chunks = [self._chunk(i) for i in range(self._chunk_count())]
+        if not chunks:
+            return self._frame(np.empty(0, dtype=np.int64), np.random.default_rng(self.seed))
+        return pd.concat(chunks, ignore_index=True)
+
+    def iter_batches(self, batch_size: int = 10_000) -> Iterator[pd.DataFrame]:
+        """
+        Yield the dataset as DataFrames of at most `batch_size` rows.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive.")
+        pending: List[pd.DataFrame] = []
+        pending_rows = 0
+        for index in range(self._chunk_count()):
+            chunk = self._chunk(index)
+            start = 0
+            while start < len(chunk.index):
+                take = min(batch_size - pending_rows, len(chunk.index) - start)
+                pending.append(chunk.iloc[start : start + take])
+                pending_rows += take
+                start += take
+                if pending_rows == batch_size:
+                    yield pd.concat(pending, ignore_index=True)
+                    pending, pending_rows = [], 0
+        if pending:
+            yield pd.concat(pending, ignore_index=True)
+
+    def _chunk_count(self) -> int:
+        return -(-self.rows // self.chunk_rows)
+
+    def _chunk(self, index: int) -> pd.DataFrame:
+        rng = np.random.default_rng([self.seed, index])
+        size = min(self.chunk_rows, self.rows - index * self.chunk_rows)
+        restaurant = rng.integers(0, self.restaurants, size=size, dtype=np.int64)
+        return self._frame(restaurant, rng)
+
+    def _frame(self, restaurant: np.ndarray, rng: np.random.Generator) -> pd.DataFrame:
+        size = len(restaurant)
+        key = restaurant.astype(np.uint64)
+        seed = self.seed
+
+        city = _CITIES[_weighted(_uniform(key, seed, 1), _CITY_WEIGHTS)]
+        spelling = _CITY_SPELLINGS[(_uniform(key, seed, 2) * len(_CITY_SPELLINGS)).astype(int)]
+        location = _LOCATIONS[(_uniform(key, seed, 3) * len(_LOCATIONS)).astype(int)]
+        rest_type = _REST_TYPES[_weighted(_uniform(key, seed, 4), _REST_TYPE_WEIGHTS)]
+
+        # Cost for two: log-normal around 400-500, in steps of 50.
+        cost = np.exp(6.05 + 0.6 * _normal(key, seed, 5))
+        cost = np.clip(np.round(cost / 50) * 50, 50, 6000).astype(np.int64)
+
+        rating = np.clip(3.7 + 0.45 * _normal(key, seed, 6), 1.8, 4.9).round(1)
+        rating_kind = _uniform(key, seed, 7)
+        votes = np.where(
+            rating_kind < 0.15, 0, np.exp(4.0 + 1.6 * _normal(key, seed, 8)).astype(np.int64)
+        )
+
+        names = [
+            f"{head} {tail}" if n % 3 else f"{head} {tail} {n % 997}"
+            for head, tail, n in zip(
+                _NAME_HEADS[(_uniform(key, seed, 9) * len(_NAME_HEADS)).astype(int)],
+                _NAME_TAILS[(_uniform(key, seed, 10) * len(_NAME_TAILS)).astype(int)],
+                restaurant.tolist(),
+            )
+        ]
+        frame = pd.DataFrame(
+            {
+                "url": [f"https://www.zomato.com/r/{r}" for r in restaurant.tolist()],
+                "address": [
+                    f"{r + 1}, {r % 90 + 1}th Cross, {loc}"
+                    for r, loc in zip(restaurant.tolist(), location)
+                ],
+                "name": names,
+                "online_order": np.where(_uniform(key, seed, 11) < 0.59, "Yes", "No"),
+                "book_table": np.where(_uniform(key, seed, 12) < 0.12, "Yes", "No"),
+                "rate": _rate_text(rating, rating_kind, _uniform(key, seed, 13)),
+                "votes": votes,
+                "location": location,
+                "rest_type": rest_type,
+                "dish_liked": _pick_list(key, seed, 14, _DISHES, 0, 4),
+                "cuisines": _pick_list(key, seed, 15, _CUISINES, 1, 3),
+                "approx_cost(for two people)": _price_text(cost, _uniform(key, seed, 16)),
+                "reviews_list": [
+                    f"[('Rated {r:.1f}', 'RATED\\n  Visited with friends, the food was good.')]"
+                    for r in rating.tolist()
+                ],
+                "menu_item": "[]",
+                # Per-listing fields: the same restaurant shows up once per
+                # listing type, sometimes more than once with identical rows.
+                "listed_in(type)": _LISTING_TYPES[_weighted(rng.random(size), _LISTING_WEIGHTS)],
+                "listed_in(city)": location,
+                "city": [
+                    form.format(c, upper=c.upper(), lower=c.lower())
+                    for form, c in zip(spelling, city)
+                ],
+            }
+        )
+        return frame
+
+
+def _mix(values: np.ndarray, seed: int) -> np.ndarray:
+    """
+    SplitMix64 finalizer: a stateless 64-bit hash of each value.
+    """
+    with np.errstate(over="ignore"):
+        z = values + np.uint64((seed * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _uniform(key: np.ndarray, seed: int, salt: int) -> np.ndarray:
+    """
+    Per-key uniform floats in [0, 1), independent for each `salt`.
+    """
+    with np.errstate(over="ignore"):
+        salted = key * np.uint64(0x100000001B3) + np.uint64(salt)
+    return (_mix(salted, seed) >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _normal(key: np.ndarray, seed: int, salt: int) -> np.ndarray:
+    # Box-Muller on two independent uniforms.
+    u1 = np.maximum(_uniform(key, seed, salt), 1e-12)
+    u2 = _uniform(key, seed, salt + 1000)
+    return np.sqrt(-2.0 * np.log(u1)) * np.cos(2.0 * np.pi * u2)
+
+
+def _weighted(uniform: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    cumulative = np.cumsum(weights / weights.sum())
+    return np.minimum(np.searchsorted(cumulative, uniform, side="right"), len(weights) - 1)
+
+
+def _rate_text(rating: np.ndarray, kind: np.ndarray, style: np.ndarray) -> np.ndarray:
+    text = np.char.add(np.char.mod("%.1f", rating), np.where(style < 0.3, " /5", "/5"))
+    text = np.where(kind < 0.15, "NEW", text)
+    text = np.where((kind >= 0.15) & (kind < 0.20), "-", text)
+    return np.where((kind >= 0.20) & (kind < 0.22), None, text.astype(object))
+
+
+def _price_text(cost: np.ndarray, style: np.ndarray) -> np.ndarray:
+    # Thousands separators, as in the real export ("1,200").
+    thousands = np.char.add((cost // 1000).astype(str), ",")
+    grouped = np.char.add(thousands, np.char.zfill((cost % 1000).astype(str), 3))
+    text = np.where(cost >= 1000, grouped, cost.astype(str)).astype(object)
+    text = np.where(style < 0.05, np.char.add(text.astype(str), " "), text)
+    # A small share of listings has no usable price at all.
+    return np.where(style > 0.993, None, text.astype(object))
+
+
+def _pick_list(
+    key: np.ndarray, seed: int, salt: int, choices: np.ndarray, low: int, high: int
+) -> np.ndarray:
+    """
+    Comma-separated runs of `low`..`high` consecutive choices per key.
+    """
+    n = len(choices)
+    # Every (count, offset) combination, rendered once.
+    table = np.array(
+        [
+            ", ".join(choices[(offset + np.arange(count)) % n]) if count else None
+            for count in range(low, high + 1)
+            for offset in range(n)
+        ],
+        dtype=object,
+    )
+    counts = (_uniform(key, seed, salt) * (high - low + 1)).astype(np.int64)
+    offsets = (_uniform(key, seed, salt + 1) * n).astype(np.int64)
+    return table[counts * n + offsets]
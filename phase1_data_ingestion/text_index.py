@@ -0,0 +1,411 @@
+"""
+Free-text vector index built at ingest (Phase 1).
+
+Each restaurant's name, cuisines, liked dishes, restaurant type and review
+text is turned into a TF-IDF vector over word unigrams and bigrams. Terms
+are hashed (crc32) into `TERM_SLOTS` slots, so no vocabulary strings are
+stored. The `dimensions` slots with the highest document frequency become
+the vector features; terms that are very rare (they cannot relate two
+restaurants) or near-universal are left out. Rows are L2-normalized and
+stored as an int8 matrix with one float scale per row, so 50k restaurants
+at 1,024 dimensions take ~50 MB, memory-mapped from the snapshot.
+
+Search scores queries against the matrix with blocked matrix products.
+For sublinear search an IVF coarse partition (spherical k-means over the
+rows) narrows a query to the rows of its `nprobe` nearest lists.
+
+Everything runs offline with NumPy.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Columns whose text is indexed, when present.
+TEXT_COLUMNS: Tuple[str, ...] = ("name", "cuisines", "dish_liked", "rest_type", "reviews_list")
+
+DEFAULT_DIMENSIONS = 1_024
+
+# Hashed term slots (collisions between kept terms are rare).
+TERM_SLOTS = 2**22
+
+# Terms in fewer documents, or in a larger share of them, are not features.
+MIN_DOCUMENT_FREQUENCY = 2
+MAX_DOCUMENT_SHARE = 0.5
+
+# Review text can run to many kilobytes; only the start of each field counts.
+MAX_FIELD_CHARS = 1_000
+
+# Rows tokenized, or scored, per block.
+BLOCK_ROWS = 4_096
+
+# IVF lists are only built for stores at least this large.
+MIN_IVF_ROWS = 2_000
+DEFAULT_NPROBE = 16
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE = 20_000
+
+# Words with at least one letter; bare numbers (ratings, branch numbers)
+# only add noise.
+_TOKEN_PATTERN = r"[a-z0-9]*[a-z][a-z0-9]*"
+
+_META_FILE = "meta.json"
+_ARRAYS = ("vectors", "scales", "features", "idf", "centroids", "list_rows", "list_offsets")
+
+
+@dataclass(frozen=True)
+class TextIndex:
+    """
+    int8 TF-IDF vectors of every store row, plus optional IVF lists.
+
+    Row `i` of `vectors` belongs to store position `i`; column `j` is the
+    term slot `features[j]` (sorted), weighted by `idf[j]`. With IVF,
+    `list_rows[list_offsets[j]:list_offsets[j + 1]]` are the rows whose
+    nearest centroid is `centroids[j]`.
+    """
+
+    vectors: np.ndarray
+    scales: np.ndarray
+    features: np.ndarray
+    idf: np.ndarray
+    centroids: Optional[np.ndarray] = None
+    list_rows: Optional[np.ndarray] = None
+    list_offsets: Optional[np.ndarray] = None
+
+    @property
+    def rows(self) -> int:
+        return int(self.vectors.shape[0])
+
+    @property
+    def dimensions(self) -> int:
+        return int(self.vectors.shape[1])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            int(getattr(self, name).nbytes) for name in _ARRAYS if getattr(self, name) is not None
+        )
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Unit-length query vectors (float32, one row per text).
+        """
+        docs, slots, counts = _term_counts(pd.Series(list(texts), dtype=object))
+        return _normalize(self._weigh(docs, slots, counts, len(texts)))
+
+    def score(self, queries: np.ndarray, positions: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Cosine scores of each query (row of `queries`) against the given
+        rows (all rows by default), as a (queries, rows) matrix.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        count = self.rows if positions is None else len(positions)
+        out = np.empty((len(queries), count), dtype=np.float32)
+        for start in range(0, count, BLOCK_ROWS):
+            stop = min(start + BLOCK_ROWS, count)
+            if positions is None:
+                block, scales = self.vectors[start:stop], self.scales[start:stop]
+            else:
+                rows = positions[start:stop]
+                block, scales = self.vectors[rows], self.scales[rows]
+            out[:, start:stop] = (queries @ block.astype(np.float32).T) * scales
+        return out
+
+    def search(
+        self,
+        texts: Sequence[str],
+        k: int = 10,
+        positions: Optional[np.ndarray] = None,
+        nprobe: int = DEFAULT_NPROBE,
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Best `k` rows per text as (positions, scores), best first.
+
+        Rows without any shared term are left out. With `positions`, only
+        those rows are scored (exactly); otherwise IVF lists are probed
+        when the index has them, else every row is scored.
+        """
+        queries = self.encode(texts)
+        if positions is not None:
+            positions = np.asarray(positions, dtype=np.int64)
+            return [_top_k(positions, row, k) for row in self.score(queries, positions)]
+        if self.centroids is None:
+            everything = np.arange(self.rows, dtype=np.int64)
+            return [_top_k(everything, row, k) for row in self.score(queries)]
+
+        results = []
+        nearest = np.argsort(-(queries @ self.centroids.T), axis=1, kind="stable")
+        for query, lists in zip(queries, nearest[:, :nprobe]):
+            probed = np.concatenate(
+                [self.list_rows[self.list_offsets[j] : self.list_offsets[j + 1]] for j in lists]
+            )
+            results.append(_top_k(probed, self.score(query, probed)[0], k))
+        return results
+
+    def _weigh(
+        self, docs: np.ndarray, slots: np.ndarray, counts: np.ndarray, rows: int
+    ) -> np.ndarray:
+        """
+        Dense TF-IDF rows from (doc, slot, count) triples; other slots drop.
+        """
+        column = np.minimum(np.searchsorted(self.features, slots), len(self.features) - 1)
+        known = self.features[column] == slots if len(self.features) else slots < 0
+        docs, column, counts = docs[known], column[known], counts[known]
+        weights = (1.0 + np.log(counts)) * self.idf[column]
+        flat = np.bincount(
+            docs * self.dimensions + column, weights=weights, minlength=rows * self.dimensions
+        )
+        return flat.reshape(rows, self.dimensions).astype(np.float32)
+
+    def save(self, directory: str | Path, version: str = "") -> Path:
+        """
+        Write the index as .npy files plus a small manifest recording
+        `version`, the store version it was built from.
+
+        Files go to a temporary directory that is then renamed into place,
+        so readers see either the old or the new index.
+        """
+        directory = Path(directory)
+        tmp = directory.with_name(f".{directory.name}.{os.getpid()}.tmp")
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        tmp.mkdir(parents=True)
+        present = []
+        for name in _ARRAYS:
+            array = getattr(self, name)
+            if array is not None:
+                np.save(tmp / f"{name}.npy", np.ascontiguousarray(array))
+                present.append(name)
+        meta = {
+            "rows": self.rows,
+            "dimensions": self.dimensions,
+            "arrays": present,
+            "version": version,
+        }
+        with open(tmp / _META_FILE, "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+        if directory.exists():
+            shutil.rmtree(directory)
+        os.replace(tmp, directory)
+        return directory
+
+    @classmethod
+    def load(cls, directory: str | Path) -> Optional["TextIndex"]:
+        """
+        Memory-map an index written by `save`, or None if there is none.
+        """
+        directory = Path(directory)
+        if not (directory / _META_FILE).is_file():
+            return None
+        with open(directory / _META_FILE, encoding="utf-8") as fh:
+            meta = json.load(fh)
+        arrays: Dict[str, np.ndarray] = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in meta["arrays"]
+        }
+        return cls(**arrays)
+
+    @staticmethod
+    def saved_version(directory: str | Path) -> Optional[str]:
+        """
+        Store version recorded by `save`, or None if there is no index.
+        """
+        path = Path(directory) / _META_FILE
+        if not path.is_file():
+            return None
+        with open(path, encoding="utf-8") as fh:
+            return str(json.load(fh).get("version", ""))
+
+
+def build_text_index(
+    frames: Iterable[pd.DataFrame],
+    dimensions: int = DEFAULT_DIMENSIONS,
+    ivf_lists: Optional[int] = None,
+    seed: int = 0,
+) -> TextIndex:
+    """
+    Build the index from blocks of store rows, in store order.
+
+    `frames` yields consecutive row blocks holding (some of) the
+    `TEXT_COLUMNS` and must be iterable twice; see `iter_text_frames`.
+    Blocks are tokenized once per pass and then dropped, so memory beyond
+    the index itself stays at one block. `ivf_lists` defaults to about
+    the square root of the row count (no IVF for small stores).
+    """
+    if iter(frames) is frames:
+        raise TypeError("frames must be re-iterable; see iter_text_frames().")
+
+    # Pass 1: document frequencies only.
+    document_frequency = np.zeros(TERM_SLOTS, dtype=np.int32)
+    rows = 0
+    for frame in frames:
+        _, slots, _ = _term_counts(_join_fields(frame))
+        present, documents = np.unique(slots, return_counts=True)
+        document_frequency[present] += documents.astype(np.int32)
+        rows += len(frame.index)
+
+    # Features: the most widespread terms that still discriminate.
+    eligible = (document_frequency >= MIN_DOCUMENT_FREQUENCY) & (
+        document_frequency <= max(MAX_DOCUMENT_SHARE * rows, MIN_DOCUMENT_FREQUENCY)
+    )
+    candidates = np.flatnonzero(eligible)
+    order = np.lexsort((candidates, -document_frequency[candidates]))
+    features = np.sort(candidates[order[:dimensions]]).astype(np.int64)
+    idf = np.log((1.0 + rows) / (1.0 + document_frequency[features])) + 1.0
+    index = TextIndex(
+        vectors=np.zeros((rows, len(features)), dtype=np.int8),
+        scales=np.zeros(rows, dtype=np.float32),
+        features=features,
+        idf=idf.astype(np.float32),
+    )
+
+    # Pass 2: tokenize again, then weight, normalize and quantize each block.
+    offset = 0
+    for frame in frames:
+        size = len(frame.index)
+        if offset + size > rows:
+            raise ValueError("frames changed between passes.")
+        docs, slots, counts = _term_counts(_join_fields(frame))
+        dense = _normalize(index._weigh(docs, slots, counts, size))
+        peak = np.abs(dense).max(axis=1, initial=0.0)
+        safe = np.where(peak > 0, peak, 1.0)
+        index.vectors[offset : offset + size] = np.rint(dense / safe[:, None] * 127)
+        index.scales[offset : offset + size] = peak / 127
+        offset += size
+    if offset != rows:
+        raise ValueError("frames changed between passes.")
+
+    if ivf_lists is None:
+        ivf_lists = int(np.sqrt(rows)) if rows >= MIN_IVF_ROWS else 0
+    if ivf_lists > 1:
+        index = _with_ivf(index, min(ivf_lists, rows), seed)
+    return index
+
+
+@dataclass(frozen=True)
+class TextFrames:
+    """
+    Text columns of a `RestaurantStore` in blocks, so heavy columns held
+    in a sidecar or database are never materialized all at once. Each
+    iteration reads the store afresh.
+    """
+
+    store: Any
+    block_rows: int = BLOCK_ROWS
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        columns = [col for col in TEXT_COLUMNS if col in self.store.columns]
+        total = self.store.count()
+        for start in range(0, total, self.block_rows):
+            positions = np.arange(start, min(start + self.block_rows, total))
+            yield self.store.take(positions, columns).reset_index(drop=True)
+
+
+def iter_text_frames(store, block_rows: int = BLOCK_ROWS) -> TextFrames:
+    """
+    Re-iterable text blocks of `store`, for `build_text_index`.
+    """
+    return TextFrames(store, block_rows)
+
+
+def _join_fields(frame: pd.DataFrame) -> pd.Series:
+    text = pd.Series([""] * len(frame.index), dtype=object)
+    for column in TEXT_COLUMNS:
+        if column in frame.columns:
+            values = frame[column].astype(object).where(frame[column].notna(), "")
+            field = values.astype(str).str.slice(0, MAX_FIELD_CHARS).to_numpy(dtype=object)
+            text = text + " " + field
+    return text
+
+
+def _term_counts(texts: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (doc, slot, count) of every distinct hashed term per document.
+
+    Terms are the lowercased word unigrams and bigrams of each text.
+    """
+    tokens = texts.astype(object).fillna("").astype(str).str.lower().str.findall(_TOKEN_PATTERN)
+    exploded = tokens.explode().dropna()
+    docs = np.asarray(exploded.index, dtype=np.int64)
+    words = exploded.to_numpy(dtype=object)
+
+    pairs = docs[1:] == docs[:-1]
+    bigrams = words[:-1][pairs] + " " + words[1:][pairs]
+    terms = np.concatenate([words, bigrams])
+    term_docs = np.concatenate([docs, docs[:-1][pairs]])
+
+    codes, uniques = pd.factorize(terms)
+    hashes = np.fromiter(
+        (zlib.crc32(term.encode("utf-8")) for term in uniques), dtype=np.int64, count=len(uniques)
+    )
+    slots = hashes[codes] & (TERM_SLOTS - 1) if len(codes) else np.zeros(0, dtype=np.int64)
+
+    keys, counts = np.unique(term_docs * TERM_SLOTS + slots, return_counts=True)
+    return keys // TERM_SLOTS, keys % TERM_SLOTS, counts
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def _top_k(positions: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    keep = scores > 0
+    positions, scores = positions[keep], scores[keep]
+    if len(scores) > k:
+        # Keep everything tied with the k-th best so ties break by position.
+        kth = -np.partition(-scores, k - 1)[k - 1]
+        keep = scores >= kth
+        positions, scores = positions[keep], scores[keep]
+    order = np.lexsort((positions, -scores))[:k]
+    return positions[order], scores[order]
+
+
+def _with_ivf(index: TextIndex, lists: int, seed: int) -> TextIndex:
+    """
+    Partition rows with spherical k-means (trained on a sample).
+    """
+    rng = np.random.default_rng(seed)
+    nonzero = np.flatnonzero(index.scales > 0)
+    if len(nonzero) < lists:
+        return index
+    sample = rng.choice(nonzero, size=min(KMEANS_SAMPLE, len(nonzero)), replace=False)
+    sample.sort()
+    points = index.vectors[sample].astype(np.float32) * index.scales[sample, None]
+    centroids = points[rng.choice(len(points), size=lists, replace=False)]
+    for _ in range(KMEANS_ITERATIONS):
+        assignment = np.argmax(points @ centroids.T, axis=1)
+        sizes = np.bincount(assignment, minlength=lists)
+        order = np.argsort(assignment, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        empty = sizes == 0
+        sums = np.zeros_like(centroids)
+        sums[~empty] = np.add.reduceat(points[order], starts[~empty], axis=0)
+        # Re-seed empty lists from random sample points.
+        sums[empty] = points[rng.choice(len(points), size=int(empty.sum()))]
+        centroids = _normalize(sums)
+
+    assignment = np.empty(index.rows, dtype=np.int64)
+    for start in range(0, index.rows, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, index.rows)
+        block = index.vectors[start:stop].astype(np.float32)
+        assignment[start:stop] = np.argmax(block @ centroids.T, axis=1)
+    list_rows = np.argsort(assignment, kind="stable")
+    list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=lists))])
+    return TextIndex(
+        vectors=index.vectors,
+        scales=index.scales,
+        features=index.features,
+        idf=index.idf,
+        centroids=centroids.astype(np.float32),
+        list_rows=list_rows,
+        list_offsets=list_offsets.astype(np.int64),
+    )
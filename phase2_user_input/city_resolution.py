@@ -0,0 +1,186 @@
+"""
+City resolution index for Phase 2 user input.
+
+Maps free-form city text to a canonical city of the dataset:
+
+1. Exact lookup in a set of canonical names.
+2. Alias table ("bengaluru" -> "bangalore", "bombay" -> "mumbai", ...).
+3. Localities of a city ("BTM layout" -> "bangalore"), matched on any
+   contiguous run of the input's words.
+4. A trigram index for typos ("banglore" -> "bangalore"). A clear best
+   match resolves; otherwise the ranked candidates become suggestions.
+
+The index is built once per store version; lookups are dictionary and
+small-set operations only.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+# Common alternative names and spellings of Indian cities.
+DEFAULT_CITY_ALIASES: Mapping[str, str] = {
+    "bengaluru": "bangalore",
+    "blr": "bangalore",
+    "bombay": "mumbai",
+    "new delhi": "delhi",
+    "dilli": "delhi",
+    "ncr": "delhi",
+    "calcutta": "kolkata",
+    "madras": "chennai",
+    "poona": "pune",
+    "gurugram": "gurgaon",
+    "mysuru": "mysore",
+    "vizag": "visakhapatnam",
+    "cochin": "kochi",
+    "trivandrum": "thiruvananthapuram",
+    "hyd": "hyderabad",
+}
+
+# Similarity (trigram Jaccard) at which the best match is taken as-is.
+AUTO_RESOLVE_SIMILARITY = 0.5
+
+# Minimum similarity for a city to be offered as a suggestion.
+SUGGESTION_SIMILARITY = 0.25
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class CityResolution:
+    """
+    Outcome of resolving one city string.
+
+    `city` is the canonical city, or None when the input was ambiguous or
+    unknown; `suggestions` then lists likely cities, best first.
+    """
+
+    city: Optional[str]
+    method: Optional[str] = None  # "exact", "alias", "locality" or "fuzzy"
+    suggestions: List[str] = field(default_factory=list)
+
+
+class CityResolver:
+    """
+    Precomputed index resolving user city text to canonical cities.
+    """
+
+    def __init__(
+        self,
+        cities: Iterable[str],
+        aliases: Optional[Mapping[str, str]] = None,
+        localities: Optional[Mapping[str, str]] = None,
+        max_suggestions: int = 3,
+    ) -> None:
+        self.cities: Set[str] = {normalize_city_text(c) for c in cities if normalize_city_text(c)}
+        self.max_suggestions = max_suggestions
+
+        alias_table = DEFAULT_CITY_ALIASES if aliases is None else aliases
+        self._aliases: Dict[str, str] = {
+            normalize_city_text(alias): normalize_city_text(city)
+            for alias, city in alias_table.items()
+            if normalize_city_text(city) in self.cities
+        }
+        self._localities: Dict[str, str] = {}
+        for locality, city in (localities or {}).items():
+            key, canonical = normalize_city_text(locality), normalize_city_text(city)
+            if key and canonical in self.cities and key not in self.cities:
+                self._localities.setdefault(key, canonical)
+
+        # Every known name, with the canonical city it stands for.
+        self._names: Dict[str, Tuple[str, str]] = {}
+        for name, city in self._localities.items():
+            self._names[name] = (city, "locality")
+        for name, city in self._aliases.items():
+            self._names[name] = (city, "alias")
+        for city in self.cities:
+            self._names[city] = (city, "exact")
+        self._max_words = max((len(name.split()) for name in self._names), default=0)
+
+        self._name_list = list(self._names)
+        self._trigram_counts = [len(_trigrams(name)) for name in self._name_list]
+        self._postings: Dict[str, List[int]] = {}
+        for idx, name in enumerate(self._name_list):
+            for gram in _trigrams(name):
+                self._postings.setdefault(gram, []).append(idx)
+
+    def resolve(self, text: str) -> CityResolution:
+        """
+        Resolve `text` to a canonical city, or suggest candidates.
+        """
+        query = normalize_city_text(text)
+        if not query:
+            return CityResolution(city=None)
+
+        hit = self._names.get(query)
+        if hit is not None:
+            return CityResolution(city=hit[0], method=hit[1])
+
+        hit = self._phrase_lookup(query)
+        if hit is not None:
+            return CityResolution(city=hit[0], method=hit[1])
+
+        ranked = self._fuzzy(query)
+        if ranked and ranked[0][1] >= AUTO_RESOLVE_SIMILARITY and (
+            len(ranked) == 1 or ranked[0][1] > ranked[1][1]
+        ):
+            return CityResolution(city=ranked[0][0], method="fuzzy")
+        suggestions = [city for city, score in ranked if score >= SUGGESTION_SIMILARITY]
+        return CityResolution(city=None, suggestions=suggestions[: self.max_suggestions])
+
+    def _phrase_lookup(self, query: str) -> Optional[Tuple[str, str]]:
+        """
+        Longest run of words in `query` that is a known name.
+
+        Canonical cities win over aliases, and both over localities, so
+        "indiranagar bangalore" resolves through "bangalore".
+        """
+        words = query.split()
+        best: Optional[Tuple[int, int, Tuple[str, str]]] = None
+        priority = {"exact": 2, "alias": 1, "locality": 0}
+        for size in range(min(len(words), self._max_words), 0, -1):
+            for start in range(len(words) - size + 1):
+                hit = self._names.get(" ".join(words[start : start + size]))
+                if hit is None:
+                    continue
+                rank = (priority[hit[1]], size)
+                if best is None or rank > best[:2]:
+                    best = (rank[0], rank[1], hit)
+        return best[2] if best is not None else None
+
+    def _fuzzy(self, query: str) -> List[Tuple[str, float]]:
+        """
+        Canonical cities ranked by their best-matching name's similarity.
+        """
+        grams = _trigrams(query)
+        shared: Counter = Counter()
+        for gram in grams:
+            for idx in self._postings.get(gram, ()):
+                shared[idx] += 1
+
+        best: Dict[str, float] = {}
+        for idx, common in shared.items():
+            score = common / (len(grams) + self._trigram_counts[idx] - common)
+            city = self._names[self._name_list[idx]][0]
+            if score > best.get(city, 0.0):
+                best[city] = score
+        return sorted(best.items(), key=lambda item: (-item[1], item[0]))
+
+
+def normalize_city_text(text: str) -> str:
+    """
+    Lowercase, replace punctuation with spaces and collapse whitespace.
+    """
+    return _SPACES.sub(" ", _NON_WORD.sub(" ", str(text).lower())).strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    grams: Set[str] = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
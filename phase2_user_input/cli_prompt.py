@@ -14,7 +14,7 @@ from .models import RawUserInput
 
 def prompt_user_for_input() -> RawUserInput:
     """
-    Prompt the user for city and price information via CLI.
+    Prompt the user for city, price and optional filters via CLI.
 
     Returns:
         RawUserInput with unvalidated, unnormalized strings.
@@ -23,6 +23,23 @@ def prompt_user_for_input() -> RawUserInput:
     price_text = input(
         "Enter your budget (number like 800, or range like 500-1200). Leave blank for no preference: "
     ).strip()
-
-    return RawUserInput(city=city, price_text=price_text)
+    cuisine_text = input("Cuisines (comma separated, optional): ").strip()
+    min_rating_text = input("Minimum rating out of 5 (optional): ").strip()
+    online_order_text = input("Must offer online ordering? (yes/no, optional): ").strip()
+    book_table_text = input("Must take table bookings? (yes/no, optional): ").strip()
+    locality = input("Locality within the city (optional): ").strip()
+    rest_type_text = input("Restaurant type, e.g. Cafe (optional): ").strip()
+    query_text = input("Describe what you're looking for (optional): ").strip()
+
+    return RawUserInput(
+        city=city,
+        price_text=price_text,
+        cuisine_text=cuisine_text,
+        min_rating_text=min_rating_text,
+        online_order_text=online_order_text,
+        book_table_text=book_table_text,
+        locality=locality,
+        rest_type_text=rest_type_text,
+        query_text=query_text,
+    )
 
@@ -4,27 +4,46 @@ Core models for Phase 2 user input.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional, Tuple
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 
 
 @dataclass
 class RawUserInput:
     """
     Raw strings as received from CLI/Web.
+
+    Only `city` is required; the remaining filters are optional and an
+    empty string means "no preference".
     """
 
     city: str
     price_text: str
+    cuisine_text: str = ""  # one or more cuisines, comma separated
+    min_rating_text: str = ""  # e.g. "4" or "3.5"
+    online_order_text: str = ""  # yes / no
+    book_table_text: str = ""  # yes / no
+    locality: str = ""  # neighbourhood, matched against `location`
+    rest_type_text: str = ""  # e.g. "Cafe" or "Casual Dining, Bar"
+    query_text: str = ""  # free text, e.g. "rooftop biryani place good for groups"
 
 
 @dataclass
 class NormalizedUserInput:
     """
     Cleaned and structured user input ready for the recommendation layer.
+
+    Text filters are lowercased; None (or an empty list) means the filter
+    is not applied.
     """
 
     city: str  # normalized, lowercase city
     price_range: Optional[Tuple[Optional[float], Optional[float]]]
     price_bucket: Optional[str]
-
+    cuisines: List[str] = field(default_factory=list)  # match any of these
+    min_rating: Optional[float] = None
+    online_order: Optional[bool] = None
+    book_table: Optional[bool] = None
+    locality: Optional[str] = None
+    rest_types: List[str] = field(default_factory=list)  # match any of these
+    query: Optional[str] = None  # free text; orders candidates by relevance
@@ -4,9 +4,12 @@ Validation and normalization logic for Phase 2 user input.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
+from phase1_data_ingestion.price_profiles import PriceProfile
+
+from .city_resolution import CityResolver
 from .models import NormalizedUserInput, RawUserInput
 
 
@@ -14,40 +17,61 @@ from .models import NormalizedUserInput, RawUserInput
 class ValidationError:
     field: str
     message: str
+    # Likely intended values (e.g. cities for a misspelt city), best first.
+    suggestions: List[str] = field(default_factory=list)
 
 
 @dataclass
 class ValidationResult:
     is_valid: bool
     errors: List[ValidationError]
+    # Canonical city the input resolved to (aliases, localities, typos).
+    resolved_city: Optional[str] = None
 
 
 class InputValidator:
     """
     Validates raw user input fields for basic correctness.
+
+    With a list of allowed cities (or a prebuilt `CityResolver`), city
+    names are resolved through aliases, localities and typo matching
+    rather than requiring an exact match.
     """
 
-    def __init__(self, allowed_cities: Optional[List[str]] = None) -> None:
+    def __init__(
+        self,
+        allowed_cities: Optional[List[str]] = None,
+        resolver: Optional[CityResolver] = None,
+    ) -> None:
+        if resolver is None and allowed_cities:
+            resolver = CityResolver(allowed_cities)
+        self.resolver = resolver
         # Store cities in normalized form for comparison.
-        self.allowed_cities = (
-            [c.strip().lower() for c in allowed_cities] if allowed_cities else None
-        )
+        self.allowed_cities = sorted(resolver.cities) if resolver is not None else None
 
     def validate(self, raw: RawUserInput) -> ValidationResult:
         errors: List[ValidationError] = []
+        resolved_city: Optional[str] = None
 
         # City: required, non-empty.
         if not raw.city or not raw.city.strip():
             errors.append(
                 ValidationError(field="city", message="City is required and cannot be empty.")
             )
+        elif self.resolver is None:
+            resolved_city = raw.city.strip().lower()
         else:
-            normalized_city = raw.city.strip().lower()
-            if self.allowed_cities is not None and normalized_city not in self.allowed_cities:
+            resolution = self.resolver.resolve(raw.city)
+            resolved_city = resolution.city
+            if resolved_city is None:
+                message = "City is not available in our service area."
+                if resolution.suggestions:
+                    message += " Did you mean: " + ", ".join(resolution.suggestions) + "?"
                 errors.append(
                     ValidationError(
                         field="city",
-                        message="City is not available in our service area.",
+                        message=message,
+                        suggestions=resolution.suggestions,
                     )
                 )
 
@@ -62,20 +86,108 @@ class InputValidator:
                     )
                 )
 
-        return ValidationResult(is_valid=len(errors) == 0, errors=errors)
+        if raw.min_rating_text and raw.min_rating_text.strip():
+            try:
+                _parse_min_rating(raw.min_rating_text)
+            except ValueError:
+                errors.append(
+                    ValidationError(
+                        field="min_rating",
+                        message="Minimum rating must be a number between 0 and 5.",
+                    )
+                )
+
+        for field_name, text in (
+            ("online_order", raw.online_order_text),
+            ("book_table", raw.book_table_text),
+        ):
+            try:
+                _parse_yes_no(text)
+            except ValueError:
+                errors.append(
+                    ValidationError(field=field_name, message="Answer must be 'yes' or 'no'.")
+                )
+
+        return ValidationResult(
+            is_valid=len(errors) == 0, errors=errors, resolved_city=resolved_city
+        )
 
 
 class InputNormalizer:
     """
     Normalizes validated user input into a structured form.
+
+    With per-city price profiles (computed at ingest), budgets are read
+    relative to the user's city: a single number selects a band holding a
+    fixed share of that city's restaurants, and the price bucket reflects
+    where the budget falls in the city's distribution. Cities without a
+    profile use a ±20% band and fixed bucket thresholds.
     """
 
+    def __init__(self, price_profiles: Optional[Dict[str, PriceProfile]] = None) -> None:
+        self.price_profiles = price_profiles or {}
+
     def normalize(self, raw: RawUserInput) -> NormalizedUserInput:
         city = raw.city.strip().lower()
-        price_range = _parse_price_expression(raw.price_text)
-        bucket = _derive_price_bucket(price_range)
+        profile = self.price_profiles.get(city)
+        price_range = _parse_price_expression(raw.price_text, profile)
+
+        return NormalizedUserInput(
+            city=city,
+            price_range=price_range,
+            price_bucket=self.price_bucket(city, price_range),
+            cuisines=_split_choices(raw.cuisine_text),
+            min_rating=_parse_min_rating(raw.min_rating_text),
+            online_order=_parse_yes_no(raw.online_order_text),
+            book_table=_parse_yes_no(raw.book_table_text),
+            locality=_normalize_text(raw.locality) or None,
+            rest_types=_split_choices(raw.rest_type_text),
+            query=_normalize_text(raw.query_text) or None,
+        )
+
+    def price_bucket(
+        self, city: str, price_range: Optional[Tuple[Optional[float], Optional[float]]]
+    ) -> Optional[str]:
+        """
+        low / mid / high label of a price range in the (normalized) city.
+        """
+        return _derive_price_bucket(price_range, self.price_profiles.get(city))
+
 
-        return NormalizedUserInput(city=city, price_range=price_range, price_bucket=bucket)
+_YES = {"yes", "y", "true", "1"}
+_NO = {"no", "n", "false", "0"}
+
+
+def _normalize_text(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def _split_choices(text: Optional[str]) -> List[str]:
+    """
+    "North Indian, chinese" -> ["north indian", "chinese"] (deduplicated).
+    """
+    choices = (_normalize_text(part) for part in (text or "").split(","))
+    return list(dict.fromkeys(choice for choice in choices if choice))
+
+
+def _parse_yes_no(text: Optional[str]) -> Optional[bool]:
+    value = _normalize_text(text)
+    if not value:
+        return None
+    if value in _YES:
+        return True
+    if value in _NO:
+        return False
+    raise ValueError("Expected yes or no.")
+
+
+def _parse_min_rating(text: Optional[str]) -> Optional[float]:
+    if text is None or not text.strip():
+        return None
+    value = float(text.strip())
+    if not 0.0 <= value <= 5.0:
+        raise ValueError("Rating must be between 0 and 5.")
+    return value
 
 
 def _is_valid_price_expression(text: str) -> bool:
@@ -94,6 +206,7 @@ def _is_valid_price_expression(text: str) -> bool:
 
 def _parse_price_expression(
     text: Optional[str],
+    profile: Optional[PriceProfile] = None,
 ) -> Optional[Tuple[Optional[float], Optional[float]]]:
     if text is None:
         return None
@@ -124,16 +237,23 @@ def _parse_price_expression(
     if value < 0:
         raise ValueError("Price cannot be negative.")
 
+    if profile is not None:
+        # A band covering a fixed share of the city's restaurants.
+        return profile.band(value)
+
     margin = value * 0.2
     return (value - margin, value + margin)
 
 
 def _derive_price_bucket(
-    price_range: Optional[Tuple[Optional[float], Optional[float]]]
+    price_range: Optional[Tuple[Optional[float], Optional[float]]],
+    profile: Optional[PriceProfile] = None,
 ) -> Optional[str]:
     """
-    Quick heuristic to label a price range as low / mid / high.
-    This is a placeholder that can be tuned with real data later.
+    Label a price range as low / mid / high.
+
+    Uses the city's price profile when available, otherwise fixed
+    thresholds (400 and 1000).
     """
     if price_range is None:
         return None
@@ -153,6 +273,9 @@ def _derive_price_bucket(
     if midpoint is None:
         return None
 
+    if profile is not None:
+        return profile.bucket(midpoint)
+
     if midpoint < 400:
         return "low"
     if midpoint < 1000:
@@ -0,0 +1,180 @@
+"""
+Bitmap index over categorical attributes for Phase 3 filters.
+
+Built once per store version. Every value of an indexed column (every
+token, for comma-separated columns such as `cuisines`) maps to the set of
+rows holding it, stored as a packed bitset (`np.packbits`) or, for rare
+values where that is smaller, as a sorted array of row ids. A query is a
+conjunction of disjunctions, e.g. (cuisine = thai OR cuisine = chinese)
+AND online_order = yes, evaluated with bitwise operations instead of one
+string scan per predicate. Values are matched lowercased, as the
+repository's string filters do.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BITMAP_COLUMNS: Tuple[str, ...] = (
+    "cuisines",
+    "rest_type",
+    "listed_in(type)",
+    "location",
+    "online_order",
+    "book_table",
+)
+
+# Columns holding comma-separated lists, indexed per token.
+DEFAULT_MULTI_VALUED_COLUMNS: Tuple[str, ...] = ("cuisines", "rest_type", "listed_in(type)")
+
+# (column, accepted values): rows match if they hold any of the values.
+Condition = Tuple[str, Sequence[str]]
+
+
+@dataclass(frozen=True)
+class RowSet:
+    """
+    Rows holding one value: a packed bitset or a sorted array of row ids.
+    """
+
+    rows: int
+    bits: Optional[np.ndarray] = None
+    ids: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "RowSet":
+        count = int(np.count_nonzero(mask))
+        id_dtype = np.int32 if len(mask) < 2**31 else np.int64
+        # Keep whichever representation is smaller.
+        if count * np.dtype(id_dtype).itemsize * 8 < len(mask):
+            return cls(rows=len(mask), ids=np.flatnonzero(mask).astype(id_dtype))
+        return cls(rows=len(mask), bits=np.packbits(mask))
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.bits.nbytes if self.bits is not None else self.ids.nbytes)
+
+    def to_bits(self) -> np.ndarray:
+        if self.bits is not None:
+            return self.bits
+        mask = np.zeros(self.rows, dtype=bool)
+        mask[self.ids] = True
+        return np.packbits(mask)
+
+    def contains(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Membership of each position, without touching other rows.
+        """
+        if self.bits is not None:
+            return ((self.bits[positions >> 3] >> (7 - (positions & 7))) & 1).astype(bool)
+        if len(self.ids) == 0:
+            return np.zeros(len(positions), dtype=bool)
+        found = np.searchsorted(self.ids, positions)
+        return self.ids[np.minimum(found, len(self.ids) - 1)] == positions
+
+
+class BitmapIndex:
+    """
+    Value -> row set for a fixed set of categorical columns.
+    """
+
+    def __init__(self, rows: int, postings: Dict[str, Dict[str, RowSet]]) -> None:
+        self.rows = rows
+        self._postings = postings
+
+    @classmethod
+    def build(
+        cls,
+        df: pd.DataFrame,
+        columns: Sequence[str] = DEFAULT_BITMAP_COLUMNS,
+        multi_valued: Sequence[str] = DEFAULT_MULTI_VALUED_COLUMNS,
+    ) -> "BitmapIndex":
+        """
+        Index the given columns of `df`; missing columns are skipped.
+
+        Work per column is one pass over the rows per indexed value, on
+        integer codes; strings are only split once per distinct value.
+        """
+        rows = len(df.index)
+        postings: Dict[str, Dict[str, RowSet]] = {}
+        for column in columns:
+            if column not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[column], use_na_sentinel=True)
+            # Tokens of each distinct value, lowercased.
+            tokens_per_code: List[List[str]] = []
+            for value in uniques:
+                text = str(value).lower()
+                parts = text.split(",") if column in multi_valued else [text]
+                tokens_per_code.append([part.strip() for part in parts if part.strip()])
+
+            vocabulary = sorted({token for tokens in tokens_per_code for token in tokens})
+            token_ids = {token: i for i, token in enumerate(vocabulary)}
+            # has_token[code, token], plus a final all-False row for missing values.
+            has_token = np.zeros((len(uniques) + 1, len(vocabulary)), dtype=bool)
+            for code, tokens in enumerate(tokens_per_code):
+                has_token[code, [token_ids[token] for token in tokens]] = True
+
+            codes = np.asarray(codes)
+            codes = np.where(codes < 0, len(uniques), codes)
+            postings[column] = {
+                token: RowSet.from_mask(has_token[codes, token_ids[token]])
+                for token in vocabulary
+            }
+        return cls(rows, postings)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._postings)
+
+    def values(self, column: str) -> List[str]:
+        return list(self._postings.get(column, {}))
+
+    def nbytes(self) -> int:
+        return sum(rs.nbytes for values in self._postings.values() for rs in values.values())
+
+    def select(
+        self, conditions: Sequence[Condition], positions: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Row positions matching every condition, in ascending order.
+
+        With `positions` (e.g. a city/price window), only those rows are
+        tested, so the cost follows their number; otherwise whole bitsets
+        are combined with bitwise AND/OR.
+        """
+        if positions is not None:
+            positions = np.asarray(positions, dtype=np.int64)
+            for column, values in conditions:
+                if len(positions) == 0:
+                    break
+                matched = np.zeros(len(positions), dtype=bool)
+                for row_set in self._row_sets(column, values):
+                    matched |= row_set.contains(positions)
+                positions = positions[matched]
+            return positions
+
+        combined = self.bits(conditions)
+        return np.flatnonzero(np.unpackbits(combined, count=self.rows))
+
+    def bits(self, conditions: Sequence[Condition]) -> np.ndarray:
+        """
+        Packed bitset of the rows matching every condition.
+        """
+        combined = np.full((self.rows + 7) // 8, 0xFF, dtype=np.uint8)
+        for column, values in conditions:
+            either = np.zeros_like(combined)
+            for row_set in self._row_sets(column, values):
+                np.bitwise_or(either, row_set.to_bits(), out=either)
+            np.bitwise_and(combined, either, out=combined)
+        return combined
+
+    def _row_sets(self, column: str, values: Sequence[str]) -> List[RowSet]:
+        if column not in self._postings:
+            raise KeyError(f"Column {column!r} is not in the bitmap index.")
+        postings = self._postings[column]
+        return [postings[v] for v in (str(v).strip().lower() for v in values) if v in postings]
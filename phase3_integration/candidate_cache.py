@@ -0,0 +1,153 @@
+"""
+Bounded LRU cache of repository candidate sets (Phase 3).
+
+Popular presets (same city, budget and filters) are common, so candidate
+sets are cached per (store version, normalized query). Entries are
+evicted least-recently-used first once either the entry limit or the
+memory budget is exceeded. Only one store version is cached at a time:
+activating a new version (done when a reloaded store is published, or on
+first use) drops every entry of the old one, while requests still running
+on an old version bypass the cache instead of evicting the new entries.
+
+Cached results are shared. `CandidateView`s are immutable and sized by
+their row ids; DataFrames are returned as shallow copies, and pandas'
+copy-on-write keeps any change callers make from reaching the cached data.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields
+from typing import Callable, Dict, Hashable, Optional, Tuple, TypeVar, Union
+
+import pandas as pd
+
+from phase2_user_input.models import NormalizedUserInput
+
+from .candidate_view import CandidateView
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+Candidates = TypeVar("Candidates", bound=Union[CandidateView, pd.DataFrame])
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+def query_key(user_input: NormalizedUserInput) -> Tuple[Hashable, ...]:
+    """
+    Hashable key of every field of a normalized query.
+    """
+    key = []
+    for f in fields(user_input):
+        value = getattr(user_input, f.name)
+        key.append(tuple(value) if isinstance(value, list) else value)
+    return tuple(key)
+
+
+class CandidateCache:
+    """
+    Thread-safe LRU cache of candidate sets (views or DataFrames).
+    """
+
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Candidates, int]]" = (
+            OrderedDict()
+        )
+        self._version: Optional[str] = None
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(
+        self,
+        version: str,
+        user_input: NormalizedUserInput,
+        compute: Callable[[], Candidates],
+    ) -> Candidates:
+        """
+        Return the cached candidates for the query, computing them on a miss.
+        """
+        key = (version, query_key(user_input))
+        with self._lock:
+            if self._version is None:
+                self._reset(version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return _share(entry[0])
+            self._misses += 1
+
+        # Compute outside the lock; concurrent misses may both compute.
+        value = compute()
+        size = _size(value)
+        with self._lock:
+            if version == self._version and key not in self._entries:
+                if size <= self.max_bytes and self.max_entries > 0:
+                    self._entries[key] = (value, size)
+                    self._bytes += size
+                    self._evict()
+        return _share(value)
+
+    def activate(self, version: str) -> None:
+        """
+        Cache `version` from now on, dropping entries of any other version.
+        """
+        with self._lock:
+            if version != self._version:
+                self._reset(version)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset(self._version)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def _reset(self, version: Optional[str]) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        self._version = version
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
+
+
+def _size(value: Union[CandidateView, pd.DataFrame]) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    return value.nbytes
+
+
+def _share(value: Candidates) -> Candidates:
+    return value.copy(deep=False) if isinstance(value, pd.DataFrame) else value
@@ -0,0 +1,110 @@
+"""
+Lazy candidate sets for Phase 3.
+
+A `CandidateView` is the answer to a repository query: the matching row
+positions plus the store (and so the store version) they index into. No
+column is copied until it is read, and then only for the rows of the view,
+so a request that ranks a few hundred candidates and prompts with twenty of
+them reads a handful of columns for twenty rows instead of copying every
+column of every match.
+
+A view may carry a `relevance` score per row (from free-text search),
+which later stages can weigh in. Views are immutable and cheap to share,
+which is what the candidate cache stores. Reading mirrors the small part of
+the DataFrame API the pipeline uses: `len()`, `empty`, `columns`,
+`view[column]`, `view[[columns]]` and `head()`; `to_frame()` materializes
+explicitly.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from phase1_data_ingestion.storage import RestaurantStore
+
+
+@dataclass(frozen=True, eq=False)
+class CandidateView:
+    """
+    Row positions into one store version, materialized on demand.
+    """
+
+    store: RestaurantStore
+    rows: np.ndarray
+    relevance: Optional[np.ndarray] = None
+
+    def __post_init__(self) -> None:
+        # Cached views are shared between requests: keep the arrays read-only.
+        object.__setattr__(self, "rows", _read_only(self.rows, np.int64))
+        if self.relevance is not None:
+            object.__setattr__(self, "relevance", _read_only(self.relevance, np.float32))
+
+    @property
+    def version(self) -> str:
+        return self.store.version
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        Columns a view carries by default: heavy free-text columns are left
+        out, as in store query results, but can still be read by name.
+        """
+        heavy = set(getattr(self.store, "heavy_columns", ()))
+        return [col for col in self.store.columns if col not in heavy]
+
+    @property
+    def empty(self) -> bool:
+        return len(self.rows) == 0
+
+    @property
+    def nbytes(self) -> int:
+        extra = self.relevance.nbytes if self.relevance is not None else 0
+        return int(self.rows.nbytes + extra)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, key: Union[str, Sequence[str]]) -> Union[pd.Series, pd.DataFrame]:
+        if isinstance(key, str):
+            return self.column(key)
+        return self.to_frame(key)
+
+    def column(self, name: str) -> pd.Series:
+        """
+        Values of one column for the rows of the view.
+        """
+        return self.to_frame([name])[name]
+
+    def take(self, positions: Sequence[int]) -> "CandidateView":
+        """
+        Sub-view of the given positions (relative to this view), in order.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        relevance = self.relevance[positions] if self.relevance is not None else None
+        return CandidateView(self.store, self.rows[positions], relevance)
+
+    def head(self, n: int = 5) -> "CandidateView":
+        relevance = self.relevance[:n] if self.relevance is not None else None
+        return CandidateView(self.store, self.rows[:n], relevance)
+
+    def to_frame(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Materialize the view (default columns, or only `columns`).
+        """
+        names = self.columns if columns is None else list(columns)
+        frame = self.store.take(self.rows, names)
+        return frame.reset_index(drop=True)
+
+
+def _read_only(values: np.ndarray, dtype: type) -> np.ndarray:
+    array = np.asarray(values, dtype=dtype).view()
+    array.flags.writeable = False
+    return array
+
+
+# What the recommendation stages accept: a view, or an already built frame.
+Candidates = Union[CandidateView, pd.DataFrame]
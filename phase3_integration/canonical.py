@@ -0,0 +1,74 @@
+"""
+Query canonicalization for Phase 3.
+
+Budgets such as "800", "790" and "810-820" normalize to different price
+ranges, and so to different LLM prompts, even when they select the same
+restaurants. After the repository filter, a `QueryCanonicalizer` keys
+the query by what it actually selected:
+
+- `canonicalize` sorts the multi-valued filters (cuisines, restaurant
+  types) and leaves everything else, including the user's budget that
+  ranking scores against, as normalized;
+- `key` fingerprints the candidate row set (`candidate_key`) together
+  with every preference except the budget, which only chose the rows.
+
+The LLM cache and single-flight use that key in place of the prompt, so
+queries that select the same rows share one LLM answer.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, replace
+
+import numpy as np
+
+from phase2_user_input.models import NormalizedUserInput
+
+from .candidate_view import CandidateView
+
+# Fields that select the candidate rows and are covered by `candidate_key`.
+_BUDGET_FIELDS = ("price_range", "price_bucket")
+
+
+def candidate_key(candidates: CandidateView) -> str:
+    """
+    Hex SHA-256 of the store version and the sorted candidate row ids.
+    """
+    digest = hashlib.sha256(candidates.version.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(np.sort(candidates.rows).astype("<i8").tobytes())
+    return digest.hexdigest()
+
+
+class QueryCanonicalizer:
+    """
+    Canonical form and LLM cache key of a normalized query for the
+    candidate set it selected.
+    """
+
+    def canonicalize(self, user_input: NormalizedUserInput) -> NormalizedUserInput:
+        """
+        The query with its multi-valued filters sorted.
+        """
+        return replace(
+            user_input,
+            cuisines=sorted(user_input.cuisines),
+            rest_types=sorted(user_input.rest_types),
+        )
+
+    def key(self, user_input: NormalizedUserInput, candidates: CandidateView) -> str:
+        """
+        Hex SHA-256 of `candidate_key` and the preferences other than the
+        budget; pass a canonical query so filter order does not matter.
+        """
+        preferences = {
+            name: value
+            for name, value in asdict(user_input).items()
+            if name not in _BUDGET_FIELDS
+        }
+        digest = hashlib.sha256(candidate_key(candidates).encode("ascii"))
+        digest.update(b"\0")
+        digest.update(json.dumps(preferences, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
@@ -0,0 +1,89 @@
+"""
+City-partitioned, price-sorted row index for Phase 3 candidate lookup.
+
+Built once per store version: row positions are sorted by (city, price),
+so each city owns one contiguous block of positions in price order. A
+request finds its city block with a dictionary lookup and its price window
+with two binary searches, and only the rows in that window are touched.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class CityPriceIndex:
+    """
+    Row positions grouped by city and sorted by price within each city.
+
+    `blocks[city]` is `(start, priced_stop, stop)`: positions
+    `order[start:stop]` belong to the city, and the first
+    `priced_stop - start` of them have a price (rows without one sort last).
+    """
+
+    order: np.ndarray
+    prices: np.ndarray
+    blocks: Dict[str, Tuple[int, int, int]]
+
+    @classmethod
+    def build(cls, city: pd.Series, price: Optional[pd.Series] = None) -> "CityPriceIndex":
+        """
+        Index a city column and, optionally, a numeric price column.
+
+        Rows with equal city and price keep their store order.
+        """
+        codes, uniques = pd.factorize(city, use_na_sentinel=True)
+        codes = np.asarray(codes)
+        if price is not None:
+            prices = pd.to_numeric(price, errors="coerce").to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+        else:
+            prices = np.full(len(codes), np.nan)
+
+        # Primary key city code, secondary price (NaN last); stable.
+        order = np.lexsort((prices, codes))
+        sorted_codes = codes[order]
+        sorted_prices = prices[order]
+        # Block boundaries where the city code changes.
+        bounds = np.flatnonzero(np.diff(sorted_codes)) + 1
+        starts = np.concatenate(([0], bounds)) if len(order) else np.zeros(0, dtype=np.int64)
+        stops = np.concatenate((bounds, [len(order)])) if len(order) else starts
+
+        blocks: Dict[str, Tuple[int, int, int]] = {}
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            code = sorted_codes[start]
+            if code < 0:
+                continue  # missing city
+            priced = int(np.count_nonzero(~np.isnan(sorted_prices[start:stop])))
+            blocks[str(uniques[code])] = (start, start + priced, stop)
+        return cls(order=order, prices=sorted_prices, blocks=blocks)
+
+    def lookup(
+        self,
+        city: str,
+        lower: Optional[float] = None,
+        upper: Optional[float] = None,
+    ) -> np.ndarray:
+        """
+        Positions of rows in `city` priced within [lower, upper], in store
+        order. With no bounds, every row of the city is returned.
+
+        Cost depends on the size of the result, not of the dataset.
+        """
+        block = self.blocks.get(city)
+        if block is None:
+            return np.zeros(0, dtype=np.int64)
+        start, priced_stop, stop = block
+        if lower is None and upper is None:
+            return np.sort(self.order[start:stop])
+
+        prices = self.prices[start:priced_stop]
+        lo = 0 if lower is None else int(np.searchsorted(prices, lower, side="left"))
+        hi = len(prices) if upper is None else int(np.searchsorted(prices, upper, side="right"))
+        return np.sort(self.order[start + lo : start + max(lo, hi)])
@@ -4,41 +4,352 @@ Data access / repository layer for Phase 3 integration.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
-from phase1_data_ingestion.storage import InMemoryRestaurantStore
+from phase1_data_ingestion.sqlite_store import (
+    POSITION_COLUMN,
+    TABLE,
+    SQLiteRestaurantStore,
+    quote_identifier,
+)
+from phase1_data_ingestion.storage import RestaurantStore
 from phase2_user_input.models import NormalizedUserInput
 
+from .bitmap_index import BitmapIndex, Condition
+from .candidate_cache import CandidateCache
+from .candidate_view import CandidateView
+from .city_price_index import CityPriceIndex
+
 
 @dataclass
 class RestaurantRepository:
     """
-    Simple repository that queries the in-memory restaurant store.
+    Simple repository that queries the restaurant store.
+
+    In-memory stores are served from indexes built once for the store: a
+    `CityPriceIndex` turns the city and price filters into a block lookup
+    plus binary search, and a `BitmapIndex` answers the categorical filters
+    (cuisines, restaurant type, locality, online ordering, table booking)
+    for the rows in that price window with bit tests instead of string
+    matching. Remaining filters only look at the surviving rows. SQLite
+    stores get the same filters as a parameterized SQL
+    query served by their indexes.
+
+    Results are `CandidateView`s: matching row positions only, with
+    columns read from the store when consumed. With a free-text query and
+    a store text index, candidates are ordered by relevance to the query.
+    `similar()` serves a restaurant's precomputed neighbor list.
+
+    With a `cache`, results for versioned stores are reused across
+    identical queries.
     """
 
-    store: InMemoryRestaurantStore
+    store: RestaurantStore
     city_column: str = "city"
     price_column: str = "approx_cost(for two people)"
+    rating_column: str = "aggregate_rating"
+    cuisine_column: str = "cuisines"
+    locality_column: str = "location"
+    rest_type_column: str = "rest_type"
+    online_order_column: str = "online_order"
+    book_table_column: str = "book_table"
+    id_column: str = "restaurant_id"
+    index: Optional[CityPriceIndex] = field(default=None, repr=False)
+    bitmaps: Optional[BitmapIndex] = field(default=None, repr=False)
+    cache: Optional[CandidateCache] = field(default=None, repr=False)
+    _positions_by_id: Optional[Dict[int, int]] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.index is None and not isinstance(self.store, SQLiteRestaurantStore):
+            df = self.store.data
+            if self.city_column in df.columns:
+                price = df[self.price_column] if self.price_column in df.columns else None
+                self.index = CityPriceIndex.build(df[self.city_column], price)
+        if self.bitmaps is None and not isinstance(self.store, SQLiteRestaurantStore):
+            self.bitmaps = BitmapIndex.build(self.store.data)
+
+    def get_candidates(self, user_input: NormalizedUserInput) -> CandidateView:
+        """
+        Filter restaurants by city and by every optional preference given
+        (price range, cuisines, minimum rating, online ordering, table
+        booking, locality and restaurant type).
 
-    def get_candidates(self, user_input: NormalizedUserInput) -> pd.DataFrame:
+        Rows come back in store order; no column is copied here.
+        Filters on columns the store lacks are skipped.
         """
-        Filter restaurants by city and, if provided, by price range.
+        if self.cache is not None and self.store.version:
+            return self.cache.get_or_compute(
+                self.store.version, user_input, lambda: self._find_candidates(user_input)
+            )
+        return self._find_candidates(user_input)
+
+    def search(self, text: str, k: int = 10, city: Optional[str] = None) -> CandidateView:
+        """
+        The `k` rows best matching free text, best first, with their
+        scores as `relevance`. Empty without a text index.
+        """
+        return self.search_batch([text], k=k, city=city)[0]
+
+    def search_batch(
+        self, texts: Sequence[str], k: int = 10, city: Optional[str] = None
+    ) -> List[CandidateView]:
         """
+        `search` for several texts, scored together as one matrix product.
+
+        Within a city only its rows are scored, exactly; otherwise the
+        index's IVF lists narrow the search.
+        """
+        text_index = self.store.text_index
+        if text_index is None:
+            return [CandidateView(self.store, np.zeros(0, dtype=np.int64)) for _ in texts]
+        positions = None
+        if city is not None:
+            everywhere = NormalizedUserInput(city=city, price_range=None, price_bucket=None)
+            positions = self._find_candidates(everywhere).rows
+        return [
+            CandidateView(self.store, rows, relevance=scores)
+            for rows, scores in text_index.search(texts, k=k, positions=positions)
+        ]
+
+    def similar(self, restaurant_id: int, k: int = 10) -> Optional[CandidateView]:
+        """
+        Up to `k` restaurants most similar to the given one, best first,
+        with their similarity as `relevance`. None for an unknown id; empty
+        without neighbor lists.
+        """
+        position = self.position_of(restaurant_id)
+        if position is None:
+            return None
+        if self.store.neighbors is None:
+            return CandidateView(self.store, np.zeros(0, dtype=np.int64))
+        rows, scores = self.store.neighbors.similar(position, k)
+        return CandidateView(self.store, rows, relevance=scores)
+
+    def position_of(self, restaurant_id: int) -> Optional[int]:
+        """
+        Store position of a restaurant id (a dict lookup; the map is built
+        on first use), or None if unknown.
+        """
+        if self._positions_by_id is None:
+            positions: Dict[int, int] = {}
+            if self.id_column in self.store.columns:
+                ids = self.store.take(np.arange(self.store.count()), [self.id_column])
+                values = ids[self.id_column].to_numpy(dtype=np.int64)
+                # First row wins, should ids ever repeat.
+                positions = dict(zip(values[::-1].tolist(), range(len(values) - 1, -1, -1)))
+            self._positions_by_id = positions
+        return self._positions_by_id.get(int(restaurant_id))
+
+    def _find_candidates(self, user_input: NormalizedUserInput) -> CandidateView:
+        if isinstance(self.store, SQLiteRestaurantStore):
+            sql, params = self.compile_query(user_input, select=[POSITION_COLUMN])
+            rows = self.store.query(sql, params)[POSITION_COLUMN].to_numpy(dtype=np.int64)
+            return self._order_by_query(CandidateView(self.store, rows), user_input.query)
+
         df = self.store.data
+        filters: List[Tuple[str, Callable[[pd.Series], Any]]] = []
+        conditions: List[Condition] = []
+        indexed = set(self.bitmaps.columns) if self.bitmaps is not None else set()
+
+        def match_values(column: str, values: List[str], pattern: str) -> None:
+            if column in indexed:
+                conditions.append((column, values))
+            else:
+                filters.append((column, _matching(pattern)))
+
+        lower, upper = user_input.price_range or (None, None)
+
+        if self.index is not None:
+            if self.price_column not in df.columns:
+                lower = upper = None
+            positions = self.index.lookup(user_input.city, lower, upper)
+        else:
+            positions = np.arange(len(df.index))
+            # City: exact match on normalized lowercase.
+            filters.append((self.city_column, lambda col: col == user_input.city))
+            if lower is not None:
+                filters.append((self.price_column, lambda col: col >= lower))
+            if upper is not None:
+                filters.append((self.price_column, lambda col: col <= upper))
+
+        if user_input.min_rating is not None:
+            filters.append((self.rating_column, lambda col: col >= user_input.min_rating))
+        if user_input.cuisines:
+            match_values(
+                self.cuisine_column,
+                user_input.cuisines,
+                _any_item_pattern(user_input.cuisines),
+            )
+        if user_input.rest_types:
+            match_values(
+                self.rest_type_column,
+                user_input.rest_types,
+                _any_item_pattern(user_input.rest_types),
+            )
+        if user_input.locality is not None:
+            match_values(
+                self.locality_column,
+                [user_input.locality],
+                "^" + re.escape(user_input.locality) + "$",
+            )
+        for column, wanted in (
+            (self.online_order_column, user_input.online_order),
+            (self.book_table_column, user_input.book_table),
+        ):
+            if wanted is not None:
+                answer = "yes" if wanted else "no"
+                match_values(column, [answer], f"^{answer}$")
 
-        # Filter by city (exact match on normalized lowercase).
-        if self.city_column in df.columns:
-            df = df[df[self.city_column] == user_input.city]
+        if conditions:
+            positions = self.bitmaps.select(conditions, positions)
+        for column, predicate in filters:
+            if column not in df.columns or len(positions) == 0:
+                continue
+            matched = predicate(df[column].take(positions))
+            if isinstance(matched, pd.Series):
+                # Missing values (NaN, or NA in Arrow-backed columns) fail.
+                matched = matched.fillna(False).to_numpy(dtype=bool)
+            positions = positions[matched]
 
-        # Filter by price range if available.
-        if user_input.price_range is not None and self.price_column in df.columns:
+        return self._order_by_query(CandidateView(self.store, positions), user_input.query)
+
+    def _order_by_query(self, view: CandidateView, query: Optional[str]) -> CandidateView:
+        """
+        Most relevant rows first (store order among ties). The query is a
+        soft preference: rows without matching terms stay, scored 0.
+        """
+        text_index = self.store.text_index
+        if query is None or text_index is None or view.empty:
+            return view
+        scores = text_index.score(text_index.encode([query]), view.rows)[0]
+        order = np.argsort(-scores, kind="stable")
+        return CandidateView(self.store, view.rows[order], relevance=scores[order])
+
+    def compile_query(
+        self, user_input: NormalizedUserInput, select: Optional[Sequence[str]] = None
+    ) -> Tuple[str, List[Any]]:
+        """
+        Translate the filters into a parameterized SQL query.
+
+        Rows come back in store order, as with the in-memory filters. The
+        query selects `select`, or by default the hot columns (like the
+        in-memory `data` frame).
+        """
+        columns = self.store.columns
+        selected = list(select) if select is not None else getattr(
+            self.store, "hot_columns", columns
+        )
+        conditions: List[str] = []
+        params: List[Any] = []
+
+        if self.city_column in columns:
+            conditions.append(f"{quote_identifier(self.city_column)} = ?")
+            params.append(user_input.city)
+
+        if user_input.price_range is not None and self.price_column in columns:
             lower, upper = user_input.price_range
             if lower is not None:
-                df = df[df[self.price_column] >= lower]
+                conditions.append(f"{quote_identifier(self.price_column)} >= ?")
+                params.append(lower)
             if upper is not None:
-                df = df[df[self.price_column] <= upper]
+                conditions.append(f"{quote_identifier(self.price_column)} <= ?")
+                params.append(upper)
+
+        if user_input.min_rating is not None and self.rating_column in columns:
+            conditions.append(f"{quote_identifier(self.rating_column)} >= ?")
+            params.append(user_input.min_rating)
+
+        for column, items in (
+            (self.cuisine_column, user_input.cuisines),
+            (self.rest_type_column, user_input.rest_types),
+        ):
+            if items and column in columns:
+                # Wrap the list in commas so each item matches whole:
+                # ",north indian,chinese," LIKE "%,chinese,%".
+                padded = (
+                    f"(',' || REPLACE(LOWER({quote_identifier(column)}), ', ', ',') || ',')"
+                )
+                conditions.append(
+                    "(" + " OR ".join(f"{padded} LIKE ? ESCAPE '\\'" for _ in items) + ")"
+                )
+                params.extend(f"%,{_escape_like(item)},%" for item in items)
+
+        if user_input.locality is not None and self.locality_column in columns:
+            conditions.append(f"LOWER({quote_identifier(self.locality_column)}) = ?")
+            params.append(user_input.locality)
+
+        for column, wanted in (
+            (self.online_order_column, user_input.online_order),
+            (self.book_table_column, user_input.book_table),
+        ):
+            if wanted is not None and column in columns:
+                conditions.append(f"LOWER({quote_identifier(column)}) = ?")
+                params.append("yes" if wanted else "no")
+
+        sql = f"SELECT {', '.join(quote_identifier(c) for c in selected)} FROM {TABLE}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {quote_identifier(POSITION_COLUMN)}"
+        return sql, params
+
+
+def _any_item_pattern(items: Sequence[str]) -> str:
+    """
+    Regex matching a comma-separated list that contains any of `items`.
+    """
+    alternatives = "|".join(re.escape(item) for item in items)
+    return rf"(?:^|,)\s*(?:{alternatives})\s*(?:,|$)"
+
+
+def _matching(pattern: str) -> Callable[[pd.Series], np.ndarray]:
+    return lambda series: _text_mask(series, pattern)
+
+
+def _text_mask(series: pd.Series, pattern: str) -> np.ndarray:
+    """
+    Case-insensitive regex match over a text column; missing values fail.
+
+    Categorical columns (and Arrow dictionary columns of a shared store)
+    are matched once per category and mapped back through the integer
+    codes, so cost scales with distinct values.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return _coded_mask(series.cat.categories, series.cat.codes.to_numpy(), pattern)
+    if isinstance(series.dtype, pd.ArrowDtype) and pa.types.is_dictionary(
+        series.dtype.pyarrow_dtype
+    ):
+        chunks = series.array.__arrow_array__().chunks
+        return np.concatenate(
+            [np.zeros(0, dtype=bool)]
+            + [
+                _coded_mask(
+                    chunk.dictionary.to_pandas(),
+                    chunk.indices.fill_null(-1).to_numpy(zero_copy_only=False),
+                    pattern,
+                )
+                for chunk in chunks
+            ]
+        )
+    values = series.astype("string") if series.dtype == object else series
+    return values.str.contains(pattern, case=False, regex=True, na=False).to_numpy(bool)
+
+
+def _coded_mask(categories: Sequence[Any], codes: np.ndarray, pattern: str) -> np.ndarray:
+    matched = (
+        pd.Series(categories, dtype=object)
+        .astype(str)
+        .str.contains(pattern, case=False, regex=True)
+        .to_numpy(dtype=bool)
+    )
+    # Code -1 (missing) picks the appended False.
+    return np.append(matched, False)[codes]
 
-        return df.reset_index(drop=True)
 
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -3,17 +3,17 @@ Service layer for Phase 3 integration.
 
 This prepares a candidate set of restaurants for a given user input by
 connecting:
-- Phase 2 validation + normalization, and
-- Phase 1 in-memory restaurant store via the repository.
+- Phase 2 validation + normalization,
+- Phase 1 in-memory restaurant store via the repository, and
+- optionally, query canonicalization and an LLM cache key for the
+  selected candidates.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import List, Optional
 
-import pandas as pd
-
 from phase2_user_input.models import NormalizedUserInput, RawUserInput
 from phase2_user_input.validation import (
     InputNormalizer,
@@ -21,6 +21,8 @@ from phase2_user_input.validation import (
     ValidationError,
 )
 
+from .canonical import QueryCanonicalizer
+from .candidate_view import CandidateView
 from .repository import RestaurantRepository
 
 
@@ -33,13 +35,19 @@ class RecommendationPreparationResult:
     is_valid: bool
     errors: List[ValidationError]
     normalized_input: Optional[NormalizedUserInput]
-    candidates: Optional[pd.DataFrame]
+    candidates: Optional[CandidateView]
+    cache_key: Optional[str] = None
 
 
 class RecommendationPreparationService:
     """
     Orchestrates Phase 2 and repository to produce a candidate set
     of restaurants that match the user's constraints.
+
+    With a `canonicalizer`, the returned `normalized_input` is the
+    canonical form of the query and `cache_key` keys its LLM answer by
+    the candidates it selected (see `QueryCanonicalizer`), so queries
+    that differ only in a budget picking the same rows share one answer.
     """
 
     def __init__(
@@ -47,10 +55,16 @@ class RecommendationPreparationService:
         repository: RestaurantRepository,
         validator: InputValidator,
         normalizer: InputNormalizer,
+        canonicalizer: Optional[QueryCanonicalizer] = None,
     ) -> None:
         self._repository = repository
         self._validator = validator
         self._normalizer = normalizer
+        self._canonicalizer = canonicalizer
+
+    @property
+    def repository(self) -> RestaurantRepository:
+        return self._repository
 
     def prepare(self, raw_input: RawUserInput) -> RecommendationPreparationResult:
         """
@@ -66,13 +80,21 @@ class RecommendationPreparationService:
                 candidates=None,
             )
 
+        if validation.resolved_city is not None:
+            # Normalize against the canonical city ("Bengaluru" -> "bangalore").
+            raw_input = replace(raw_input, city=validation.resolved_city)
         normalized = self._normalizer.normalize(raw_input)
         candidates = self._repository.get_candidates(normalized)
+        cache_key = None
+        if self._canonicalizer is not None:
+            normalized = self._canonicalizer.canonicalize(normalized)
+            cache_key = self._canonicalizer.key(normalized, candidates)
 
         return RecommendationPreparationResult(
             is_valid=True,
             errors=[],
             normalized_input=normalized,
             candidates=candidates,
+            cache_key=cache_key,
         )
 
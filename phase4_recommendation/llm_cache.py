@@ -0,0 +1,360 @@
+"""
+Two-tier cache of LLM responses (Phase 4).
+
+Many recommendation requests repeat (same city, budget and filters give
+the same prompt), and the LLM call is by far the slowest and costliest
+step. Responses are therefore cached by a fingerprint of the store
+version, model, temperature and prompt:
+
+- an in-process LRU with a TTL answers repeats within one worker;
+- an optional SQLite file answers repeats across workers and restarts.
+
+A memory miss that hits the disk tier is copied into memory. Activating a
+new store version (done when a refreshed store is published) drops every
+entry of the old one in memory, as `CandidateCache` does for candidate
+sets. On disk it drops only versions first activated before it, so during
+a rolling refresh workers still on the old version and workers on the new
+one do not purge each other's entries. The disk table is also capped in
+rows, and expired rows are swept on every write.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from .llm_client import LLMClient
+
+DEFAULT_MAX_ENTRIES = 1_024
+DEFAULT_TTL_SECONDS = 3_600.0
+DEFAULT_MAX_DISK_ENTRIES = 100_000
+
+_TABLE = "llm_responses"
+_VERSIONS_TABLE = "llm_versions"
+
+
+@dataclass(frozen=True)
+class LLMCacheStats:
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def to_dict(self) -> Dict[str, int]:
+        return {**asdict(self), "hits": self.hits}
+
+
+def prompt_fingerprint(version: str, model: str, temperature: Optional[float], prompt: str) -> str:
+    """
+    Hex SHA-256 of everything that determines an LLM response.
+    """
+    digest = hashlib.sha256()
+    for part in (version, model, repr(temperature), prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class DiskResponseStore:
+    """
+    SQLite table of responses shared by every process that opens the file.
+
+    Each thread uses its own connection; WAL mode lets readers proceed
+    while another worker writes. At most `max_entries` rows are kept, the
+    newest first.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = DEFAULT_MAX_DISK_ENTRIES) -> None:
+        self._path = Path(path)
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._execute(
+            f"CREATE TABLE IF NOT EXISTS {_TABLE} ("
+            "key TEXT PRIMARY KEY, version TEXT NOT NULL, "
+            "response TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._execute(f"CREATE INDEX IF NOT EXISTS {_TABLE}_created ON {_TABLE} (created)")
+        self._execute(f"CREATE INDEX IF NOT EXISTS {_TABLE}_version ON {_TABLE} (version)")
+        # Store versions in the order a worker first activated them.
+        self._execute(
+            f"CREATE TABLE IF NOT EXISTS {_VERSIONS_TABLE} ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, version TEXT NOT NULL UNIQUE)"
+        )
+
+    def get(self, key: str, oldest: float) -> Optional[str]:
+        row = self._execute(
+            f"SELECT response FROM {_TABLE} WHERE key = ? AND created >= ?", (key, oldest)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def put(
+        self, key: str, version: str, response: str, created: float, oldest: float
+    ) -> None:
+        """
+        Store a response, then drop rows older than `oldest` and the oldest
+        rows beyond `max_entries`.
+        """
+        self._execute(
+            f"INSERT OR REPLACE INTO {_TABLE} (key, version, response, created) "
+            "VALUES (?, ?, ?, ?)",
+            (key, version, response, created),
+        )
+        self._execute(f"DELETE FROM {_TABLE} WHERE created < ?", (oldest,))
+        self._execute(
+            f"DELETE FROM {_TABLE} WHERE key IN ("
+            f"SELECT key FROM {_TABLE} ORDER BY created DESC LIMIT -1 OFFSET ?)",
+            (max(self.max_entries, 0),),
+        )
+
+    def delete(self, key: str) -> None:
+        self._execute(f"DELETE FROM {_TABLE} WHERE key = ?", (key,))
+
+    def retain(self, version: str, oldest: float) -> None:
+        """
+        Record `version` as activated (the first time only), then drop
+        entries of versions first activated before it and entries older
+        than `oldest`. Newer versions are left alone.
+        """
+        self._execute(f"INSERT OR IGNORE INTO {_VERSIONS_TABLE} (version) VALUES (?)", (version,))
+        self._execute(
+            f"DELETE FROM {_TABLE} WHERE created < ? OR version IN ("
+            f"SELECT version FROM {_VERSIONS_TABLE} WHERE seq < ("
+            f"SELECT seq FROM {_VERSIONS_TABLE} WHERE version = ?))",
+            (oldest, version),
+        )
+
+    def count(self) -> int:
+        return int(self._execute(f"SELECT COUNT(*) FROM {_TABLE}").fetchone()[0])
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _execute(self, sql: str, params: Tuple = ()) -> sqlite3.Cursor:
+        return self._connection().execute(sql, params)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit; wait for another worker's write instead of failing.
+            conn = sqlite3.connect(
+                self._path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+
+class LLMResponseCache:
+    """
+    Thread-safe LRU of responses with a TTL, optionally backed by a
+    `DiskResponseStore`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        disk: Optional[DiskResponseStore] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk = disk
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._version = ""
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> str:
+        return self._version
+
+    def key(self, model: str, temperature: Optional[float], prompt: str) -> str:
+        return prompt_fingerprint(self._version, model, temperature, prompt)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Cached response for `key`, from memory or else from disk.
+        """
+        response = self._get_memory(key)
+        if response is not None:
+            return response
+        return self._get_disk(key)
+
+    def put(self, key: str, response: str) -> None:
+        created = self._clock()
+        self._put_memory(key, response, created)
+        if self.disk is not None:
+            self.disk.put(key, self._version, response, created, created - self.ttl_seconds)
+
+    async def aget(self, key: str) -> Optional[str]:
+        """
+        `get`, reading the disk tier in a worker thread.
+        """
+        response = self._get_memory(key)
+        if response is not None or self.disk is None:
+            return response
+        return await asyncio.to_thread(self._get_disk, key)
+
+    async def aput(self, key: str, response: str) -> None:
+        if self.disk is None:
+            self.put(key, response)
+        else:
+            await asyncio.to_thread(self.put, key, response)
+
+    def discard(self, key: str) -> None:
+        """
+        Forget one response (e.g. one that turned out to be unusable).
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def activate(self, version: str) -> None:
+        """
+        Cache for `version` from now on, dropping entries of other versions
+        from memory and of older versions from disk.
+        """
+        with self._lock:
+            if version == self._version:
+                return
+            self._entries.clear()
+            self._version = version
+        if self.disk is not None:
+            self.disk.retain(version, self._clock() - self.ttl_seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> LLMCacheStats:
+        with self._lock:
+            return LLMCacheStats(
+                memory_hits=self._memory_hits,
+                disk_hits=self._disk_hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                entries=len(self._entries),
+            )
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                response, created = entry
+                if self._clock() - created <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._memory_hits += 1
+                    return response
+                del self._entries[key]
+                self._expirations += 1
+            if self.disk is None:
+                self._misses += 1
+        return None
+
+    def _get_disk(self, key: str) -> Optional[str]:
+        if self.disk is None:
+            return None
+        now = self._clock()
+        response = self.disk.get(key, now - self.ttl_seconds)
+        with self._lock:
+            if response is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+        # The disk entry's age is unknown here; give the copy a fresh TTL.
+        self._put_memory(key, response, now)
+        return response
+
+    def _put_memory(self, key: str, response: str, created: float) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (response, created)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+
+class CachingLLMClient:
+    """
+    `LLMClient` that answers repeated prompts from an `LLMResponseCache`.
+
+    The key covers the wrapped client's `model` and `temperature` (when it
+    has them), so changing either never serves stale responses. Errors
+    are not cached. `agenerate` awaits the wrapped client's `agenerate`
+    when it has one. A `cache_key` given by the caller replaces the prompt
+    in the key, for prompts that deserve the same answer.
+    """
+
+    def __init__(self, client: LLMClient, cache: LLMResponseCache) -> None:
+        self.client = client
+        self.cache = cache
+
+    @property
+    def model(self) -> str:
+        return str(getattr(self.client, "model", type(self.client).__name__))
+
+    @property
+    def temperature(self) -> Optional[float]:
+        return getattr(self.client, "temperature", None)
+
+    def generate(self, prompt: str, cache_key: Optional[str] = None) -> str:
+        key = self._key(prompt, cache_key)
+        response = self.cache.get(key)
+        if response is None:
+            response = self.client.generate(prompt)
+            self.cache.put(key, response)
+        return response
+
+    async def agenerate(self, prompt: str, cache_key: Optional[str] = None) -> str:
+        key = self._key(prompt, cache_key)
+        response = await self.cache.aget(key)
+        if response is not None:
+            return response
+
+        agenerate = getattr(self.client, "agenerate", None)
+        if inspect.iscoroutinefunction(agenerate):
+            response = await agenerate(prompt)
+        else:
+            response = await asyncio.to_thread(self.client.generate, prompt)
+        await self.cache.aput(key, response)
+        return response
+
+    def discard(self, prompt: str, cache_key: Optional[str] = None) -> None:
+        """
+        Drop the cached response to `prompt` (or to `cache_key`).
+        """
+        self.cache.discard(self._key(prompt, cache_key))
+
+    def _key(self, prompt: str, cache_key: Optional[str]) -> str:
+        return self.cache.key(
+            self.model, self.temperature, prompt if cache_key is None else cache_key
+        )
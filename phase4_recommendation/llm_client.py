@@ -1,19 +1,32 @@
 """
 Abstractions and implementations for LLM access (Groq-backed).
+
+`get_groq_client()` returns one process-wide client whose HTTP session
+keeps connections to the API alive, so requests after the first skip the
+TCP and TLS handshakes. Pool size and timeouts come from `HTTPConfig`.
+
+`agenerate()` is the asyncio counterpart: it awaits the API over a pooled
+`httpx.AsyncClient`, so a pending call holds no thread and one event loop
+can wait on thousands of them.
 """
 
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
-from typing import Protocol
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Protocol
 
+import httpx
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 # Load environment variables from a .env file at project root (if present)
 load_dotenv()
 
+DEFAULT_BASE_URL = "https://api.groq.com/openai/v1"
+
 
 class LLMClient(Protocol):
     """
@@ -26,6 +39,79 @@ class LLMClient(Protocol):
         ...
 
 
+class AsyncLLMClient(Protocol):
+    """
+    LLM client whose calls are awaited instead of blocking a thread.
+    """
+
+    async def agenerate(self, prompt: str) -> str:  # pragma: no cover - protocol
+        ...
+
+
+@dataclass(frozen=True)
+class HTTPConfig:
+    """
+    Connection pooling and timeouts for calls to the LLM API.
+    """
+
+    # Hosts whose connections are pooled (one for Groq)
+    pool_connections: int = field(
+        default_factory=lambda: int(os.getenv("GROQ_POOL_CONNECTIONS", "4"))
+    )
+
+    # Connections kept alive per host; concurrent requests beyond this open
+    # short-lived extra connections, or wait for a free one with `pool_block`
+    pool_maxsize: int = field(default_factory=lambda: int(os.getenv("GROQ_POOL_MAXSIZE", "16")))
+    pool_block: bool = field(
+        default_factory=lambda: os.getenv("GROQ_POOL_BLOCK", "").lower() in ("1", "true", "yes")
+    )
+
+    # Seconds to establish a connection, and to wait for the response
+    connect_timeout: float = field(
+        default_factory=lambda: float(os.getenv("GROQ_CONNECT_TIMEOUT", "5"))
+    )
+    read_timeout: float = field(default_factory=lambda: float(os.getenv("GROQ_READ_TIMEOUT", "30")))
+
+    # Connections the async client may open at once; further calls wait
+    # (without a timeout) for one to free up
+    max_connections: int = field(
+        default_factory=lambda: int(os.getenv("GROQ_MAX_CONNECTIONS", "256"))
+    )
+
+
+def build_session(config: HTTPConfig) -> requests.Session:
+    """
+    A `requests.Session` whose HTTP(S) connections are pooled and reused.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        pool_block=config.pool_block,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def build_async_client(config: HTTPConfig) -> httpx.AsyncClient:
+    """
+    An `httpx.AsyncClient` with the same pooling and timeouts.
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.pool_maxsize,
+        ),
+        timeout=httpx.Timeout(
+            connect=config.connect_timeout,
+            read=config.read_timeout,
+            write=config.read_timeout,
+            pool=None,
+        ),
+    )
+
+
 @dataclass
 class GroqAPIClient:
     """
@@ -34,10 +120,21 @@ class GroqAPIClient:
     This implementation expects the API key to be provided via:
     - Explicit `api_key` argument, or
     - `GROQ_API_KEY` environment variable.
+
+    Calls go through a pooled keep-alive session (built from `http` unless
+    one is given); `agenerate` uses an async client created on first use
+    (bound to the event loop that makes it). `base_url` (or
+    `GROQ_BASE_URL`) can point at any OpenAI-compatible server, e.g. a
+    local stand-in.
     """
 
     model: str = "llama-3.3-70b-versatile"
+    temperature: float = 0.4
     api_key: str | None = None
+    base_url: str = field(default_factory=lambda: os.getenv("GROQ_BASE_URL", DEFAULT_BASE_URL))
+    http: HTTPConfig = field(default_factory=HTTPConfig)
+    session: Optional[requests.Session] = field(default=None, repr=False)
+    async_client: Optional[httpx.AsyncClient] = field(default=None, repr=False)
 
     def __post_init__(self) -> None:
         if self.api_key is None:
@@ -46,31 +143,112 @@ class GroqAPIClient:
             raise ValueError(
                 "Groq API key is required. Set GROQ_API_KEY env var or pass api_key explicitly."
             )
+        if self.session is None:
+            self.session = build_session(self.http)
+
+    def close(self) -> None:
+        """
+        Close the pooled connections.
+        """
+        if self.session is not None:
+            self.session.close()
+
+    async def aclose(self) -> None:
+        """
+        Close the pooled connections of the async client.
+        """
+        if self.async_client is not None:
+            await self.async_client.aclose()
+            self.async_client = None
 
     def generate(self, prompt: str) -> str:
         """
         Call Groq's chat completions endpoint and return the model's text.
         """
-        url = "https://api.groq.com/openai/v1/chat/completions"
-        headers = {
+        resp = self.session.post(
+            self._url(),
+            headers=self._headers(),
+            json=self._body(prompt),
+            timeout=(self.http.connect_timeout, self.http.read_timeout),
+        )
+        resp.raise_for_status()
+        return _message_text(resp.json())
+
+    async def agenerate(self, prompt: str) -> str:
+        """
+        `generate`, awaiting the response without blocking a thread.
+        """
+        if self.async_client is None:
+            self.async_client = build_async_client(self.http)
+        resp = await self.async_client.post(
+            self._url(), headers=self._headers(), json=self._body(prompt)
+        )
+        resp.raise_for_status()
+        return _message_text(resp.json())
+
+    def _url(self) -> str:
+        return f"{self.base_url.rstrip('/')}/chat/completions"
+
+    def _headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
-        body = {
+
+    def _body(self, prompt: str) -> Dict[str, Any]:
+        return {
             "model": self.model,
             "messages": [
                 {"role": "system", "content": "You are a helpful restaurant recommendation assistant."},
                 {"role": "user", "content": prompt},
             ],
-            "temperature": 0.4,
+            "temperature": self.temperature,
         }
 
-        resp = requests.post(url, headers=headers, json=body, timeout=30)
-        resp.raise_for_status()
 
-        data = resp.json()
-        try:
-            return data["choices"][0]["message"]["content"]
-        except (KeyError, IndexError, TypeError) as exc:  # pragma: no cover - defensive
-            raise RuntimeError("Unexpected response format from Groq API.") from exc
+def _message_text(data: Any) -> str:
+    try:
+        return data["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError) as exc:  # pragma: no cover - defensive
+        raise RuntimeError("Unexpected response format from Groq API.") from exc
+
 
+_CLIENT: Optional[GroqAPIClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_groq_client() -> GroqAPIClient:
+    """
+    The process-wide Groq client, created on first use.
+
+    Raises ValueError (and caches nothing) while no API key is configured.
+    """
+    global _CLIENT
+    client = _CLIENT
+    if client is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = GroqAPIClient()
+            client = _CLIENT
+    return client
+
+
+def reset_groq_client() -> None:
+    """
+    Close and drop the process-wide client (e.g. after rotating the key).
+    """
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is not None:
+            _CLIENT.close()
+        _CLIENT = None
+
+
+async def aclose_groq_client() -> None:
+    """
+    `reset_groq_client`, also closing the async connections (on shutdown).
+    """
+    client = _CLIENT
+    if client is not None:
+        await client.aclose()
+    reset_groq_client()
@@ -6,14 +6,13 @@ from __future__ import annotations
 
 from typing import List
 
-import pandas as pd
-
 from phase2_user_input.models import NormalizedUserInput
+from phase3_integration.candidate_view import Candidates
 
 
 def build_recommendation_prompt(
     user_input: NormalizedUserInput,
-    candidates: pd.DataFrame,
+    candidates: Candidates,
     max_candidates: int = 20,
 ) -> str:
     """
@@ -44,6 +43,22 @@ def build_recommendation_prompt(
         lines.append(f"- Price range for two: {lower} to {upper}")
     if user_input.price_bucket is not None:
         lines.append(f"- Price bucket: {user_input.price_bucket}")
+    # Hard filters were already applied to the candidates; they are listed
+    # so the explanations can refer to them.
+    if user_input.cuisines:
+        lines.append(f"- Cuisines: {', '.join(user_input.cuisines)}")
+    if user_input.min_rating is not None:
+        lines.append(f"- Minimum rating: {user_input.min_rating}")
+    if user_input.online_order is not None:
+        lines.append(f"- Online ordering: {'yes' if user_input.online_order else 'no'}")
+    if user_input.book_table is not None:
+        lines.append(f"- Table booking: {'yes' if user_input.book_table else 'no'}")
+    if user_input.locality is not None:
+        lines.append(f"- Locality: {user_input.locality}")
+    if user_input.rest_types:
+        lines.append(f"- Restaurant type: {', '.join(user_input.rest_types)}")
+    if user_input.query is not None:
+        lines.append(f"- Looking for: {user_input.query}")
     lines.append("")
 
     # Candidate restaurants section.
@@ -58,7 +73,8 @@ def build_recommendation_prompt(
         ]
         if col in candidates.columns
     ]
-    subset = candidates[display_cols].head(max_candidates)
+    # Take the rows first: a CandidateView then reads just these cells.
+    subset = candidates.head(max_candidates)[display_cols]
 
     lines.append("Candidate restaurants (tabular):")
     lines.append(subset.to_csv(index=False))
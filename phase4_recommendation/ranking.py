@@ -0,0 +1,161 @@
+"""
+Heuristic pre-ranking of candidates for Phase 4 (architecture step 4.2).
+
+`RuleBasedRecommender` scores every candidate with
+
+    score = w_rating * rating + w_votes * log(votes + 1)
+            - w_price * price_distance + w_relevance * relevance
+
+where `price_distance` is the relative distance between a restaurant's
+price for two and the user's ideal price (the middle of their range), and
+`relevance` is the free-text match score a `CandidateView` may carry.
+Scores are computed column-wise with NumPy and the top K are selected
+with a partial sort (`np.argpartition`), so the LLM only sees the best
+few matches rather than the first rows of the candidate set.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from phase2_user_input.models import NormalizedUserInput
+from phase3_integration.candidate_view import Candidates, CandidateView
+
+# Candidates passed on to the prompt by default.
+DEFAULT_TOP_K = 10
+
+
+@dataclass(frozen=True)
+class ScoringWeights:
+    """
+    Weights of the composite score.
+    """
+
+    rating: float = 1.0
+    votes: float = 0.3
+    price_distance: float = 1.0
+    relevance: float = 3.0
+
+    @classmethod
+    def from_env(cls, variable: str = "ZOMATO_SCORE_WEIGHTS") -> "ScoringWeights":
+        """
+        Read weights such as "rating=1,votes=0.5,price_distance=2".
+
+        Unset names keep their defaults.
+        """
+        text = os.getenv(variable, "").strip()
+        if not text:
+            return cls()
+        values = {}
+        for part in text.split(","):
+            name, _, value = part.partition("=")
+            name = name.strip()
+            if name not in cls.__dataclass_fields__:
+                raise ValueError(f"Unknown scoring weight {name!r} in {variable}.")
+            values[name] = float(value)
+        return cls(**values)
+
+
+@dataclass
+class RuleBasedRecommender:
+    """
+    Scores candidates and keeps the `top_k` best, best first.
+
+    Restaurants without a rating are scored with the median rating of the
+    candidate set; missing votes count as zero. Only the three scored
+    columns are read from a `CandidateView`.
+    """
+
+    weights: ScoringWeights = field(default_factory=ScoringWeights)
+    top_k: int = DEFAULT_TOP_K
+    price_column: str = "approx_cost(for two people)"
+    rating_column: str = "aggregate_rating"
+    votes_column: str = "votes"
+
+    def scores(self, user_input: NormalizedUserInput, candidates: Candidates) -> np.ndarray:
+        """
+        Composite score of every candidate row.
+        """
+        rows = len(candidates)
+        score = np.zeros(rows, dtype=np.float64)
+
+        rating = self._column(candidates, self.rating_column)
+        if rating is not None:
+            known = rating[~np.isnan(rating)]
+            fill = float(np.median(known)) if known.size else 0.0
+            score += self.weights.rating * np.where(np.isnan(rating), fill, rating)
+
+        votes = self._column(candidates, self.votes_column)
+        if votes is not None:
+            score += self.weights.votes * np.log1p(np.clip(np.nan_to_num(votes), 0.0, None))
+
+        ideal = _ideal_price(user_input)
+        price = self._column(candidates, self.price_column)
+        if ideal is not None and price is not None:
+            distance = np.abs(price - ideal) / max(ideal, 1.0)
+            # Unknown prices get the largest distance in the set.
+            worst = float(np.nanmax(distance)) if not np.isnan(distance).all() else 0.0
+            score -= self.weights.price_distance * np.where(np.isnan(distance), worst, distance)
+
+        if isinstance(candidates, CandidateView) and candidates.relevance is not None:
+            score += self.weights.relevance * candidates.relevance
+        return score
+
+    def top_positions(
+        self, user_input: NormalizedUserInput, candidates: Candidates
+    ) -> np.ndarray:
+        """
+        Positions of the best `top_k` rows, best first.
+
+        Ties keep candidate order.
+        """
+        score = self.scores(user_input, candidates)
+        k = min(self.top_k, len(score))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        if k < len(score):
+            top = np.argpartition(-score, k - 1)[:k]
+            kth = score[top].min()
+            better = top[score[top] > kth]
+            # argpartition picks arbitrary rows among those tied with the
+            # k-th best; take them in candidate order instead.
+            tied = np.flatnonzero(score == kth)[: k - len(better)]
+            best = np.concatenate((better, tied))
+        else:
+            best = np.arange(len(score))
+        # Order the selected few by score, then position.
+        return best[np.lexsort((best, -score[best]))][:k]
+
+    def rank(self, user_input: NormalizedUserInput, candidates: Candidates) -> Candidates:
+        """
+        The best `top_k` candidates, best first, as the same type as given.
+        """
+        positions = self.top_positions(user_input, candidates)
+        if isinstance(candidates, CandidateView):
+            return candidates.take(positions)
+        return candidates.iloc[positions].reset_index(drop=True)
+
+    def _column(self, candidates: Candidates, column: str) -> Optional[np.ndarray]:
+        if column not in candidates.columns:
+            return None
+        return pd.to_numeric(candidates[column], errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+
+
+def _ideal_price(user_input: NormalizedUserInput) -> Optional[float]:
+    if user_input.price_range is None:
+        return None
+    lower, upper = user_input.price_range
+    if lower is None and upper is None:
+        return None
+    if lower is None:
+        return upper
+    if upper is None:
+        return lower
+    return (lower + upper) / 2.0
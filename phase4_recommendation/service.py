@@ -3,20 +3,32 @@ Recommendation service for Phase 4 that uses an LLM client.
 
 This service is independent of any concrete Groq API usage. It can be
 fully tested using a fake LLM client that returns deterministic JSON.
+
+`arecommend` is the asyncio variant used by the API: ranking and prompt
+building run in a worker thread, and the LLM call is awaited.
+
+With a `SingleFlight`, concurrent requests that build the same prompt
+share one LLM call and its parsed result. A `cache_key` (see
+`phase3_integration.canonical`) replaces the prompt as the key of both
+the single-flight and a `CachingLLMClient`.
 """
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 import json
-from dataclasses import dataclass
-from typing import List
-
-import pandas as pd
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 from phase2_user_input.models import NormalizedUserInput
+from phase3_integration.candidate_view import Candidates
+from .llm_cache import CachingLLMClient, prompt_fingerprint
 from .llm_client import LLMClient
 from .models import RecommendedRestaurant
 from .prompt_builder import build_recommendation_prompt
+from .ranking import RuleBasedRecommender
+from .single_flight import SingleFlight
 
 
 class LLMRecommendationError(Exception):
@@ -29,15 +41,27 @@ class LLMRecommendationError(Exception):
 @dataclass
 class LLMRecommendationService:
     """
-    Coordinates prompt building, LLM call, and response parsing.
+    Coordinates pre-ranking, prompt building, LLM call, and response parsing.
+
+    Candidates are first narrowed to the best few by `ranker` (a cheap
+    heuristic score), so the prompt carries the strongest matches rather
+    than the first rows. Pass `ranker=None` to send candidates as given.
+
+    `flights` coalesces concurrent calls by prompt fingerprint; share one
+    instance across requests for it to have any effect. When a caller
+    passes `cache_key`, calls are coalesced and cached by that key
+    instead, so prompts that differ only in ranking share one answer.
     """
 
     llm_client: LLMClient
+    ranker: Optional[RuleBasedRecommender] = field(default_factory=RuleBasedRecommender)
+    flights: Optional[SingleFlight] = None
 
     def recommend(
         self,
         user_input: NormalizedUserInput,
-        candidates: pd.DataFrame,
+        candidates: Candidates,
+        cache_key: Optional[str] = None,
     ) -> List[RecommendedRestaurant]:
         """
         Use the LLM to select and describe the best restaurants.
@@ -45,41 +69,119 @@ class LLMRecommendationService:
         if candidates.empty:
             return []
 
-        prompt = build_recommendation_prompt(user_input, candidates)
+        prompt = self.build_prompt(user_input, candidates)
+        if self.flights is None:
+            return self._call(prompt, cache_key)
+        key = self._fingerprint(cache_key or prompt)
+        return list(self.flights.do(key, lambda: self._call(prompt, cache_key)))
+
+    async def arecommend(
+        self,
+        user_input: NormalizedUserInput,
+        candidates: Candidates,
+        cache_key: Optional[str] = None,
+    ) -> List[RecommendedRestaurant]:
+        """
+        `recommend` without blocking the event loop.
+
+        Ranking and prompt building (CPU and store reads) run in a worker
+        thread. The LLM call is awaited when the client has `agenerate`;
+        a sync-only client is called in a worker thread instead.
+        """
+        if candidates.empty:
+            return []
+
+        prompt = await asyncio.to_thread(self.build_prompt, user_input, candidates)
+        if self.flights is None:
+            return await self._acall(prompt, cache_key)
+        key = self._fingerprint(cache_key or prompt)
+        shared = await self.flights.ado(key, lambda: self._acall(prompt, cache_key))
+        return list(shared)
 
+    def build_prompt(self, user_input: NormalizedUserInput, candidates: Candidates) -> str:
+        """
+        Pre-rank the candidates (when a ranker is set) and build the prompt.
+        """
+        if self.ranker is not None:
+            candidates = self.ranker.rank(user_input, candidates)
+        return build_recommendation_prompt(user_input, candidates)
+
+    def _call(self, prompt: str, cache_key: Optional[str]) -> List[RecommendedRestaurant]:
+        keyed = self._keyed(cache_key)
         try:
-            raw_response = self.llm_client.generate(prompt)
+            raw_response = self.llm_client.generate(prompt, **keyed)
         except Exception as exc:  # pragma: no cover - network/LLM failure
             raise LLMRecommendationError(f"Error calling LLM: {exc}") from exc
+        return self._parse(prompt, raw_response, keyed)
 
+    async def _acall(self, prompt: str, cache_key: Optional[str]) -> List[RecommendedRestaurant]:
+        keyed = self._keyed(cache_key)
+        agenerate = getattr(self.llm_client, "agenerate", None)
         try:
-            data = json.loads(raw_response)
-        except json.JSONDecodeError as exc:
-            raise LLMRecommendationError("LLM response was not valid JSON.") from exc
-
-        if not isinstance(data, list):
-            raise LLMRecommendationError("LLM response root must be a JSON array.")
-
-        recommendations: List[RecommendedRestaurant] = []
-        for item in data:
-            if not isinstance(item, dict):
-                continue
-            name = item.get("name")
-            if not isinstance(name, str):
-                continue
-
-            recommendations.append(
-                RecommendedRestaurant(
-                    name=name,
-                    city=item.get("city"),
-                    cuisines=item.get("cuisines"),
-                    price_for_two=_to_optional_float(item.get("price_for_two")),
-                    rating=_to_optional_float(item.get("rating")),
-                    reason=item.get("reason"),
-                )
+            if inspect.iscoroutinefunction(agenerate):
+                raw_response = await agenerate(prompt, **keyed)
+            else:
+                raw_response = await asyncio.to_thread(self.llm_client.generate, prompt, **keyed)
+        except Exception as exc:  # pragma: no cover - network/LLM failure
+            raise LLMRecommendationError(f"Error calling LLM: {exc}") from exc
+        return self._parse(prompt, raw_response, keyed)
+
+    def _keyed(self, cache_key: Optional[str]) -> Dict[str, str]:
+        # Only the caching client keys responses by anything but the prompt.
+        if cache_key is None or not isinstance(self.llm_client, CachingLLMClient):
+            return {}
+        return {"cache_key": cache_key}
+
+    def _fingerprint(self, key: str) -> str:
+        # The prompt or cache key pins the candidates, so no store version is needed.
+        model = str(getattr(self.llm_client, "model", type(self.llm_client).__name__))
+        return prompt_fingerprint("", model, getattr(self.llm_client, "temperature", None), key)
+
+    def _parse(
+        self, prompt: str, raw_response: str, keyed: Dict[str, str]
+    ) -> List[RecommendedRestaurant]:
+        try:
+            return parse_recommendations(raw_response)
+        except LLMRecommendationError:
+            # A caching client must not keep serving an unusable response.
+            discard = getattr(self.llm_client, "discard", None)
+            if discard is not None:
+                discard(prompt, **keyed)
+            raise
+
+
+def parse_recommendations(raw_response: str) -> List[RecommendedRestaurant]:
+    """
+    Recommendations from the LLM's JSON array; malformed items are skipped.
+    """
+    try:
+        data = json.loads(raw_response)
+    except json.JSONDecodeError as exc:
+        raise LLMRecommendationError("LLM response was not valid JSON.") from exc
+
+    if not isinstance(data, list):
+        raise LLMRecommendationError("LLM response root must be a JSON array.")
+
+    recommendations: List[RecommendedRestaurant] = []
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        name = item.get("name")
+        if not isinstance(name, str):
+            continue
+
+        recommendations.append(
+            RecommendedRestaurant(
+                name=name,
+                city=item.get("city"),
+                cuisines=item.get("cuisines"),
+                price_for_two=_to_optional_float(item.get("price_for_two")),
+                rating=_to_optional_float(item.get("rating")),
+                reason=item.get("reason"),
             )
+        )
 
-        return recommendations
+    return recommendations
 
 
 def _to_optional_float(value) -> float | None:
@@ -0,0 +1,117 @@
+"""
+Coalescing of identical concurrent calls (Phase 4).
+
+When many users ask for the same popular city and budget at once, every
+request builds the same prompt, and each would otherwise call the LLM.
+A `SingleFlight` lets the first caller for a key (the leader) do the
+work while later callers with the same key (followers) wait for it and
+share its result or its error. Nothing is remembered once the call
+finishes; repeats after that are the response cache's job.
+
+`do` coalesces threads (the sync path), `ado` coroutines on one event
+loop (the async path). In `ado` the shared call runs as its own task, so
+a cancelled caller (e.g. a client that disconnected) never cancels the
+call for the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    leaders: int
+    followers: int
+    in_flight: int
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class _Call:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Thread-safe registry of in-flight calls by key.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[Tuple[int, str], "asyncio.Future[Any]"] = {}
+        self._leaders = 0
+        self._followers = 0
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """
+        Result of `fn()`, run once for all threads calling with `key` at
+        the same time.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._leaders += 1
+            else:
+                self._followers += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as exc:
+                call.error = exc
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Result of `await fn()`, awaited once for all coroutines of the
+        running event loop calling with `key` at the same time.
+        """
+        loop = asyncio.get_running_loop()
+        # Futures belong to one loop; never share them across loops.
+        slot = (id(loop), key)
+        with self._lock:
+            task = self._tasks.get(slot)
+            if task is None:
+                task = self._tasks[slot] = loop.create_task(fn())
+                task.add_done_callback(lambda done: self._forget(slot, done))
+                self._leaders += 1
+            else:
+                self._followers += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> SingleFlightStats:
+        with self._lock:
+            return SingleFlightStats(
+                leaders=self._leaders,
+                followers=self._followers,
+                in_flight=len(self._calls) + len(self._tasks),
+            )
+
+    def _forget(self, slot: Tuple[int, str], task: "asyncio.Future[Any]") -> None:
+        with self._lock:
+            self._tasks.pop(slot, None)
+        # Mark the error retrieved even if every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
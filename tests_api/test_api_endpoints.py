@@ -5,11 +5,23 @@ These tests do NOT call the real Groq API; they use a fake LLM client.
 
 from __future__ import annotations
 
+import os
 from unittest import mock
 
+import pandas as pd
 from fastapi.testclient import TestClient
 
-from api_backend.main import app, _prep_service
+from api_backend.main import (
+    LLM_CACHE,
+    RecommendationRequest,
+    app,
+    current_state,
+    swap_store,
+)
+from phase1_data_ingestion.neighbors import build_neighbor_index
+from phase1_data_ingestion.price_profiles import compute_price_profiles
+from phase1_data_ingestion.storage import InMemoryRestaurantStore
+from phase1_data_ingestion.text_index import build_text_index, iter_text_frames
 from phase2_user_input.models import RawUserInput
 from phase3_integration.service import RecommendationPreparationResult
 from phase4_recommendation.models import RecommendedRestaurant
@@ -34,20 +46,20 @@ def test_cities_endpoint() -> None:
     assert isinstance(data["cities"], list)
 
 
-@mock.patch("api_backend.main.GroqAPIClient")
-def test_recommendations_endpoint_with_fake_llm(mock_groq_client) -> None:
+@mock.patch("api_backend.main.get_groq_client")
+def test_recommendations_endpoint_with_fake_llm(mock_get_groq_client) -> None:
     # Arrange fake prep result by spying on the underlying service.
     # We don't want to actually download the dataset again, so just call
     # the real prep service to get a non-empty candidate set for a known city.
     raw = RawUserInput(city="Bangalore", price_text="800")
-    prep_result: RecommendationPreparationResult = _prep_service.prepare(raw)
+    prep_result: RecommendationPreparationResult = current_state().prep_service.prepare(raw)
 
     if not prep_result.is_valid or prep_result.candidates is None:
         # If validation fails for this test data, just skip.
         return
 
     # Fake LLM client: return deterministic JSON.
-    fake_llm = mock_groq_client.return_value
+    fake_llm = mock_get_groq_client.return_value
     fake_llm.generate.return_value = """
     [
       {"name": "Demo Place", "city": "bangalore", "cuisines": "Indian",
@@ -68,3 +80,227 @@ def test_recommendations_endpoint_with_fake_llm(mock_groq_client) -> None:
         first = data["recommendations"][0]
         assert first["name"] == "Demo Place"
 
+
+
+@mock.patch("api_backend.main.get_groq_client")
+def test_recommendations_reuse_the_ranker_parsed_at_startup(mock_get_groq_client) -> None:
+    mock_get_groq_client.return_value.generate.return_value = "[]"
+
+    with mock.patch.dict(os.environ, {"ZOMATO_SCORE_WEIGHTS": "rating=1,"}):
+        resp = client.post("/recommendations", json={"city": "Bangalore", "price_text": "800"})
+
+    assert resp.status_code == 200
+
+
+def test_swap_store_publishes_new_version_atomically() -> None:
+    original = current_state()
+    in_flight = current_state()
+    new_store = InMemoryRestaurantStore(
+        data=pd.DataFrame(
+            {
+                "name": ["Only Place"],
+                "city": ["testville"],
+                "approx_cost(for two people)": [500.0],
+            }
+        ),
+        version="test-version",
+    )
+
+    try:
+        assert swap_store(new_store)
+        assert not swap_store(new_store)
+
+        assert client.get("/cities").json() == {"cities": ["testville"]}
+        assert client.get("/health").json()["store_version"] == "test-version"
+        # A request that captured the old state keeps reading the old version.
+        assert in_flight.store is original.store
+    finally:
+        swap_store(original.store)
+
+
+def test_recommendations_resolve_city_aliases_and_suggest_typos() -> None:
+    original = current_state()
+    store = InMemoryRestaurantStore(
+        data=pd.DataFrame(
+            {
+                "name": ["Only Place"],
+                "city": ["mumbai"],
+                "location": ["Bandra"],
+                "approx_cost(for two people)": [500.0],
+            }
+        ),
+        version="alias-test",
+    )
+
+    try:
+        swap_store(store)
+        prep = current_state().prep_service.prepare(RawUserInput(city="Bombay", price_text=""))
+        resp = client.post("/recommendations", json={"city": "mumbia"})
+
+        assert prep.is_valid and prep.normalized_input.city == "mumbai"
+        assert resp.status_code == 400
+        assert resp.json()["detail"][0]["suggestions"] == ["mumbai"]
+    finally:
+        swap_store(original.store)
+
+
+def test_recommendations_apply_preference_filters_before_llm() -> None:
+    original = current_state()
+    store = InMemoryRestaurantStore(
+        data=pd.DataFrame(
+            {
+                "name": ["Cafe One", "Bar Two"],
+                "city": ["pune", "pune"],
+                "approx_cost(for two people)": [500.0, 900.0],
+                "aggregate_rating": [4.4, 3.1],
+                "cuisines": ["Cafe, Italian", "North Indian"],
+                "online_order": ["Yes", "No"],
+            }
+        ),
+        version="filter-test",
+    )
+    payload = RecommendationRequest(
+        city="Pune", cuisine="italian", min_rating=4, online_order=True
+    )
+
+    try:
+        swap_store(store)
+        prep = current_state().prep_service.prepare(payload.to_raw_input())
+        empty = client.post("/recommendations", json={"city": "Pune", "cuisine": "thai"})
+        invalid = client.post("/recommendations", json={"city": "Pune", "min_rating": 9})
+
+        assert prep.candidates["name"].tolist() == ["Cafe One"]
+        assert empty.status_code == 200 and empty.json() == {"recommendations": []}
+        assert invalid.status_code == 422
+    finally:
+        swap_store(original.store)
+
+
+def test_price_range_reports_city_profile() -> None:
+    original = current_state()
+    data = pd.DataFrame(
+        {
+            "name": [f"R{i}" for i in range(40)],
+            "city": ["goa"] * 40,
+            "approx_cost(for two people)": [float(100 * (i + 1)) for i in range(40)],
+        }
+    )
+    store = InMemoryRestaurantStore(
+        data=data, version="profile-test", price_profiles=compute_price_profiles(data)
+    )
+
+    try:
+        swap_store(store)
+        goa = client.get("/price-range", params={"city": "Goa"})
+        missing = client.get("/price-range", params={"city": "pune"})
+        prep = current_state().prep_service.prepare(RawUserInput(city="goa", price_text="2000"))
+
+        assert goa.status_code == 200
+        assert goa.json()["quantiles"]["p50"] == 2050.0
+        assert sum(goa.json()["histogram"]["counts"]) == 40
+        assert missing.status_code == 404
+        # A single budget selects about a fifth of the city's restaurants.
+        assert 6 <= len(prep.candidates) <= 10
+    finally:
+        swap_store(original.store)
+
+
+def test_metrics_report_candidate_cache_hits() -> None:
+    original = current_state()
+    store = InMemoryRestaurantStore(
+        data=pd.DataFrame(
+            {
+                "name": ["Only Place"],
+                "city": ["goa"],
+                "approx_cost(for two people)": [500.0],
+            }
+        ),
+        version="cache-test",
+    )
+    raw = RawUserInput(city="Goa", price_text="500")
+
+    try:
+        swap_store(store)
+        before = client.get("/metrics").json()["candidate_cache"]
+        first = current_state().prep_service.prepare(raw)
+        second = current_state().prep_service.prepare(raw)
+        after = client.get("/metrics").json()["candidate_cache"]
+
+        assert first.candidates["name"].tolist() == second.candidates["name"].tolist()
+        assert after["misses"] == before["misses"] + 1
+        assert after["hits"] == before["hits"] + 1
+        assert after["entries"] == 1
+        llm_cache = client.get("/metrics").json()["llm_cache"]
+        assert {"hits", "misses", "memory_hits", "disk_hits", "entries"} <= set(llm_cache)
+        # conftest.py keeps test answers out of the on-disk tier.
+        assert LLM_CACHE.disk is None
+        flights = client.get("/metrics").json()["llm_single_flight"]
+        assert set(flights) == {"leaders", "followers", "in_flight"}
+    finally:
+        swap_store(original.store)
+
+
+def test_search_endpoint_returns_scored_matches() -> None:
+    original = current_state()
+    store = InMemoryRestaurantStore(
+        data=pd.DataFrame(
+            {
+                "name": ["Sky Deck", "Corner Cafe", "Roof Grill", "Dosa Point"],
+                "city": ["pune", "pune", "goa", "goa"],
+                "approx_cost(for two people)": [900.0, 300.0, 800.0, None],
+                "cuisines": ["Biryani", "Cafe", "Kebab", "Biryani"],
+                "reviews_list": ["rooftop views", "quiet", "rooftop bar", "quick"],
+            }
+        ),
+        version="search-test",
+    )
+    store.text_index = build_text_index(iter_text_frames(store))
+
+    try:
+        swap_store(store)
+        everywhere = client.get("/search", params={"q": "biryani", "k": 5})
+        in_goa = client.get("/search", params={"q": "Rooftop", "city": "Goa"})
+
+        assert everywhere.status_code == 200
+        results = everywhere.json()["results"]
+        assert [r["name"] for r in results] == ["Dosa Point", "Sky Deck"]
+        assert results[0]["score"] > results[1]["score"] > 0
+        assert results[0]["price_for_two"] is None
+        assert [r["name"] for r in in_goa.json()["results"]] == ["Roof Grill"]
+    finally:
+        swap_store(original.store)
+
+
+def test_similar_endpoint_serves_precomputed_neighbors() -> None:
+    original = current_state()
+    store = InMemoryRestaurantStore(
+        data=pd.DataFrame(
+            {
+                "restaurant_id": [11, 22, 33, 44],
+                "name": ["Spice Hub", "Bean Bar", "Spice Route", "Goa Shack"],
+                "city": ["pune", "pune", "pune", "goa"],
+                "cuisines": ["North Indian", "Cafe", "North Indian", "Seafood"],
+                "rest_type": ["Casual Dining", "Cafe", "Casual Dining", "Bar"],
+                "approx_cost(for two people)": [600.0, 300.0, 700.0, 900.0],
+                "aggregate_rating": [4.1, 3.8, 4.0, 4.4],
+            }
+        ),
+        version="similar-test",
+    )
+    store.neighbors = build_neighbor_index(store, k=5)
+
+    try:
+        swap_store(store)
+        resp = client.get("/restaurants/11/similar", params={"k": 1})
+        alone = client.get("/restaurants/44/similar")
+        unknown = client.get("/restaurants/99/similar")
+
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["restaurant"]["name"] == "Spice Hub"
+        assert [r["restaurant_id"] for r in data["similar"]] == [33]
+        assert 0 < data["similar"][0]["score"] <= 1
+        assert alone.json()["similar"] == []
+        assert unknown.status_code == 404
+    finally:
+        swap_store(original.store)
@@ -0,0 +1,35 @@
+"""
+Tests for the background store refresher used by the API.
+"""
+
+from __future__ import annotations
+
+import threading
+
+from api_backend.refresher import StoreRefresher
+
+
+def test_store_refresher_counts_swaps() -> None:
+    results = iter([True, False])
+    refresher = StoreRefresher(lambda: next(results), interval_seconds=60)
+
+    assert refresher.run_once()
+    assert not refresher.run_once()
+    assert refresher.refresh_count == 2
+    assert refresher.swap_count == 1
+
+
+def test_store_refresher_runs_in_background_until_stopped() -> None:
+    called = threading.Event()
+
+    def refresh() -> bool:
+        called.set()
+        return True
+
+    refresher = StoreRefresher(refresh, interval_seconds=0.01)
+    refresher.start()
+    try:
+        assert called.wait(timeout=2)
+    finally:
+        refresher.stop()
+    assert refresher.swap_count >= 1
@@ -0,0 +1,33 @@
+"""
+Test setup shared by the API test modules.
+
+Runs before `api_backend.main` is imported: snapshots go to a temporary
+directory, seeded with a small synthetic dataset in place of the Hugging
+Face download, and the LLM response cache is kept in memory, so a test
+run never touches the network or writes into the checkout.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+_SNAPSHOT_DIR = tempfile.mkdtemp(prefix="zomato-snapshots-")
+atexit.register(shutil.rmtree, _SNAPSHOT_DIR, ignore_errors=True)
+os.environ["ZOMATO_SNAPSHOT_DIR"] = _SNAPSHOT_DIR
+os.environ["ZOMATO_LLM_CACHE_PATH"] = ""
+
+from phase1_data_ingestion.pipeline import build_phase1_store  # noqa: E402
+from phase1_data_ingestion.synthetic import SyntheticZomatoGenerator  # noqa: E402
+
+
+class _SyntheticDataset:
+    def to_pandas(self):
+        return SyntheticZomatoGenerator(rows=3_000).load()
+
+
+with mock.patch(
+    "phase1_data_ingestion.data_loader.load_dataset", return_value=_SyntheticDataset()
+):
+    build_phase1_store()
@@ -17,9 +17,9 @@ from api_backend.main import app
 client = TestClient(app)
 
 
-@mock.patch("api_backend.main.GroqAPIClient")
-def test_api_recommendations_end_to_end_with_fake_llm(mock_groq_client) -> None:
-    fake_llm = mock_groq_client.return_value
+@mock.patch("api_backend.main.get_groq_client")
+def test_api_recommendations_end_to_end_with_fake_llm(mock_get_groq_client) -> None:
+    fake_llm = mock_get_groq_client.return_value
     fake_llm.generate.return_value = """
     [
       {"name": "API Demo Place", "city": "bangalore",
@@ -15,7 +15,7 @@ import cli as cli_module
 
 
 def test_cli_end_to_end_with_fake_llm(capsys: pytest.CaptureFixture, monkeypatch: pytest.MonkeyPatch) -> None:
-    # Patch GroqAPIClient inside the cli module to avoid real API calls and
+    # Patch get_groq_client inside the cli module to avoid real API calls and
     # bypass API key checks.
     class FakeGroqClient:
         def generate(self, prompt: str) -> str:
@@ -27,7 +27,7 @@ def test_cli_end_to_end_with_fake_llm(capsys: pytest.CaptureFixture, monkeypatch
             ]
             """
 
-    monkeypatch.setattr(cli_module, "GroqAPIClient", lambda: FakeGroqClient())
+    monkeypatch.setattr(cli_module, "get_groq_client", lambda: FakeGroqClient())
 
     # Act: run CLI main with sample args.
     cli_module.main(["Bangalore", "800"])
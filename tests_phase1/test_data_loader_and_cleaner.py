@@ -10,6 +10,7 @@ from __future__ import annotations
 from unittest import mock
 
 import pandas as pd
+import pytest
 
 from phase1_data_ingestion.config import DatasetConfig
 from phase1_data_ingestion.data_cleaner import DataCleaner, required_columns_present
@@ -71,3 +72,39 @@ def test_required_columns_present_helper() -> None:
     assert required_columns_present(df, ["a", "b"])
     assert not required_columns_present(df, ["a", "c"])
 
+
+
+def test_data_cleaner_parses_ratings_and_compacts_dtypes() -> None:
+    raw_df = pd.DataFrame(
+        {
+            "city": ["Bangalore", "bangalore", "Delhi", "Delhi"],
+            "location": ["BTM", "BTM", "Saket", "Saket"],
+            "online_order": ["Yes", "No", "Yes", "Yes"],
+            "approx_cost(for two people)": ["1,200", "800", "300", "450"],
+            "rate": ["4.1/5", "NEW", "-", " 3.9 /5"],
+            "votes": [775, 0, 12, 40],
+        }
+    )
+
+    cleaned = DataCleaner().clean(raw_df)
+
+    assert isinstance(cleaned["city"].dtype, pd.CategoricalDtype)
+    assert isinstance(cleaned["online_order"].dtype, pd.CategoricalDtype)
+    assert set(cleaned["city"].cat.categories) == {"bangalore", "delhi"}
+    assert cleaned["approx_cost(for two people)"].dtype == "uint16"
+    assert cleaned["votes"].dtype == "uint16"
+
+    ratings = cleaned["aggregate_rating"]
+    assert ratings.dtype == "float32"
+    assert ratings.iloc[0] == pytest.approx(4.1)
+    assert ratings.iloc[1:3].isna().all()
+    assert ratings.iloc[3] == pytest.approx(3.9)
+
+
+def test_data_cleaner_can_skip_dtype_compaction() -> None:
+    raw_df = pd.DataFrame({"city": ["A"], "approx_cost(for two people)": ["100"]})
+
+    cleaned = DataCleaner(compact_dtypes=False).clean(raw_df)
+
+    assert not isinstance(cleaned["city"].dtype, pd.CategoricalDtype)
+    assert cleaned["approx_cost(for two people)"].dtype.itemsize == 8
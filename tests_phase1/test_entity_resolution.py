@@ -0,0 +1,128 @@
+"""
+Tests for restaurant entity resolution in Phase 1.
+"""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from phase1_data_ingestion.config import SnapshotConfig
+from phase1_data_ingestion.data_cleaner import DataCleaner
+from phase1_data_ingestion.entity_resolution import (
+    EntityResolver,
+    compact_ids,
+    split_multi_value,
+)
+from phase1_data_ingestion.pipeline import build_phase1_store
+
+
+def _raw_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": ["Truffles", "truffles ", "Toit", "Truffles", "Meghana Foods"],
+            "address": ["St Marks Rd", "St. Marks Rd", "Indiranagar", "St Marks Rd", "Jayanagar"],
+            "location": ["Church Street"] * 2 + ["Indiranagar", "Church Street", "Jayanagar"],
+            "city": ["Bangalore"] * 5,
+            "approx_cost(for two people)": ["900", "900", "1,500", "900", "600"],
+            "listed_in(type)": ["Delivery", "Dine-out", "Pubs and bars", "Delivery", "Delivery"],
+            "listed_in(city)": ["Church Street", "MG Road", "Indiranagar", "MG Road", "Jayanagar"],
+            "reviews_list": ["r1", "r2", "r3", "r4", "r5"],
+        }
+    )
+
+
+class FakeStreamingDataset:
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._df = df
+
+    def iter(self, batch_size: int):
+        for start in range(0, len(self._df), batch_size):
+            yield self._df.iloc[start : start + batch_size].to_dict(orient="list")
+
+    def to_pandas(self) -> pd.DataFrame:
+        return self._df.copy()
+
+
+def test_resolver_collapses_listings_into_entities() -> None:
+    entities = EntityResolver().resolve(_raw_df())
+
+    assert entities["name"].tolist() == ["Truffles", "Toit", "Meghana Foods"]
+    truffles = entities.iloc[0]
+    assert truffles["listed_in(type)"] == "Delivery, Dine-out"
+    assert truffles["listed_in(city)"] == "Church Street, MG Road"
+    assert split_multi_value(truffles["listed_in(city)"]) == ["Church Street", "MG Road"]
+    # Single-valued fields come from the first listing.
+    assert truffles["reviews_list"] == "r1"
+
+
+def test_restaurant_ids_are_stable_and_distinct() -> None:
+    resolver = EntityResolver()
+    ids = resolver.resolve(_raw_df())["restaurant_id"]
+    reordered = resolver.resolve(_raw_df().iloc[::-1])["restaurant_id"]
+
+    assert ids.is_unique
+    assert ((ids >= 0) & (ids < 2**53)).all()
+    assert set(ids) == set(reordered)
+
+
+def test_ids_that_collide_in_the_low_bits_are_kept_distinct() -> None:
+    keys = np.array([5 + 2**53, 6, 5, 5 + 2**54, 6], dtype=np.uint64)
+
+    ids = compact_ids(keys)
+
+    # 5 keeps its id; the keys colliding with it probe past 6 to 7 and 8.
+    assert ids.tolist() == [7, 6, 5, 8, 6]
+    assert compact_ids(keys[::-1]).tolist() == ids[::-1].tolist()
+
+
+def test_cleaner_with_resolver_keys_rows_by_restaurant_id() -> None:
+    cleaned = DataCleaner(entity_resolver=EntityResolver()).clean(_raw_df())
+
+    assert list(cleaned.columns)[0] == "restaurant_id"
+    assert len(cleaned.index) == 3
+    assert cleaned["approx_cost(for two people)"].tolist() == [900, 1500, 600]
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_streaming_build_resolves_entities_and_keeps_heavy_rows_aligned(
+    mock_load_dataset: mock.MagicMock, tmp_path
+) -> None:
+    mock_load_dataset.return_value = FakeStreamingDataset(_raw_df())
+
+    store = build_phase1_store(
+        snapshot_config=SnapshotConfig(directory=str(tmp_path)),
+        streaming=True,
+        batch_size=2,
+    )
+
+    assert store.data["name"].tolist() == ["Truffles", "Toit", "Meghana Foods"]
+    assert store.take([0, 1, 2])["reviews_list"].tolist() == ["r1", "r3", "r5"]
+    assert store.data["restaurant_id"].is_unique
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_full_and_streamed_builds_agree_when_first_listing_is_unpriced(
+    mock_load_dataset: mock.MagicMock, tmp_path
+) -> None:
+    raw = _raw_df()
+    # Truffles' first listing has no usable price; its others do.
+    raw.loc[0, "approx_cost(for two people)"] = "-"
+    mock_load_dataset.return_value = FakeStreamingDataset(raw)
+
+    full = build_phase1_store(snapshot_config=SnapshotConfig(directory=str(tmp_path / "full")))
+    streamed = build_phase1_store(
+        snapshot_config=SnapshotConfig(directory=str(tmp_path / "streamed")),
+        streaming=True,
+        batch_size=2,
+    )
+
+    columns = ["restaurant_id", "name", "approx_cost(for two people)", "listed_in(type)"]
+    expected = full.take(range(full.count()), columns)
+    # Its first priced listing represents it; the unpriced one is ignored.
+    assert expected["name"].tolist() == ["truffles ", "Toit", "Meghana Foods"]
+    assert expected["listed_in(type)"].tolist()[0] == "Delivery, Dine-out"
+    pd.testing.assert_frame_equal(streamed.take(range(streamed.count()), columns), expected)
+    assert streamed.version == full.version
@@ -0,0 +1,109 @@
+"""
+Tests for the similar-restaurant lists computed at ingest in Phase 1.
+"""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from phase1_data_ingestion.config import SnapshotConfig
+from phase1_data_ingestion.neighbors import build_neighbor_index, city_neighbors
+from phase1_data_ingestion.pipeline import build_phase1_store
+from phase1_data_ingestion.storage import InMemoryRestaurantStore
+
+
+class FakeHFDataset:
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._df = df
+
+    def to_pandas(self) -> pd.DataFrame:
+        return self._df.copy()
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": ["Spice Hub", "Spice Route", "Bean Bar", "Tandoor", "Brew Lab", "Solo"],
+            "city": ["pune", "pune", "pune", "pune", "pune", "goa"],
+            "cuisines": [
+                "North Indian, Biryani",
+                "Biryani, North Indian",
+                "Cafe, Desserts",
+                "North Indian",
+                "Cafe",
+                "Goan",
+            ],
+            "rest_type": ["Casual Dining"] * 2 + ["Cafe", "Casual Dining", "Cafe", "Bar"],
+            "approx_cost(for two people)": [600.0, 650.0, 400.0, 1_800.0, None, 900.0],
+            "aggregate_rating": [4.1, 4.0, 3.9, np.nan, 4.2, 4.5],
+        }
+    )
+
+
+def test_neighbors_stay_within_the_city_and_rank_by_similarity() -> None:
+    index = build_neighbor_index(InMemoryRestaurantStore(data=_frame()), k=3)
+
+    rows, scores = index.similar(0)
+
+    assert index.neighbors.shape == (6, 3)
+    # Same cuisines and type at a similar price first; no self, no Goa.
+    assert rows.tolist() == [1, 3, 4]
+    assert np.all(np.diff(scores) <= 0) and 0 < scores[-1] <= scores[0] <= 1
+    assert index.similar(2)[0][0] == 4
+    assert index.similar(0, k=1)[0].tolist() == [1]
+    # The only restaurant in its city has no neighbors.
+    assert index.similar(5)[0].size == 0
+
+
+def test_parallel_build_matches_serial() -> None:
+    rng = np.random.default_rng(0)
+    rows = 400
+    df = pd.DataFrame(
+        {
+            "city": rng.choice(["pune", "goa", "delhi"], rows),
+            "cuisines": rng.choice(["Cafe", "Chinese, Thai", "North Indian", "Italian"], rows),
+            "rest_type": rng.choice(["Cafe", "Quick Bites", "Casual Dining"], rows),
+            "approx_cost(for two people)": rng.choice([300.0, 500.0, 800.0, 1_500.0], rows),
+            "aggregate_rating": rng.choice([3.5, 3.9, 4.2, 4.6], rows),
+        }
+    )
+    store = InMemoryRestaurantStore(data=df)
+
+    serial = build_neighbor_index(store)
+    parallel = build_neighbor_index(store, workers=2, min_rows=0)
+
+    np.testing.assert_array_equal(serial.neighbors, parallel.neighbors)
+    np.testing.assert_array_equal(serial.scores, parallel.scores)
+
+
+def test_tiled_top_k_matches_brute_force_on_a_city_larger_than_a_tile() -> None:
+    rng = np.random.default_rng(1)
+    # Few distinct points, so most distances tie and ties must break by position.
+    features = rng.integers(0, 3, size=(300, 4)).astype(np.float32)
+
+    local, distances = city_neighbors(features, k=7, block_rows=32, tile_columns=50)
+
+    full = ((features[:, None, :] - features[None, :, :]) ** 2).sum(axis=2)
+    np.fill_diagonal(full, np.inf)
+    expected = np.array([np.lexsort((np.arange(300), row))[:7] for row in full])
+    np.testing.assert_array_equal(local, expected)
+    np.testing.assert_allclose(distances, np.take_along_axis(full, expected, axis=1), atol=1e-5)
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_neighbors_are_stored_with_the_snapshot(mock_load_dataset, tmp_path) -> None:
+    raw = _frame().drop(columns=["aggregate_rating"]).assign(rate="4.0/5")
+    mock_load_dataset.return_value = FakeHFDataset(raw)
+
+    for backend in ("memory", "sqlite", "shared"):
+        config = SnapshotConfig(directory=str(tmp_path / backend), backend=backend)
+        built = build_phase1_store(snapshot_config=config)
+        reopened = build_phase1_store(snapshot_config=config)
+
+        assert reopened.neighbors is not None
+        assert isinstance(reopened.neighbors.neighbors, np.memmap)
+        np.testing.assert_array_equal(reopened.neighbors.neighbors, built.neighbors.neighbors)
+        assert reopened.neighbors.rows == reopened.count()
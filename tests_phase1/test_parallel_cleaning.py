@@ -0,0 +1,51 @@
+"""
+Tests for multi-core cleaning in Phase 1.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from phase1_data_ingestion.data_cleaner import DataCleaner, RowDeduplicator
+from phase1_data_ingestion.parallel import clean_batches_parallel, clean_parallel
+
+
+def _raw_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": ["A", "B", "A", "C", "D", "B", "E", "F", "A"],
+            "city": [" Pune", "Delhi", " Pune", "delhi", "Pune", "Delhi", "PUNE", "Goa", " Pune"],
+            "approx_cost(for two people)": ["1,200", "800", "1,200", "x", "300", "800", "650", "", "1,200"],
+            "rate": ["4.1/5", "NEW", "4.1/5", "-", "3.5/5", "NEW", "4.4/5", "3.0/5", "4.1/5"],
+            "votes": [10, 0, 10, 3, 8, 0, 120, 4, 10],
+        },
+        index=[10, 11, 12, 13, 14, 15, 16, 17, 18],
+    )
+
+
+def test_clean_parallel_output_is_identical_to_serial() -> None:
+    cleaner = DataCleaner()
+
+    expected = cleaner.clean(_raw_df())
+    result = clean_parallel(_raw_df(), cleaner, workers=3, min_rows=0)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_clean_parallel_falls_back_to_serial_for_small_frames() -> None:
+    cleaner = DataCleaner()
+
+    result = clean_parallel(_raw_df(), cleaner, workers=4)
+
+    pd.testing.assert_frame_equal(result, cleaner.clean(_raw_df()))
+
+
+def test_clean_batches_parallel_deduplicates_across_batches() -> None:
+    cleaner = DataCleaner(compact_dtypes=False)
+    raw = _raw_df()
+    batches = [raw.iloc[i : i + 2] for i in range(0, len(raw), 2)]
+
+    cleaned = list(clean_batches_parallel(iter(batches), cleaner, RowDeduplicator(), workers=2))
+
+    names = pd.concat(cleaned)["name"].tolist()
+    assert names == ["A", "B", "D", "E"]
@@ -0,0 +1,102 @@
+"""
+Tests for per-city price profiles computed at ingest in Phase 1.
+"""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from phase1_data_ingestion.config import SnapshotConfig
+from phase1_data_ingestion.pipeline import build_phase1_store
+from phase1_data_ingestion.price_profiles import (
+    PriceProfile,
+    compute_price_profiles,
+    profiles_from_json,
+    profiles_to_json,
+)
+
+
+class FakeHFDataset:
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._df = df
+
+    def to_pandas(self) -> pd.DataFrame:
+        return self._df.copy()
+
+    def iter(self, batch_size: int):
+        for start in range(0, len(self._df), batch_size):
+            yield self._df.iloc[start : start + batch_size].to_dict(orient="list")
+
+
+def test_profile_lookups_are_relative_to_the_city() -> None:
+    cheap = PriceProfile.from_prices(np.arange(100, 600, 5, dtype=float))
+    pricey = PriceProfile.from_prices(np.arange(500, 3000, 25, dtype=float))
+
+    assert cheap.bucket(500) == "high"
+    assert pricey.bucket(500) == "low"
+    assert cheap.percentile_of(cheap.quantiles[10]) == 0.5
+
+    lower, upper = cheap.band(350)
+    # About 10% of the city's restaurants on each side of the budget.
+    assert lower < 350 < upper
+    assert abs(cheap.percentile_of(lower) - 0.4) < 0.01
+    assert abs(cheap.percentile_of(upper) - 0.6) < 0.01
+    # Budgets outside the city's range still include the budget itself.
+    assert cheap.band(5000)[1] == 5000
+
+
+def test_profile_handles_ties_and_round_trips_through_json() -> None:
+    profile = PriceProfile.from_prices(np.array([300.0] * 8 + [800.0, 1200.0, np.nan]))
+
+    assert profile.count == 10
+    assert profile.band(300) == (300.0, 300.0)
+    assert sum(profile.histogram_counts) == 10
+    assert profiles_from_json(profiles_to_json({"pune": profile})) == {"pune": profile}
+
+
+def test_compute_price_profiles_groups_by_city() -> None:
+    df = pd.DataFrame(
+        {
+            "city": pd.Categorical(["pune", "goa", "pune", "delhi"]),
+            "approx_cost(for two people)": [400.0, 900.0, 600.0, np.nan],
+        }
+    )
+
+    profiles = compute_price_profiles(df)
+
+    assert sorted(profiles) == ["goa", "pune"]
+    assert profiles["pune"].quantiles[0] == 400.0
+    assert profiles["pune"].quantiles[-1] == 600.0
+    assert compute_price_profiles(df.drop(columns=["city"])) == {}
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_profiles_are_stored_with_every_snapshot_backend(mock_load_dataset, tmp_path) -> None:
+    mock_load_dataset.return_value = FakeHFDataset(
+        pd.DataFrame(
+            {
+                "name": [f"R{i}" for i in range(30)],
+                "city": ["Pune"] * 20 + ["Goa"] * 10,
+                "approx_cost(for two people)": [str(100 * (i + 1)) for i in range(30)],
+            }
+        )
+    )
+
+    for backend in ("memory", "sqlite", "shared"):
+        config = SnapshotConfig(directory=str(tmp_path / backend), backend=backend)
+        built = build_phase1_store(snapshot_config=config)
+        reopened = build_phase1_store(snapshot_config=config)
+
+        assert sorted(built.price_profiles) == ["goa", "pune"]
+        assert reopened.price_profiles == built.price_profiles
+        assert reopened.price_profiles["goa"].quantiles[0] == 2100.0
+
+    streamed = build_phase1_store(
+        snapshot_config=SnapshotConfig(directory=str(tmp_path / "streamed")),
+        streaming=True,
+        batch_size=7,
+    )
+    assert streamed.price_profiles == built.price_profiles
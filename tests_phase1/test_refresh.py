@@ -0,0 +1,76 @@
+"""
+Tests for store versioning and incremental refresh in Phase 1.
+"""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import pandas as pd
+
+from phase1_data_ingestion.config import SnapshotConfig
+from phase1_data_ingestion.data_cleaner import DataCleaner
+from phase1_data_ingestion.pipeline import build_phase1_store, refresh_phase1_store
+
+
+def _raw_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": ["A", "B", "C", "D"],
+            "city": ["Pune", "Delhi", "Pune", "Goa"],
+            "approx_cost(for two people)": ["1,200", "800", "x", "300"],
+            "reviews_list": ["ra", "rb", "rc", "rd"],
+        }
+    )
+
+
+class FakeHFDataset:
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._df = df
+
+    def to_pandas(self) -> pd.DataFrame:
+        return self._df.copy()
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_refresh_returns_previous_store_when_data_unchanged(
+    mock_load_dataset: mock.MagicMock, tmp_path
+) -> None:
+    mock_load_dataset.return_value = FakeHFDataset(_raw_df())
+    config = SnapshotConfig(directory=str(tmp_path))
+
+    store = build_phase1_store(snapshot_config=config)
+    refreshed = refresh_phase1_store(store, snapshot_config=config)
+
+    assert store.version
+    assert refreshed is store
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_refresh_recleans_only_changed_rows(mock_load_dataset: mock.MagicMock, tmp_path) -> None:
+    mock_load_dataset.return_value = FakeHFDataset(_raw_df())
+    config = SnapshotConfig(directory=str(tmp_path))
+    store = build_phase1_store(snapshot_config=config)
+
+    changed = _raw_df()
+    changed.loc[1, "approx_cost(for two people)"] = "900"
+    changed.loc[4] = ["E", "Pune", "450", "re"]
+    mock_load_dataset.return_value = FakeHFDataset(changed)
+
+    with mock.patch.object(
+        DataCleaner, "normalize", autospec=True, side_effect=DataCleaner.normalize
+    ) as spy:
+        refreshed = refresh_phase1_store(store, snapshot_config=config)
+
+    # Changed row B and new row E are re-cleaned; row C has no price, so
+    # it is dropped before entity resolution and never cleaned.
+    assert sorted(spy.call_args.args[1]["name"]) == ["B", "E"]
+    assert refreshed.version != store.version
+    expected = DataCleaner().clean(changed).reset_index(drop=True)
+    pd.testing.assert_frame_equal(
+        refreshed.take(range(refreshed.count()), list(expected.columns)),
+        expected,
+    )
+    # The rewritten snapshot serves the refreshed version on the next start.
+    assert build_phase1_store(snapshot_config=config).version == refreshed.version
+
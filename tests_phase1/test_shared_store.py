@@ -0,0 +1,79 @@
+"""
+Tests for the cross-process shared store backend in Phase 1.
+"""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import pandas as pd
+
+from phase1_data_ingestion.config import SnapshotConfig
+from phase1_data_ingestion.pipeline import build_phase1_store, refresh_phase1_store
+from phase1_data_ingestion.shared import SharedRestaurantStore
+
+
+def _raw_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": ["A", "B", "C", "D"],
+            "city": ["Pune", "Delhi", "Pune", "Goa"],
+            "approx_cost(for two people)": ["1,200", "800", "x", "300"],
+            "rate": ["4.1/5", "NEW", "3.0/5", "3.5/5"],
+            "reviews_list": ["ra", "rb", "rc", "rd"],
+        }
+    )
+
+
+class FakeHFDataset:
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._df = df
+
+    def to_pandas(self) -> pd.DataFrame:
+        return self._df.copy()
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_workers_attach_to_one_published_copy(mock_load_dataset: mock.MagicMock, tmp_path) -> None:
+    mock_load_dataset.return_value = FakeHFDataset(_raw_df())
+    memory = build_phase1_store(snapshot_config=SnapshotConfig(directory=str(tmp_path / "m")))
+    config = SnapshotConfig(directory=str(tmp_path / "s"), backend="shared")
+
+    publisher = build_phase1_store(snapshot_config=config)
+    with mock.patch("phase1_data_ingestion.snapshot.SnapshotStore.load") as load:
+        worker = build_phase1_store(snapshot_config=config)
+
+    load.assert_not_called()
+    assert mock_load_dataset.call_count == 2
+    assert isinstance(worker, SharedRestaurantStore)
+    assert worker.version == publisher.version == memory.version
+    assert worker.data["name"].tolist() == memory.data["name"].tolist()
+    assert worker.data["city"].tolist() == memory.data["city"].tolist()
+    prices = worker.data["approx_cost(for two people)"].to_numpy()
+    assert not prices.flags.writeable and not prices.flags.owndata
+    assert set(worker.memory_usage().values()) == {0}
+    assert worker.take([1], ["reviews_list"]).iloc[0, 0] == "rb"
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_refresh_publishes_new_version_for_all_workers(
+    mock_load_dataset: mock.MagicMock, tmp_path
+) -> None:
+    mock_load_dataset.return_value = FakeHFDataset(_raw_df())
+    config = SnapshotConfig(directory=str(tmp_path), backend="shared")
+    first_worker = build_phase1_store(snapshot_config=config)
+    second_worker = build_phase1_store(snapshot_config=config)
+
+    changed = _raw_df()
+    changed.loc[1, "approx_cost(for two people)"] = "900"
+    mock_load_dataset.return_value = FakeHFDataset(changed)
+    refreshed = refresh_phase1_store(first_worker, snapshot_config=config)
+    with mock.patch("phase1_data_ingestion.data_loader.HFDatasetLoader.load") as load:
+        attached = refresh_phase1_store(second_worker, snapshot_config=config)
+
+    load.assert_not_called()
+    assert refreshed.version != first_worker.version
+    assert attached.version == refreshed.version
+    assert attached.data["approx_cost(for two people)"].tolist() == [1200, 900, 300]
+    # The old mapping stays readable for requests still using it.
+    assert second_worker.data["approx_cost(for two people)"].tolist() == [1200, 800, 300]
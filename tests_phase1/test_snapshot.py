@@ -0,0 +1,94 @@
+"""
+Tests for Phase 1 cleaned-data snapshots.
+"""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import pandas as pd
+
+from phase1_data_ingestion.config import DatasetConfig, SnapshotConfig
+from phase1_data_ingestion.data_cleaner import DataCleaner
+from phase1_data_ingestion.pipeline import build_phase1_store
+from phase1_data_ingestion.snapshot import SnapshotStore, compute_fingerprint
+
+
+def _raw_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": ["A", "B", "B"],
+            "city": [" Bangalore", "DELHI", "DELHI"],
+            "approx_cost(for two people)": ["1,200", "800", "800"],
+        }
+    )
+
+
+class FakeHFDataset:
+    def to_pandas(self) -> pd.DataFrame:
+        return _raw_df()
+
+
+def test_fingerprint_depends_on_revision_and_cleaner_settings() -> None:
+    cleaner = DataCleaner()
+    base = compute_fingerprint(DatasetConfig(), cleaner)
+
+    assert base == compute_fingerprint(DatasetConfig(), DataCleaner())
+    assert base != compute_fingerprint(DatasetConfig(revision="abc123"), cleaner)
+    assert base != compute_fingerprint(DatasetConfig(), DataCleaner(city_column="town"))
+
+
+def test_snapshot_store_round_trips_dataframe(tmp_path) -> None:
+    snapshots = SnapshotStore(SnapshotConfig(directory=str(tmp_path)))
+    df = DataCleaner().clean(_raw_df())
+
+    assert not snapshots.exists("fp")
+    snapshots.save("fp", df)
+
+    assert snapshots.exists("fp")
+    assert snapshots.read_manifest("fp")["rows"] == len(df)
+    pd.testing.assert_frame_equal(snapshots.load("fp"), df)
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_build_phase1_store_reuses_snapshot_offline(
+    mock_load_dataset: mock.MagicMock, tmp_path
+) -> None:
+    mock_load_dataset.return_value = FakeHFDataset()
+    snapshot_config = SnapshotConfig(directory=str(tmp_path))
+
+    first = build_phase1_store(snapshot_config=snapshot_config)
+    # Simulate being offline: any further download attempt fails.
+    mock_load_dataset.side_effect = ConnectionError("offline")
+    second = build_phase1_store(snapshot_config=snapshot_config)
+
+    assert mock_load_dataset.call_count == 1
+    assert second.count() == first.count() == 2
+    pd.testing.assert_frame_equal(second.data, first.data)
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_indexes_from_another_version_are_not_served(
+    mock_load_dataset: mock.MagicMock, tmp_path
+) -> None:
+    mock_load_dataset.return_value = FakeHFDataset()
+    snapshot_config = SnapshotConfig(directory=str(tmp_path))
+    snapshots = SnapshotStore(snapshot_config)
+    store = build_phase1_store(snapshot_config=snapshot_config)
+    fingerprint = next(p.name for p in tmp_path.iterdir() if p.is_dir())
+    assert store.text_index is not None and store.neighbors is not None
+
+    # Same row count, different data: the old index and lists must not match it.
+    manifest = snapshots.read_manifest(fingerprint)
+    metadata = {"version": "other", "price_profiles": manifest.get("price_profiles")}
+    snapshots.write_manifest(
+        fingerprint,
+        rows=manifest["rows"],
+        columns=manifest["columns"],
+        heavy_columns=manifest["heavy_columns"],
+        metadata=metadata,
+    )
+
+    reloaded = snapshots.load_store(fingerprint)
+    assert reloaded.count() == store.count()
+    assert reloaded.text_index is None and reloaded.neighbors is None
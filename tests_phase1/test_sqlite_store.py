@@ -0,0 +1,90 @@
+"""
+Tests for the SQLite restaurant store backend in Phase 1.
+"""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from phase1_data_ingestion.config import SnapshotConfig
+from phase1_data_ingestion.pipeline import build_phase1_store, refresh_phase1_store
+from phase1_data_ingestion.sqlite_store import SQLiteRestaurantStore
+from phase1_data_ingestion.storage import InMemoryRestaurantStore, RestaurantStore
+
+
+def _raw_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": ["A", "B", "C", "D"],
+            "city": ["Pune", "Delhi", "Pune", "Goa"],
+            "approx_cost(for two people)": ["1,200", "800", "x", "300"],
+            "rate": ["4.1/5", "NEW", "3.0/5", "3.5/5"],
+            "reviews_list": ["ra", "rb", "rc", "rd"],
+        }
+    )
+
+
+class FakeHFDataset:
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._df = df
+
+    def to_pandas(self) -> pd.DataFrame:
+        return self._df.copy()
+
+
+def test_sqlite_store_implements_store_protocol(tmp_path) -> None:
+    source = InMemoryRestaurantStore(
+        data=pd.DataFrame(
+            {
+                "name": ["A", "B", None],
+                "city": pd.Categorical(["pune", "delhi", "pune"]),
+                "aggregate_rating": np.array([4.1, np.nan, 3.0], dtype="float32"),
+            }
+        ),
+        version="v1",
+        row_hashes=np.array([2**63 + 5, 1, 2], dtype=np.uint64),
+    )
+    store = SQLiteRestaurantStore.build(source, tmp_path / "r.sqlite", source.row_hashes)
+
+    assert isinstance(store, RestaurantStore)
+    assert store.version == "v1"
+    assert store.count() == 3
+    assert store.columns == ["name", "city", "aggregate_rating"]
+    assert store.distinct_values("city") == ["pune", "delhi"]
+    assert store.value_range("aggregate_rating") == (3.0, float(np.float32(4.1)))
+    np.testing.assert_array_equal(store.row_hashes, source.row_hashes)
+
+    taken = store.take([2, 0], ["name", "aggregate_rating"])
+    assert pd.isna(taken["name"].iloc[0]) and taken["name"].iloc[1] == "A"
+    assert taken["aggregate_rating"].tolist() == [3.0, float(np.float32(4.1))]
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_sqlite_backend_reopens_database_and_refreshes(
+    mock_load_dataset: mock.MagicMock, tmp_path
+) -> None:
+    mock_load_dataset.return_value = FakeHFDataset(_raw_df())
+    config = SnapshotConfig(directory=str(tmp_path), backend="sqlite")
+
+    first = build_phase1_store(snapshot_config=config)
+    with mock.patch("phase1_data_ingestion.snapshot.SnapshotStore.load") as load:
+        second = build_phase1_store(snapshot_config=config)
+
+    assert isinstance(first, SQLiteRestaurantStore)
+    load.assert_not_called()
+    assert second.version == first.version
+    assert second.head()["name"].tolist() == ["A", "B", "D"]
+    assert "reviews_list" not in second.head().columns
+
+    changed = _raw_df()
+    changed.loc[1, "approx_cost(for two people)"] = "900"
+    mock_load_dataset.return_value = FakeHFDataset(changed)
+    refreshed = refresh_phase1_store(second, snapshot_config=config)
+
+    assert isinstance(refreshed, SQLiteRestaurantStore)
+    assert refreshed.version != second.version
+    row = refreshed.take([1], ["approx_cost(for two people)", "reviews_list"]).iloc[0]
+    assert row.tolist() == [900, "rb"]
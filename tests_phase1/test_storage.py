@@ -0,0 +1,53 @@
+"""
+Tests for Phase 1 storage: column projection and the heavy-text sidecar.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from phase1_data_ingestion.storage import InMemoryRestaurantStore, project_store
+
+
+def _make_store() -> InMemoryRestaurantStore:
+    df = pd.DataFrame(
+        {
+            "name": ["A", "B", "C"],
+            "city": ["bangalore", "delhi", "bangalore"],
+            "approx_cost(for two people)": [300.0, 800.0, 500.0],
+            "reviews_list": ["long review a" * 50, "long review b" * 50, "long review c" * 50],
+            "menu_item": ["[]", "['Dal']", "[]"],
+        }
+    )
+    return InMemoryRestaurantStore(data=df)
+
+
+def test_project_store_keeps_hot_columns_resident(tmp_path) -> None:
+    store = project_store(_make_store(), tmp_path / "heavy.arrow")
+
+    assert "reviews_list" not in store.data.columns
+    assert "menu_item" not in store.data.columns
+    assert list(store.data["name"]) == ["A", "B", "C"]
+    assert set(store.heavy_columns) == {"reviews_list", "menu_item"}
+
+
+def test_projected_store_reads_heavy_rows_lazily(tmp_path) -> None:
+    store = project_store(_make_store(), tmp_path / "heavy.arrow")
+
+    heavy = store.fetch_heavy([2, 0], columns=["reviews_list"])
+
+    assert list(heavy.columns) == ["reviews_list"]
+    assert heavy["reviews_list"].iloc[0].startswith("long review c")
+    assert heavy["reviews_list"].iloc[1].startswith("long review a")
+
+
+def test_memory_usage_reports_mapped_columns_as_non_resident(tmp_path) -> None:
+    full = _make_store()
+    projected = project_store(full, tmp_path / "heavy.arrow")
+
+    resident = projected.memory_usage()
+
+    assert resident["reviews_list"] == 0
+    assert resident["name"] > 0
+    assert projected.mapped_usage()["reviews_list"] > 0
+    assert sum(resident.values()) < sum(full.memory_usage().values())
@@ -0,0 +1,185 @@
+"""
+Tests for the streaming (batch-by-batch) Phase 1 ingestion mode.
+"""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from phase1_data_ingestion.config import SnapshotConfig
+from phase1_data_ingestion.data_cleaner import DataCleaner, RowDeduplicator
+from phase1_data_ingestion.pipeline import build_phase1_store, refresh_phase1_store
+from phase1_data_ingestion.snapshot import SnapshotStore, SnapshotWriter
+
+
+def _raw_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": ["A", "B", "A", "C", "D", "B", "E"],
+            "city": ["Bangalore", "Delhi", "Bangalore", "delhi", "Pune", "Delhi", "Pune"],
+            "approx_cost(for two people)": ["1,200", "800", "1,200", "x", "300", "800", "650"],
+            "rate": ["4.1/5", "NEW", "4.1/5", "-", "3.5/5", "NEW", "4.4/5"],
+            "reviews_list": ["ra", "rb", "ra", "rc", "rd", "rb", "re"],
+        }
+    )
+
+
+class FakeStreamingDataset:
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._df = df
+
+    def iter(self, batch_size: int):
+        for start in range(0, len(self._df), batch_size):
+            yield self._df.iloc[start : start + batch_size].to_dict(orient="list")
+
+
+class FakeDataset(FakeStreamingDataset):
+    """
+    Serves the same rows streamed (`iter`) or whole (`to_pandas`).
+    """
+
+    def to_pandas(self) -> pd.DataFrame:
+        return self._df.copy()
+
+
+def _listings_df() -> pd.DataFrame:
+    # Restaurant A is listed twice (plus an exact repeat) across batches.
+    return pd.DataFrame(
+        {
+            "name": ["A", "B", "A", "C", "A", "D"],
+            "city": ["Pune", "Delhi", "Pune", "Goa", "Pune", "Pune"],
+            "approx_cost(for two people)": ["1,200", "800", "1,200", "300", "1,200", "650"],
+            "listed_in(type)": ["Delivery", "Cafes", "Dine-out", "Delivery", "Delivery", "Pubs"],
+            "reviews_list": ["ra", "rb", "ra2", "rc", "ra", "rd"],
+        }
+    )
+
+
+def test_row_deduplicator_drops_repeats_across_batches() -> None:
+    dedup = RowDeduplicator()
+    first = dedup.filter(pd.DataFrame({"a": [1, 2, 2]}))
+    second = dedup.filter(pd.DataFrame({"a": [2, 3, 1]}))
+
+    assert first["a"].tolist() == [1, 2]
+    assert second["a"].tolist() == [3]
+    assert len(dedup) == 3
+    assert dedup.row_hashes().tolist() == (
+        pd.util.hash_pandas_object(pd.DataFrame({"a": [1, 2, 3]}), index=False).tolist()
+    )
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_streaming_build_matches_in_memory_cleaning(
+    mock_load_dataset: mock.MagicMock, tmp_path
+) -> None:
+    mock_load_dataset.return_value = FakeStreamingDataset(_raw_df())
+
+    store = build_phase1_store(
+        snapshot_config=SnapshotConfig(directory=str(tmp_path)),
+        streaming=True,
+        batch_size=3,
+    )
+
+    assert mock_load_dataset.call_args.kwargs["streaming"] is True
+    expected = DataCleaner().clean(_raw_df()).reset_index(drop=True)
+    assert store.count() == len(expected) == 4
+    assert store.data["name"].tolist() == expected["name"].tolist()
+    assert store.data["city"].tolist() == expected["city"].tolist()
+    assert isinstance(store.data["city"].dtype, pd.CategoricalDtype)
+    assert store.data["approx_cost(for two people)"].tolist() == [1200, 800, 300, 650]
+    assert store.fetch_heavy([0, 3])["reviews_list"].tolist() == ["ra", "re"]
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_streaming_build_without_snapshots(mock_load_dataset: mock.MagicMock) -> None:
+    mock_load_dataset.return_value = FakeStreamingDataset(_raw_df())
+
+    store = build_phase1_store(
+        snapshot_config=SnapshotConfig(enabled=False), streaming=True, batch_size=2
+    )
+
+    assert store.data["name"].tolist() == ["A", "B", "D", "E"]
+
+
+def test_snapshot_writer_builds_indexes_before_the_manifest(tmp_path) -> None:
+    snapshots = SnapshotStore(SnapshotConfig(directory=str(tmp_path)))
+    writer = SnapshotWriter(snapshots, "fp")
+    writer.append(pd.DataFrame({"name": ["A", "B"], "city": ["pune", "goa"]}))
+
+    def crash(store):
+        assert store.count() == 2  # the rows are written, but not published
+        raise RuntimeError("killed while indexing")
+
+    with pytest.raises(RuntimeError):
+        writer.finish(indexes=crash)
+
+    assert not snapshots.exists("fp")
+
+
+@pytest.mark.parametrize("reorder", [False, True])
+def test_snapshot_writer_filters_the_heavy_sidecar_batch_by_batch(tmp_path, reorder) -> None:
+    snapshots = SnapshotStore(SnapshotConfig(directory=str(tmp_path)))
+    writer = SnapshotWriter(snapshots, "fp", heavy_columns=["reviews_list"])
+    for start in range(0, 9, 3):
+        rows = range(start, start + 3)
+        writer.append(
+            pd.DataFrame({"name": [f"n{i}" for i in rows], "reviews_list": [f"r{i}" for i in rows]})
+        )
+
+    def finalize(df: pd.DataFrame) -> pd.DataFrame:
+        kept = df.iloc[[0, 2, 3, 7, 8]]  # drops whole and partial batches
+        return kept.iloc[::-1] if reorder else kept
+
+    writer.finish(finalize=finalize)
+    store = snapshots.load_store("fp")
+
+    expected = [0, 2, 3, 7, 8]
+    if reorder:
+        expected.reverse()
+    assert store.data["name"].tolist() == [f"n{i}" for i in expected]
+    assert store.fetch_heavy(range(5))["reviews_list"].tolist() == [f"r{i}" for i in expected]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_streamed_snapshot_is_versioned_like_a_full_build(
+    mock_load_dataset: mock.MagicMock, tmp_path, workers
+) -> None:
+    mock_load_dataset.return_value = FakeDataset(_listings_df())
+    config = SnapshotConfig(directory=str(tmp_path / "streamed"))
+
+    streamed = build_phase1_store(
+        snapshot_config=config, streaming=True, batch_size=2, workers=workers
+    )
+    full = build_phase1_store(snapshot_config=SnapshotConfig(directory=str(tmp_path / "full")))
+
+    assert streamed.data["name"].tolist() == ["A", "B", "C", "D"]
+    assert streamed.text_index.rows == streamed.neighbors.rows == 4
+    assert streamed.version == full.version
+    assert streamed.row_hashes.tolist() == full.row_hashes.tolist()
+    # A restart loads the same version, and refreshing unchanged data keeps the store.
+    reloaded = build_phase1_store(snapshot_config=config, streaming=True, batch_size=2)
+    assert reloaded.version == streamed.version
+    assert refresh_phase1_store(streamed, snapshot_config=config) is streamed
+
+    # A change to any listing of an entity is a new version.
+    changed = _listings_df()
+    changed.loc[2, "listed_in(type)"] = "Buffet"
+    mock_load_dataset.return_value = FakeDataset(changed)
+    refreshed = refresh_phase1_store(streamed, snapshot_config=config)
+    assert refreshed.version != streamed.version
+    assert refreshed.data["listed_in(type)"].tolist()[0] == "Buffet, Delivery"
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_streamed_build_without_snapshots_is_versioned(mock_load_dataset: mock.MagicMock) -> None:
+    mock_load_dataset.return_value = FakeDataset(_listings_df())
+    config = SnapshotConfig(enabled=False)
+
+    streamed = build_phase1_store(snapshot_config=config, streaming=True, batch_size=2)
+    full = build_phase1_store(snapshot_config=config)
+
+    assert streamed.version == full.version
@@ -0,0 +1,63 @@
+"""
+Tests for the synthetic Zomato-shaped data source in Phase 1.
+"""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import pandas as pd
+
+from phase1_data_ingestion.config import DatasetConfig, SnapshotConfig
+from phase1_data_ingestion.data_cleaner import DataCleaner
+from phase1_data_ingestion.data_loader import HFDatasetLoader
+from phase1_data_ingestion.pipeline import build_phase1_store
+from phase1_data_ingestion.synthetic import SyntheticZomatoGenerator
+
+
+def test_generator_is_deterministic_and_batches_match_full_load() -> None:
+    generator = SyntheticZomatoGenerator(2_500, seed=7, chunk_rows=1_000)
+    full = generator.load()
+
+    assert len(full.index) == 2_500
+    again = SyntheticZomatoGenerator(2_500, seed=7, chunk_rows=1_000).load()
+    pd.testing.assert_frame_equal(full, again)
+    batches = list(generator.iter_batches(batch_size=600))
+    assert [len(b.index) for b in batches] == [600] * 4 + [100]
+    pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), full)
+
+
+def test_generated_data_is_messy_like_the_real_export() -> None:
+    raw = SyntheticZomatoGenerator(5_000).load()
+    prices = raw["approx_cost(for two people)"].dropna()
+
+    assert prices.str.contains(",").any()
+    assert raw["rate"].isin(["NEW", "-"]).any()
+    assert raw["rate"].str.contains(" /5", regex=False).any()
+    assert raw.duplicated().any()
+    assert (raw["city"] != raw["city"].str.strip().str.title()).any()
+
+    cleaned = DataCleaner().clean(raw)
+    assert set(cleaned["city"].unique()) <= {
+        "bangalore", "mumbai", "delhi", "pune", "hyderabad", "chennai", "kolkata"
+    }
+    assert cleaned["aggregate_rating"].between(1.0, 5.0).any()
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_loader_uses_generator_for_synthetic_source(
+    mock_load_dataset: mock.MagicMock, tmp_path
+) -> None:
+    config = DatasetConfig(source="synthetic", synthetic_rows=1_200, synthetic_seed=3)
+
+    df = HFDatasetLoader(config).load()
+    store = build_phase1_store(
+        dataset_config=config,
+        snapshot_config=SnapshotConfig(directory=str(tmp_path)),
+        streaming=True,
+        batch_size=500,
+    )
+
+    mock_load_dataset.assert_not_called()
+    assert len(df.index) == 1_200
+    assert 0 < store.count() < 1_200
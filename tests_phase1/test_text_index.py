@@ -0,0 +1,136 @@
+"""
+Tests for the free-text vector index built at ingest in Phase 1.
+"""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from phase1_data_ingestion.config import SnapshotConfig
+from phase1_data_ingestion.pipeline import build_phase1_store
+from phase1_data_ingestion.storage import InMemoryRestaurantStore
+from phase1_data_ingestion.text_index import TextIndex, build_text_index, iter_text_frames
+
+
+class FakeHFDataset:
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._df = df
+
+    def to_pandas(self) -> pd.DataFrame:
+        return self._df.copy()
+
+    def iter(self, batch_size: int):
+        for start in range(0, len(self._df), batch_size):
+            yield self._df.iloc[start : start + batch_size].to_dict(orient="list")
+
+
+_CUISINES = ["North Indian, Biryani", "Cafe, Desserts", "Chinese, Momos", "Italian, Pizza"]
+_REVIEWS = [
+    "great rooftop seating, good for groups",
+    "cosy place with quiet corners",
+    "quick service and spicy food",
+    "wood fired oven, family friendly",
+]
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": [f"Place {i}" for i in range(rows)],
+            "city": ["Pune", "Goa"] * (rows // 2),
+            "approx_cost(for two people)": [str(200 + 10 * (i % 50)) for i in range(rows)],
+            "cuisines": [_CUISINES[i % 4] for i in range(rows)],
+            "rest_type": ["Casual Dining", "Cafe", "Quick Bites", "Casual Dining"] * (rows // 4),
+            "reviews_list": [_REVIEWS[(i // 4) % 4] for i in range(rows)],
+        }
+    )
+
+
+def _index(df: pd.DataFrame, **kwargs) -> TextIndex:
+    return build_text_index(iter_text_frames(InMemoryRestaurantStore(data=df), 16), **kwargs)
+
+
+def test_search_ranks_rows_sharing_query_terms() -> None:
+    df = _frame(64)
+    index = _index(df)
+
+    (rows, scores), (cafe_rows, _) = index.search(["rooftop biryani", "cafe desserts"], k=5)
+
+    assert index.vectors.dtype == np.int8 and index.rows == 64
+    assert len(rows) == 5 and np.all(np.diff(scores) <= 0)
+    # Rows 0, 16, 32, 48: biryani places with the rooftop review.
+    assert set(rows[:4].tolist()) == {0, 16, 32, 48}
+    assert all("Cafe" in df["cuisines"][row] for row in cafe_rows)
+    # Restricting to positions scores only those rows.
+    (within, _), = index.search(["rooftop biryani"], k=5, positions=np.arange(10, 20))
+    assert within.tolist()[0] == 16 and set(within.tolist()) <= set(range(10, 20))
+    assert index.search(["zanzibar"], k=5)[0][0].size == 0
+
+
+def test_ivf_probing_every_list_matches_exact_search() -> None:
+    index = _index(_frame(256), ivf_lists=8)
+
+    assert index.centroids is not None and index.list_offsets[-1] == 256
+    assert sorted(index.list_rows.tolist()) == list(range(256))
+    exact = index.search(["quick spicy momos"], k=10, positions=np.arange(256))
+    probed = index.search(["quick spicy momos"], k=10, nprobe=8)
+    np.testing.assert_array_equal(exact[0][0], probed[0][0])
+
+
+def test_build_streams_the_store_twice_one_block_at_a_time() -> None:
+    store = InMemoryRestaurantStore(data=_frame(64))
+    frames = iter_text_frames(store, 16)
+    reads = []
+    original_take = store.take
+
+    def counting_take(positions, columns=None):
+        reads.append(len(positions))
+        return original_take(positions, columns)
+
+    with mock.patch.object(store, "take", side_effect=counting_take):
+        index = build_text_index(frames)
+
+    # Two passes of four 16-row blocks; no block is held between passes.
+    assert reads == [16] * 8
+    np.testing.assert_array_equal(index.vectors, _index(_frame(64)).vectors)
+    with pytest.raises(TypeError):
+        build_text_index(iter(list(frames)))
+
+
+def test_index_round_trips_through_disk(tmp_path) -> None:
+    index = _index(_frame(64), ivf_lists=4)
+
+    loaded = TextIndex.load(index.save(tmp_path / "text_index"))
+
+    assert isinstance(loaded.vectors, np.memmap)
+    np.testing.assert_array_equal(loaded.vectors, index.vectors)
+    assert loaded.search(["wood fired pizza"])[0][0].tolist() == (
+        index.search(["wood fired pizza"])[0][0].tolist()
+    )
+    assert TextIndex.load(tmp_path / "missing") is None
+
+
+@mock.patch("phase1_data_ingestion.data_loader.load_dataset")
+def test_index_is_stored_with_every_snapshot_backend(mock_load_dataset, tmp_path) -> None:
+    mock_load_dataset.return_value = FakeHFDataset(_frame(64))
+
+    for backend in ("memory", "sqlite", "shared"):
+        config = SnapshotConfig(directory=str(tmp_path / backend), backend=backend)
+        built = build_phase1_store(snapshot_config=config)
+        reopened = build_phase1_store(snapshot_config=config)
+
+        assert built.text_index is not None and reopened.text_index is not None
+        assert reopened.text_index.rows == reopened.count()
+        np.testing.assert_array_equal(reopened.text_index.vectors, built.text_index.vectors)
+
+    streamed = build_phase1_store(
+        snapshot_config=SnapshotConfig(directory=str(tmp_path / "streamed")),
+        streaming=True,
+        batch_size=7,
+    )
+    assert streamed.text_index is not None
+    assert streamed.text_index.rows == streamed.count()
@@ -0,0 +1,53 @@
+"""
+Tests for the Phase 2 city resolution index.
+"""
+
+from __future__ import annotations
+
+from phase2_user_input.city_resolution import CityResolver
+from phase2_user_input.models import RawUserInput
+from phase2_user_input.validation import InputValidator
+
+
+def _resolver() -> CityResolver:
+    return CityResolver(
+        ["bangalore", "mumbai", "delhi", "pune"],
+        localities={"BTM": "bangalore", "Koramangala 5th Block": "bangalore", "Bandra": "mumbai"},
+    )
+
+
+def test_resolver_handles_exact_alias_locality_and_typos() -> None:
+    resolver = _resolver()
+
+    assert resolver.resolve("  Mumbai ").city == "mumbai"
+    assert resolver.resolve("Bengaluru").city == "bangalore"
+    assert resolver.resolve("New Delhi").method == "alias"
+    assert resolver.resolve("BTM layout").city == "bangalore"
+    assert resolver.resolve("koramangala 5th block, Bangalore").city == "bangalore"
+    fuzzy = resolver.resolve("banglore")
+    assert (fuzzy.city, fuzzy.method) == ("bangalore", "fuzzy")
+
+
+def test_resolver_suggests_instead_of_guessing_unclear_input() -> None:
+    resolver = _resolver()
+
+    unclear = resolver.resolve("mumbia")
+    unknown = resolver.resolve("chennai")
+
+    assert unclear.city is None
+    assert unclear.suggestions[0] == "mumbai"
+    assert unknown.city is None
+    assert unknown.suggestions == []
+
+
+def test_validator_returns_resolved_city_and_suggestions() -> None:
+    validator = InputValidator(resolver=_resolver())
+
+    ok = validator.validate(RawUserInput(city="Bombay", price_text=""))
+    bad = validator.validate(RawUserInput(city="mumbia", price_text=""))
+
+    assert ok.is_valid and ok.resolved_city == "mumbai"
+    assert not bad.is_valid
+    assert bad.resolved_city is None
+    assert bad.errors[0].suggestions == ["mumbai"]
+    assert "Did you mean: mumbai?" in bad.errors[0].message
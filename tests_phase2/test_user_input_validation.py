@@ -4,6 +4,9 @@ Tests for Phase 2 user input validation and normalization.
 
 from __future__ import annotations
 
+import numpy as np
+
+from phase1_data_ingestion.price_profiles import PriceProfile
 from phase2_user_input.models import NormalizedUserInput, RawUserInput
 from phase2_user_input.validation import (
     InputNormalizer,
@@ -88,3 +91,64 @@ def test_normalizer_handles_empty_price() -> None:
     assert normalized.price_range is None
     assert normalized.price_bucket is None
 
+
+
+def test_validator_rejects_bad_rating_and_yes_no_filters() -> None:
+    validator = InputValidator()
+    raw = RawUserInput(
+        city="bangalore",
+        price_text="",
+        min_rating_text="7",
+        online_order_text="maybe",
+        book_table_text="no",
+    )
+
+    result = validator.validate(raw)
+
+    assert not result.is_valid
+    assert {err.field for err in result.errors} == {"min_rating", "online_order"}
+
+
+def test_normalizer_parses_optional_filters() -> None:
+    normalizer = InputNormalizer()
+    raw = RawUserInput(
+        city="Mumbai",
+        price_text="",
+        cuisine_text="Italian, , italian,  Street   Food",
+        min_rating_text="3.5",
+        book_table_text="N",
+        rest_type_text="Cafe",
+        query_text="  Rooftop   place for GROUPS ",
+    )
+
+    normalized = normalizer.normalize(raw)
+
+    assert normalized.cuisines == ["italian", "street food"]
+    assert normalized.min_rating == 3.5
+    assert normalized.online_order is None
+    assert normalized.book_table is False
+    assert normalized.locality is None
+    assert normalized.rest_types == ["cafe"]
+    assert normalized.query == "rooftop place for groups"
+
+
+def test_normalizer_uses_city_price_profiles() -> None:
+    profiles = {
+        "pune": PriceProfile.from_prices(np.arange(100, 600, 5, dtype=float)),
+        "mumbai": PriceProfile.from_prices(np.arange(500, 3000, 25, dtype=float)),
+    }
+    normalizer = InputNormalizer(price_profiles=profiles)
+
+    pune = normalizer.normalize(RawUserInput(city="Pune", price_text="500"))
+    mumbai = normalizer.normalize(RawUserInput(city="Mumbai", price_text="500"))
+    ranged = normalizer.normalize(RawUserInput(city="Mumbai", price_text="500-700"))
+    other = normalizer.normalize(RawUserInput(city="Delhi", price_text="500"))
+
+    assert (pune.price_bucket, mumbai.price_bucket) == ("high", "low")
+    lower, upper = pune.price_range
+    assert lower < 500 < upper and upper - lower < 200
+    # Explicit ranges are kept as given.
+    assert ranged.price_range == (500.0, 700.0)
+    # Cities without a profile fall back to the ±20% band.
+    assert other.price_range == (400.0, 600.0)
+    assert other.price_bucket == "mid"
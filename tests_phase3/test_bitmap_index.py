@@ -0,0 +1,99 @@
+"""
+Tests for the bitmap index over categorical attributes in Phase 3.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from phase1_data_ingestion.storage import InMemoryRestaurantStore
+from phase2_user_input.models import NormalizedUserInput
+from phase3_integration.bitmap_index import BitmapIndex, RowSet
+from phase3_integration.repository import RestaurantRepository
+
+
+def _frame(rows: int = 400) -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    cuisines = ["North Indian", "Chinese", "Thai", "Cafe", "Biryani"]
+    return pd.DataFrame(
+        {
+            "cuisines": [
+                ", ".join(rng.choice(cuisines, size=rng.integers(1, 3), replace=False))
+                for _ in range(rows)
+            ],
+            "online_order": pd.Categorical(rng.choice(["Yes", "No"], size=rows)),
+            # A rare value, stored as row ids rather than a bitset.
+            "location": pd.Categorical(
+                np.where(np.arange(rows) % 97 == 0, "BTM", "Indiranagar")
+            ),
+        }
+    )
+
+
+def test_row_sets_pick_the_smaller_representation() -> None:
+    dense = RowSet.from_mask(np.arange(1000) % 2 == 0)
+    sparse = RowSet.from_mask(np.arange(1000) == 7)
+    positions = np.array([0, 1, 7, 998, 999])
+
+    assert dense.bits is not None and sparse.ids is not None
+    assert dense.contains(positions).tolist() == [True, False, False, True, False]
+    assert sparse.contains(positions).tolist() == [False, False, True, False, False]
+    np.testing.assert_array_equal(
+        np.unpackbits(sparse.to_bits(), count=1000), np.arange(1000) == 7
+    )
+
+
+def test_select_matches_brute_force_masks() -> None:
+    df = _frame()
+    index = BitmapIndex.build(df)
+    tokens = df["cuisines"].str.lower().str.split(", ")
+    expected = np.flatnonzero(
+        tokens.apply(lambda ts: "thai" in ts or "chinese" in ts).to_numpy()
+        & (df["online_order"] == "Yes").to_numpy()
+    )
+    conditions = [("cuisines", ["Thai", "chinese"]), ("online_order", ["yes"])]
+
+    np.testing.assert_array_equal(index.select(conditions), expected)
+    window = np.arange(50, 300)
+    np.testing.assert_array_equal(
+        index.select(conditions, window), expected[(expected >= 50) & (expected < 300)]
+    )
+    np.testing.assert_array_equal(
+        index.select([("location", ["btm"])]), np.arange(0, 400, 97)
+    )
+    assert len(index.select([("cuisines", ["sushi"])])) == 0
+    assert sorted(index.columns) == ["cuisines", "location", "online_order"]
+
+
+def test_build_handles_arrow_dictionary_and_missing_values() -> None:
+    values = pa.array(["Cafe", None, "Bar, Cafe", "Bar"]).dictionary_encode()
+    df = pd.DataFrame({"rest_type": pd.Series(values, dtype=pd.ArrowDtype(values.type))})
+
+    index = BitmapIndex.build(df)
+
+    assert index.values("rest_type") == ["bar", "cafe"]
+    assert index.select([("rest_type", ["cafe"])]).tolist() == [0, 2]
+
+
+def test_repository_gives_same_results_with_and_without_bitmaps() -> None:
+    df = _frame()
+    df["city"] = np.where(np.arange(len(df.index)) % 3 == 0, "pune", "goa")
+    df["approx_cost(for two people)"] = (np.arange(len(df.index)) % 10) * 100.0
+    store = InMemoryRestaurantStore(data=df)
+    with_bitmaps = RestaurantRepository(store=store)
+    regex_only = RestaurantRepository(store=store, bitmaps=BitmapIndex.build(df, columns=()))
+
+    user_input = NormalizedUserInput(
+        city="pune",
+        price_range=(200.0, 700.0),
+        price_bucket=None,
+        cuisines=["chinese", "biryani"],
+        online_order=False,
+        locality="indiranagar",
+    )
+
+    expected = regex_only.get_candidates(user_input).to_frame()
+    assert len(expected.index) > 0
+    pd.testing.assert_frame_equal(with_bitmaps.get_candidates(user_input).to_frame(), expected)
@@ -0,0 +1,96 @@
+"""
+Tests for the versioned LRU cache of Phase 3 candidate sets.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from phase1_data_ingestion.storage import InMemoryRestaurantStore
+from phase2_user_input.models import NormalizedUserInput
+from phase3_integration.candidate_cache import CandidateCache
+from phase3_integration.repository import RestaurantRepository
+
+
+def _query(city: str, cuisines=None) -> NormalizedUserInput:
+    return NormalizedUserInput(
+        city=city, price_range=(100.0, 900.0), price_bucket="mid", cuisines=cuisines or []
+    )
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"name": [f"R{i}" for i in range(rows)], "cost": [1.0] * rows})
+
+
+def test_cache_counts_hits_and_misses_and_evicts_lru() -> None:
+    cache = CandidateCache(max_entries=2)
+    calls = []
+
+    def compute(city):
+        def run():
+            calls.append(city)
+            return _frame(3)
+
+        return run
+
+    cache.get_or_compute("v1", _query("pune"), compute("pune"))
+    cache.get_or_compute("v1", _query("pune"), compute("pune"))
+    cache.get_or_compute("v1", _query("goa"), compute("goa"))
+    # Different filters are a different query.
+    cache.get_or_compute("v1", _query("goa", ["thai"]), compute("goa-thai"))
+    cache.get_or_compute("v1", _query("pune"), compute("pune"))
+
+    assert calls == ["pune", "goa", "goa-thai", "pune"]
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (1, 4, 2, 2)
+
+
+def test_cache_respects_memory_budget() -> None:
+    small = _frame(10)
+    budget = int(small.memory_usage(index=True, deep=True).sum()) * 2
+    cache = CandidateCache(max_entries=100, max_bytes=budget)
+
+    for city in ("a", "b", "c"):
+        cache.get_or_compute("v1", _query(city), lambda: _frame(10))
+    cache.get_or_compute("v1", _query("huge"), lambda: _frame(1000))
+
+    stats = cache.stats()
+    assert stats.entries == 2 and stats.bytes <= budget
+    assert stats.evictions == 1
+
+
+def test_results_are_shared_read_only_and_invalidated_by_new_version() -> None:
+    cache = CandidateCache()
+    cache.activate("v1")
+    first = cache.get_or_compute("v1", _query("pune"), lambda: _frame(2))
+    first.loc[0, "name"] = "changed"
+    second = cache.get_or_compute("v1", _query("pune"), lambda: _frame(0))
+
+    assert second["name"].tolist() == ["R0", "R1"]
+
+    cache.activate("v2")
+    assert cache.stats().entries == 0
+    # A request still running on the old version does not repopulate it.
+    cache.get_or_compute("v1", _query("pune"), lambda: _frame(2))
+    assert cache.stats().entries == 0
+
+
+def test_repository_caches_versioned_stores_only() -> None:
+    df = pd.DataFrame(
+        {
+            "name": ["A", "B"],
+            "city": ["pune", "pune"],
+            "approx_cost(for two people)": [200.0, 500.0],
+        }
+    )
+    cache = CandidateCache()
+    versioned = RestaurantRepository(
+        store=InMemoryRestaurantStore(data=df, version="v1"), cache=cache
+    )
+    unversioned = RestaurantRepository(store=InMemoryRestaurantStore(data=df), cache=cache)
+
+    for repo in (versioned, versioned, unversioned):
+        assert repo.get_candidates(_query("pune"))["name"].tolist() == ["A", "B"]
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 1)
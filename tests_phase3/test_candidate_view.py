@@ -0,0 +1,111 @@
+"""
+Tests for lazy Phase 3 candidate views.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from phase1_data_ingestion.sqlite_store import SQLiteRestaurantStore
+from phase1_data_ingestion.storage import InMemoryRestaurantStore, project_store
+from phase2_user_input.models import NormalizedUserInput
+from phase3_integration.candidate_view import CandidateView
+from phase3_integration.repository import RestaurantRepository
+from phase4_recommendation.ranking import RuleBasedRecommender
+from phase4_recommendation.service import LLMRecommendationService
+
+
+@dataclass
+class RecordingStore(InMemoryRestaurantStore):
+    """
+    In-memory store that records every `take()`.
+    """
+
+    reads: list = field(default_factory=list)
+
+    def take(self, positions, columns=None):
+        self.reads.append((len(positions), None if columns is None else list(columns)))
+        return super().take(positions, columns)
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": [f"R{i}" for i in range(50)],
+            "city": ["pune"] * 50,
+            "approx_cost(for two people)": [float(100 + 10 * i) for i in range(50)],
+            "aggregate_rating": [3.0 + (i % 20) / 10 for i in range(50)],
+            "votes": [i * 7 for i in range(50)],
+            "cuisines": ["Thai"] * 50,
+            "reviews_list": ["long review text"] * 50,
+        }
+    )
+
+
+def _query() -> NormalizedUserInput:
+    return NormalizedUserInput(city="pune", price_range=(200.0, 500.0), price_bucket=None)
+
+
+def test_view_reads_only_requested_rows_and_columns() -> None:
+    store = RecordingStore(data=_frame())
+    view = RestaurantRepository(store=store).get_candidates(_query())
+
+    assert len(view) == 31 and not view.empty
+    assert store.reads == []
+
+    names = view.head(2)["name"].tolist()
+
+    assert names == ["R10", "R11"]
+    assert store.reads == [(2, ["name"])]
+    with pytest.raises(ValueError):
+        view.rows[0] = 0
+
+
+def test_view_take_and_to_frame() -> None:
+    view = CandidateView(InMemoryRestaurantStore(data=_frame()), np.array([5, 7, 9]))
+
+    sub = view.take([2, 0])
+
+    assert sub.rows.tolist() == [9, 5]
+    frame = sub.to_frame(["name", "votes"])
+    assert frame["name"].tolist() == ["R9", "R5"]
+    assert frame.index.tolist() == [0, 1]
+    assert CandidateView(view.store, np.zeros(0, dtype=np.int64)).to_frame().empty
+
+
+def test_views_leave_heavy_columns_out_by_default(tmp_path) -> None:
+    source = InMemoryRestaurantStore(data=_frame(), version="v1")
+    projected = project_store(source, tmp_path / "heavy.arrow", heavy_columns=["reviews_list"])
+    stores = [projected, SQLiteRestaurantStore.build(projected, tmp_path / "r.sqlite")]
+    expected = RestaurantRepository(store=source).get_candidates(_query())
+
+    for store in stores:
+        view = RestaurantRepository(store=store).get_candidates(_query())
+
+        assert view.rows.tolist() == expected.rows.tolist()
+        assert "reviews_list" not in view.columns
+        assert view.head(1)["reviews_list"].tolist() == ["long review text"]
+
+
+def test_ranking_and_prompt_read_a_few_columns_and_rows() -> None:
+    class FakeLLMClient:
+        def generate(self, prompt: str) -> str:
+            return json.dumps([])
+
+    store = RecordingStore(data=_frame())
+    view = RestaurantRepository(store=store).get_candidates(_query())
+    service = LLMRecommendationService(
+        llm_client=FakeLLMClient(), ranker=RuleBasedRecommender(top_k=5)
+    )
+
+    service.recommend(_query(), view)
+
+    scored = {columns[0] for rows, columns in store.reads if rows == len(view)}
+    assert scored == {"approx_cost(for two people)", "aggregate_rating", "votes"}
+    assert store.reads[-1][0] == 5
+    assert "reviews_list" not in store.reads[-1][1]
@@ -0,0 +1,136 @@
+"""
+Tests for query canonicalization.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+
+import pandas as pd
+
+from phase1_data_ingestion.storage import InMemoryRestaurantStore
+from phase2_user_input.models import RawUserInput
+from phase2_user_input.validation import InputNormalizer, InputValidator
+from phase3_integration.canonical import QueryCanonicalizer, candidate_key
+from phase3_integration.repository import RestaurantRepository
+from phase3_integration.service import RecommendationPreparationService
+from phase4_recommendation.llm_cache import CachingLLMClient, LLMResponseCache
+from phase4_recommendation.prompt_builder import build_recommendation_prompt
+from phase4_recommendation.service import LLMRecommendationService
+
+
+def _service(canonical: bool = True) -> RecommendationPreparationService:
+    df = pd.DataFrame(
+        {
+            "name": ["A", "B", "C", "D"],
+            "city": ["bangalore"] * 4,
+            "cuisines": ["Chinese", "North Indian, Chinese", "Italian", "Chinese"],
+            "approx_cost(for two people)": [300.0, 750.0, 800.0, 1500.0],
+        }
+    )
+    repo = RestaurantRepository(store=InMemoryRestaurantStore(data=df))
+    normalizer = InputNormalizer()
+    return RecommendationPreparationService(
+        repository=repo,
+        validator=InputValidator(allowed_cities=["bangalore"]),
+        normalizer=normalizer,
+        canonicalizer=QueryCanonicalizer() if canonical else None,
+    )
+
+
+def _prompt(service: RecommendationPreparationService, **raw) -> str:
+    result = service.prepare(RawUserInput(city="Bangalore", **raw))
+    assert result.is_valid
+    return build_recommendation_prompt(result.normalized_input, result.candidates)
+
+
+def _key(service: RecommendationPreparationService, **raw) -> str:
+    result = service.prepare(RawUserInput(city="Bangalore", **raw))
+    assert result.is_valid and result.cache_key is not None
+    return result.cache_key
+
+
+class CountingLLM:
+    model = "counting"
+    temperature = 0.0
+
+    def __init__(self) -> None:
+        self.prompts: list = []
+
+    def generate(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return json.dumps([{"name": "B"}])
+
+
+def test_budgets_selecting_the_same_rows_share_one_cache_key() -> None:
+    service = _service()
+    budgets = ["800", "790", "700-850", "740-900"]
+
+    keys = {_key(service, price_text=budget) for budget in budgets}
+    result = service.prepare(RawUserInput(city="Bangalore", price_text="700-850"))
+
+    assert len(keys) == 1
+    assert result.candidates["name"].tolist() == ["B", "C"]
+    # The user's budget is kept for ranking.
+    assert result.normalized_input.price_range == (700.0, 850.0)
+    assert _key(service, price_text="750-760") not in keys
+
+    plain = _service(canonical=False)
+    assert plain.prepare(RawUserInput(city="Bangalore", price_text="800")).cache_key is None
+
+
+def test_shared_key_answers_from_one_llm_call_but_ranks_by_each_budget() -> None:
+    service = _service()
+    llm = CountingLLM()
+    recommender = LLMRecommendationService(
+        llm_client=CachingLLMClient(llm, LLMResponseCache(max_entries=8))
+    )
+
+    cheaper = service.prepare(RawUserInput(city="Bangalore", price_text="640-860"))
+    dearer = service.prepare(RawUserInput(city="Bangalore", price_text="740-900"))
+    for result in (cheaper, dearer):
+        recs = recommender.recommend(
+            result.normalized_input, result.candidates, cache_key=result.cache_key
+        )
+        assert [rec.name for rec in recs] == ["B"]
+
+    assert len(llm.prompts) == 1
+    ranker = recommender.ranker
+    by_cheaper = ranker.rank(cheaper.normalized_input, cheaper.candidates)
+    by_dearer = ranker.rank(dearer.normalized_input, dearer.candidates)
+    assert by_cheaper["name"].tolist() == ["B", "C"]
+    assert by_dearer["name"].tolist() == ["C", "B"]
+
+
+def test_multi_valued_filters_are_order_independent() -> None:
+    service = _service()
+
+    first = dict(price_text="", cuisine_text="Chinese, North Indian")
+    second = dict(price_text="", cuisine_text="north indian, chinese")
+
+    assert _prompt(service, **first) == _prompt(service, **second)
+    assert _key(service, **first) == _key(service, **second)
+
+
+def test_key_covers_the_preferences_other_than_the_budget() -> None:
+    service = _service()
+    result = service.prepare(RawUserInput(city="Bangalore", price_text="800"))
+    canonicalizer = QueryCanonicalizer()
+
+    rated = replace(result.normalized_input, min_rating=4.0)
+    rebudgeted = replace(result.normalized_input, price_range=(1.0, 2.0), price_bucket="low")
+
+    assert canonicalizer.key(rated, result.candidates) != result.cache_key
+    assert canonicalizer.key(rebudgeted, result.candidates) == result.cache_key
+
+
+def test_candidate_key_depends_on_the_row_set_only() -> None:
+    service = _service()
+    first = service.prepare(RawUserInput(city="Bangalore", price_text="800")).candidates
+    second = service.prepare(RawUserInput(city="Bangalore", price_text="700-850")).candidates
+    other = service.prepare(RawUserInput(city="Bangalore", price_text="200-400")).candidates
+
+    assert candidate_key(first) == candidate_key(second)
+    assert candidate_key(first) == candidate_key(first.take([1, 0]))
+    assert candidate_key(first) != candidate_key(other)
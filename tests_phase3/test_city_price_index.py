@@ -0,0 +1,55 @@
+"""
+Tests for the city-partitioned, price-sorted index used by Phase 3.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from phase1_data_ingestion.storage import InMemoryRestaurantStore
+from phase2_user_input.models import NormalizedUserInput
+from phase3_integration.city_price_index import CityPriceIndex
+from phase3_integration.repository import RestaurantRepository
+
+
+def test_lookup_matches_full_scan_in_store_order() -> None:
+    rng = np.random.default_rng(0)
+    cities = pd.Series(rng.choice(["pune", "goa", "delhi"], size=500)).astype("category")
+    prices = pd.Series(rng.choice([200.0, 350.0, 500.0, 800.0, np.nan], size=500))
+    index = CityPriceIndex.build(cities, prices)
+
+    windows = [(None, None), (350.0, 800.0), (None, 500.0), (300.0, None), (900.0, 950.0)]
+    for city in ("pune", "goa", "delhi"):
+        for lower, upper in windows:
+            mask = (cities == city).to_numpy().copy()
+            if lower is not None:
+                mask &= (prices >= lower).to_numpy()
+            if upper is not None:
+                mask &= (prices <= upper).to_numpy()
+            expected = np.flatnonzero(mask)
+
+            np.testing.assert_array_equal(index.lookup(city, lower, upper), expected)
+
+    assert len(index.lookup("mumbai", 100.0, 900.0)) == 0
+
+
+def test_repository_uses_index_and_returns_matching_row_ids() -> None:
+    df = pd.DataFrame(
+        {
+            "name": ["A", "B", "C", "D", "E"],
+            "city": ["pune", "goa", "pune", "pune", None],
+            "approx_cost(for two people)": [900.0, 300.0, 300.0, 600.0, 300.0],
+        }
+    )
+    repo = RestaurantRepository(store=InMemoryRestaurantStore(data=df))
+
+    candidates = repo.get_candidates(
+        NormalizedUserInput(city="pune", price_range=(250.0, 650.0), price_bucket=None)
+    )
+
+    assert repo.index is not None
+    assert sorted(repo.index.blocks) == ["goa", "pune"]
+    assert candidates.rows.tolist() == [2, 3]
+    assert candidates["name"].tolist() == ["C", "D"]
+    assert candidates.to_frame().index.tolist() == [0, 1]
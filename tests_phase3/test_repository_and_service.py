@@ -6,7 +6,10 @@ from __future__ import annotations
 
 import pandas as pd
 
+from phase1_data_ingestion.shared import map_shared_frame, write_shared_frame
+from phase1_data_ingestion.sqlite_store import SQLiteRestaurantStore
 from phase1_data_ingestion.storage import InMemoryRestaurantStore
+from phase1_data_ingestion.text_index import build_text_index, iter_text_frames
 from phase2_user_input.models import NormalizedUserInput, RawUserInput
 from phase2_user_input.validation import InputNormalizer, InputValidator
 from phase3_integration.repository import RestaurantRepository
@@ -41,7 +44,7 @@ def test_repository_filters_by_city_and_price_range() -> None:
 
     # Should include only restaurant B (bangalore, 800)
     assert len(candidates) == 1
-    assert candidates.iloc[0]["name"] == "B"
+    assert candidates["name"].tolist() == ["B"]
 
 
 def test_preparation_service_returns_errors_for_invalid_input() -> None:
@@ -83,5 +86,143 @@ def test_preparation_service_produces_candidates_for_valid_input() -> None:
     # only restaurant B (bangalore, 800) matches.
     candidates = result.candidates
     assert len(candidates) == 1
-    assert candidates.iloc[0]["name"] == "B"
+    assert candidates["name"].tolist() == ["B"]
 
+
+
+def test_sqlite_repository_compiles_indexed_query_with_same_results(tmp_path) -> None:
+    # Enough rows for SQLite's planner to prefer the (city, price) index.
+    padding = pd.DataFrame(
+        {
+            "name": [f"P{i}" for i in range(2000)],
+            "city": ["delhi", "pune", "goa", "mumbai"] * 500,
+            "approx_cost(for two people)": [float(50 * (i % 40)) for i in range(2000)],
+        }
+    )
+    source = InMemoryRestaurantStore(
+        data=pd.concat([_make_sample_store().data, padding], ignore_index=True)
+    )
+    store = SQLiteRestaurantStore.build(source, tmp_path / "r.sqlite")
+    memory_repo = RestaurantRepository(store=source)
+    sql_repo = RestaurantRepository(store=store)
+    user_input = NormalizedUserInput(
+        city="bangalore", price_range=(400.0, 2000.0), price_bucket="mid"
+    )
+
+    sql, params = sql_repo.compile_query(user_input)
+    candidates = sql_repo.get_candidates(user_input)
+
+    assert params == ["bangalore", 400.0, 2000.0]
+    assert any("USING INDEX" in step for step in store.explain(sql, params))
+    assert candidates["name"].tolist() == ["B", "D"]
+    assert candidates["name"].tolist() == memory_repo.get_candidates(user_input)["name"].tolist()
+
+
+def _make_filter_store() -> InMemoryRestaurantStore:
+    df = pd.DataFrame(
+        {
+            "name": ["A", "B", "C", "D", "E"],
+            "city": ["bangalore"] * 5,
+            "approx_cost(for two people)": [300.0, 800.0, 500.0, 1500.0, 600.0],
+            "aggregate_rating": [4.5, 3.2, 4.1, None, 4.8],
+            "cuisines": [
+                "North Indian, Chinese",
+                "Chinese",
+                "South Indian",
+                "Indian Chinese, Thai",
+                None,
+            ],
+            "online_order": ["Yes", "No", "Yes", "Yes", "No"],
+            "book_table": ["No", "Yes", "No", "Yes", "Yes"],
+            "location": ["BTM", "Indiranagar", "BTM", "Koramangala", "BTM"],
+            "rest_type": ["Casual Dining, Bar", "Cafe", "Quick Bites", "Bar", "Cafe"],
+        }
+    )
+    for col in ("online_order", "book_table", "location", "rest_type"):
+        df[col] = df[col].astype("category")
+    return InMemoryRestaurantStore(data=df)
+
+
+def test_repository_applies_preference_filters(tmp_path) -> None:
+    store = _make_filter_store()
+    sqlite_store = SQLiteRestaurantStore.build(store, tmp_path / "filters.sqlite")
+    # Shared stores map categoricals as Arrow dictionary columns.
+    shared_path = write_shared_frame(store.data, tmp_path / "filters.arrow", "v1")
+    shared_store = InMemoryRestaurantStore(data=map_shared_frame(shared_path))
+
+    cases = [
+        (dict(cuisines=["chinese"]), ["A", "B"]),
+        (dict(cuisines=["thai", "south indian"]), ["C", "D"]),
+        (dict(min_rating=4.0), ["A", "C", "E"]),
+        (dict(online_order=True, book_table=False), ["A", "C"]),
+        (dict(locality="btm", rest_types=["bar", "cafe"]), ["A", "E"]),
+        (dict(cuisines=["chinese"], min_rating=4.0, locality="btm"), ["A"]),
+    ]
+    for filters, expected in cases:
+        user_input = NormalizedUserInput(
+            city="bangalore", price_range=None, price_bucket=None, **filters
+        )
+        for repo_store in (store, sqlite_store, shared_store):
+            candidates = RestaurantRepository(store=repo_store).get_candidates(user_input)
+            assert candidates["name"].tolist() == expected, (filters, repo_store)
+
+
+def test_preparation_service_normalizes_preference_filters() -> None:
+    service = RecommendationPreparationService(
+        repository=RestaurantRepository(store=_make_filter_store()),
+        validator=InputValidator(allowed_cities=["bangalore"]),
+        normalizer=InputNormalizer(),
+    )
+
+    raw = RawUserInput(
+        city="Bangalore",
+        price_text="",
+        cuisine_text=" Chinese ,north indian",
+        min_rating_text="4",
+        online_order_text="Yes",
+        locality="  BTM ",
+    )
+    result = service.prepare(raw)
+
+    assert result.is_valid
+    assert result.normalized_input is not None
+    assert result.normalized_input.cuisines == ["chinese", "north indian"]
+    assert result.normalized_input.online_order is True
+    assert result.candidates is not None
+    assert result.candidates["name"].tolist() == ["A"]
+
+
+def test_repository_searches_free_text_and_orders_by_query(tmp_path) -> None:
+    df = pd.DataFrame(
+        {
+            "name": ["Sky Deck", "Corner Cafe", "Biryani House", "Roof Grill", "Dosa Point"],
+            "city": ["pune", "pune", "pune", "goa", "pune"],
+            "approx_cost(for two people)": [900.0, 300.0, 500.0, 800.0, 200.0],
+            "cuisines": ["Biryani, Kebab", "Cafe", "Biryani", "Kebab", "South Indian"],
+            "reviews_list": ["rooftop views", "quiet", "busy", "rooftop bar", "quick"],
+        }
+    )
+    store = InMemoryRestaurantStore(data=df)
+    store.text_index = build_text_index(iter_text_frames(store))
+    sqlite_store = SQLiteRestaurantStore.build(store, tmp_path / "text.sqlite")
+    sqlite_store.text_index = store.text_index
+
+    for repo_store in (store, sqlite_store):
+        repo = RestaurantRepository(store=repo_store)
+
+        found = repo.search("rooftop biryani", k=3)
+        assert found["name"].tolist() == ["Sky Deck", "Biryani House", "Roof Grill"]
+        assert repo.search("rooftop", city="goa")["name"].tolist() == ["Roof Grill"]
+
+        user_input = NormalizedUserInput(
+            city="pune", price_range=None, price_bucket=None, query="rooftop biryani"
+        )
+        candidates = repo.get_candidates(user_input)
+        # Every city match stays; the query only orders them.
+        assert candidates["name"].tolist() == [
+            "Sky Deck",
+            "Biryani House",
+            "Corner Cafe",
+            "Dosa Point",
+        ]
+        assert candidates.relevance[1] > 0 and candidates.relevance[2] == 0
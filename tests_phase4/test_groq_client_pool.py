@@ -0,0 +1,118 @@
+"""
+Tests for the pooled, process-wide Groq client.
+
+A local stand-in for the chat completions API counts the TCP connections
+it accepts, so connection reuse can be checked without network access.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List
+
+import pytest
+
+from phase4_recommendation import llm_client
+from phase4_recommendation.llm_client import (
+    GroqAPIClient,
+    HTTPConfig,
+    get_groq_client,
+    reset_groq_client,
+)
+
+
+class FakeCompletionsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    connections: List[int] = []
+    prompts: List[str] = []
+
+    def setup(self) -> None:
+        super().setup()
+        self.connections.append(self.client_address[1])
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.prompts.append(body["messages"][-1]["content"])
+        payload = json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def stand_in_url() -> Iterator[str]:
+    FakeCompletionsHandler.connections = []
+    FakeCompletionsHandler.prompts = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeCompletionsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/openai/v1"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_client_reuses_one_connection_across_calls(stand_in_url: str) -> None:
+    client = GroqAPIClient(api_key="test-key", base_url=stand_in_url)
+
+    replies = [client.generate(f"prompt {i}") for i in range(5)]
+    client.close()
+
+    assert replies == ["ok"] * 5
+    assert FakeCompletionsHandler.prompts == [f"prompt {i}" for i in range(5)]
+    assert len(FakeCompletionsHandler.connections) == 1
+
+
+def test_agenerate_awaits_calls_over_a_bounded_pool(stand_in_url: str) -> None:
+    config = HTTPConfig(max_connections=4, pool_maxsize=4)
+    client = GroqAPIClient(api_key="test-key", base_url=stand_in_url, http=config)
+
+    async def run_all():
+        try:
+            return await asyncio.gather(*(client.agenerate(f"prompt {i}") for i in range(20)))
+        finally:
+            await client.aclose()
+
+    replies = asyncio.run(run_all())
+
+    assert replies == ["ok"] * 20
+    assert sorted(FakeCompletionsHandler.prompts) == sorted(f"prompt {i}" for i in range(20))
+    assert 1 <= len(FakeCompletionsHandler.connections) <= 4
+    assert client.async_client is None
+
+
+def test_pool_settings_come_from_the_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GROQ_POOL_MAXSIZE", "3")
+    monkeypatch.setenv("GROQ_READ_TIMEOUT", "7.5")
+
+    config = HTTPConfig()
+    client = GroqAPIClient(api_key="test-key", http=config)
+
+    assert (config.pool_maxsize, config.read_timeout) == (3, 7.5)
+    assert client.session.get_adapter("https://api.groq.com")._pool_maxsize == 3
+
+
+def test_get_groq_client_returns_one_shared_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    reset_groq_client()
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    with pytest.raises(ValueError):
+        get_groq_client()
+    assert llm_client._CLIENT is None
+
+    monkeypatch.setenv("GROQ_API_KEY", "dummy-key")
+    try:
+        first = get_groq_client()
+        assert get_groq_client() is first
+        reset_groq_client()
+        assert get_groq_client() is not first
+    finally:
+        reset_groq_client()
@@ -0,0 +1,160 @@
+"""
+Tests for the two-tier LLM response cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+
+from phase2_user_input.models import NormalizedUserInput
+from phase4_recommendation.llm_cache import (
+    CachingLLMClient,
+    DiskResponseStore,
+    LLMResponseCache,
+)
+from phase4_recommendation.service import LLMRecommendationError, LLMRecommendationService
+
+
+class CountingLLMClient:
+    def __init__(self, reply: str = "reply", model: str = "m", temperature: float = 0.4) -> None:
+        self.reply = reply
+        self.model = model
+        self.temperature = temperature
+        self.calls = 0
+
+    def generate(self, prompt: str) -> str:
+        self.calls += 1
+        return f"{self.reply}: {prompt}"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_memory_tier_is_an_lru_with_ttl() -> None:
+    clock = FakeClock()
+    cache = LLMResponseCache(max_entries=2, ttl_seconds=60, clock=clock)
+    inner = CountingLLMClient()
+    client = CachingLLMClient(inner, cache)
+
+    assert client.generate("a") == client.generate("a") == "reply: a"
+    client.generate("b")
+    client.generate("c")  # evicts "a"
+    client.generate("a")
+    clock.now += 61
+    client.generate("c")  # expired
+
+    stats = cache.stats()
+    assert inner.calls == 5
+    assert (stats.memory_hits, stats.misses) == (1, 5)
+    assert (stats.evictions, stats.expirations, stats.entries) == (2, 1, 2)
+
+
+def test_key_covers_model_and_temperature() -> None:
+    cache = LLMResponseCache()
+    warm = CountingLLMClient(temperature=0.9)
+    CachingLLMClient(CountingLLMClient(), cache).generate("a")
+    CachingLLMClient(warm, cache).generate("a")
+    CachingLLMClient(CountingLLMClient(model="other"), cache).generate("a")
+
+    assert cache.stats().misses == 3 and warm.calls == 1
+
+
+def test_disk_tier_is_shared_across_caches_and_versions_invalidate(tmp_path) -> None:
+    path = tmp_path / "llm.sqlite"
+    first = LLMResponseCache(disk=DiskResponseStore(path))
+    first.activate("v1")
+    CachingLLMClient(CountingLLMClient(), first).generate("a")
+
+    # Another worker (or a restart) opens the same file.
+    second = LLMResponseCache(disk=DiskResponseStore(path))
+    second.activate("v1")
+    inner = CountingLLMClient()
+    assert CachingLLMClient(inner, second).generate("a") == "reply: a"
+    assert inner.calls == 0 and second.stats().disk_hits == 1
+    assert CachingLLMClient(inner, second).generate("a") == "reply: a"
+    assert second.stats().memory_hits == 1
+
+    second.activate("v2")
+    CachingLLMClient(inner, second).generate("a")
+    assert inner.calls == 1
+    assert second.disk.count() == 1  # only the v2 entry is left
+
+
+def test_rolling_refresh_only_purges_older_versions(tmp_path) -> None:
+    path = tmp_path / "llm.sqlite"
+    old_worker = LLMResponseCache(disk=DiskResponseStore(path))
+    old_worker.activate("v1")
+    new_worker = LLMResponseCache(disk=DiskResponseStore(path))
+    new_worker.activate("v1")
+
+    new_worker.activate("v2")
+    CachingLLMClient(CountingLLMClient(), new_worker).generate("a")
+    CachingLLMClient(CountingLLMClient(), old_worker).generate("a")
+    # A worker restarting on the old version keeps the newer entries.
+    LLMResponseCache(disk=DiskResponseStore(path)).activate("v1")
+    assert new_worker.disk.count() == 2
+
+    # Activating a newer version again purges v1 only.
+    LLMResponseCache(disk=DiskResponseStore(path)).activate("v3")
+    assert new_worker.disk.count() == 0
+
+
+def test_disk_tier_is_capped_and_swept_on_write(tmp_path) -> None:
+    clock = FakeClock()
+    disk = DiskResponseStore(tmp_path / "llm.sqlite", max_entries=3)
+    cache = LLMResponseCache(max_entries=0, ttl_seconds=60, disk=disk, clock=clock)
+    client = CachingLLMClient(CountingLLMClient(), cache)
+
+    for prompt in "abcd":
+        clock.now += 1
+        client.generate(prompt)
+    assert disk.count() == 3
+    assert cache.get(cache.key("m", 0.4, "a")) is None
+
+    clock.now += 61
+    client.generate("e")
+    assert disk.count() == 1
+
+
+def test_unusable_responses_are_not_served_again() -> None:
+    cache = LLMResponseCache()
+    inner = CountingLLMClient(reply="not json")
+    service = LLMRecommendationService(llm_client=CachingLLMClient(inner, cache), ranker=None)
+    user_input = NormalizedUserInput(city="pune", price_range=None, price_bucket=None)
+    candidates = pd.DataFrame({"name": ["A"], "city": ["pune"]})
+
+    for _ in range(2):
+        with pytest.raises(LLMRecommendationError):
+            service.recommend(user_input, candidates)
+
+    assert inner.calls == 2 and cache.stats().entries == 0
+
+
+def test_agenerate_uses_both_tiers(tmp_path) -> None:
+    class AsyncLLMClient(CountingLLMClient):
+        async def agenerate(self, prompt: str) -> str:
+            return json.dumps([{"name": self.generate(prompt)}])
+
+    cache = LLMResponseCache(disk=DiskResponseStore(tmp_path / "llm.sqlite"))
+    inner = AsyncLLMClient()
+    client = CachingLLMClient(inner, cache)
+
+    async def run():
+        return [await client.agenerate("a") for _ in range(3)]
+
+    replies = asyncio.run(run())
+    cache.clear()  # memory only; the disk tier still answers
+    again = asyncio.run(client.agenerate("a"))
+
+    assert len(set(replies + [again])) == 1 and inner.calls == 1
+    stats = cache.stats()
+    assert (stats.misses, stats.memory_hits, stats.disk_hits) == (1, 2, 1)
@@ -4,6 +4,7 @@ Tests for Phase 4 LLMRecommendationService and prompt building.
 
 from __future__ import annotations
 
+import asyncio
 import json
 
 import pandas as pd
@@ -133,3 +134,46 @@ def test_llm_recommendation_service_ignores_malformed_items() -> None:
     assert recommendations[0].price_for_two == 700.0
     assert recommendations[0].rating == 4.0
 
+
+def test_arecommend_holds_thousands_of_pending_llm_calls() -> None:
+    class SlowAsyncLLMClient:
+        def __init__(self, calls: int) -> None:
+            self.pending = 0
+            self.peak = 0
+            self.calls = calls
+            self.release: asyncio.Event | None = None
+
+        async def agenerate(self, prompt: str) -> str:
+            self.pending += 1
+            self.peak = max(self.peak, self.pending)
+            if self.pending == self.calls:
+                self.release.set()
+            await self.release.wait()
+            self.pending -= 1
+            return json.dumps([{"name": "A", "reason": "async"}])
+
+    client = SlowAsyncLLMClient(calls=1_000)
+    service = LLMRecommendationService(llm_client=client, ranker=None)
+
+    async def run_all():
+        client.release = asyncio.Event()
+        return await asyncio.gather(
+            *(service.arecommend(_make_user_input(), _make_candidates_df()) for _ in range(1_000))
+        )
+
+    results = asyncio.run(run_all())
+
+    # Every call was waiting on the LLM at the same time, on one thread.
+    assert client.peak == 1_000
+    assert all(recs[0].reason == "async" for recs in results)
+
+
+def test_arecommend_runs_sync_clients_in_a_worker_thread() -> None:
+    fake_client = FakeLLMClient(response_payload=[{"name": "Valid"}])
+    service = LLMRecommendationService(llm_client=fake_client)
+
+    recommendations = asyncio.run(service.arecommend(_make_user_input(), _make_candidates_df()))
+
+    assert [r.name for r in recommendations] == ["Valid"]
+    assert fake_client.last_prompt is not None
+
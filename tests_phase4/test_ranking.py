@@ -0,0 +1,94 @@
+"""
+Tests for Phase 4 heuristic pre-ranking.
+"""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from phase2_user_input.models import NormalizedUserInput
+from phase4_recommendation.ranking import RuleBasedRecommender, ScoringWeights
+from phase4_recommendation.service import LLMRecommendationService
+
+
+def _user_input(price_range=(400.0, 600.0)) -> NormalizedUserInput:
+    return NormalizedUserInput(city="bangalore", price_range=price_range, price_bucket=None)
+
+
+def _candidates() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": ["Far", "Cheap Top", "Unrated", "Popular", "Plain"],
+            "approx_cost(for two people)": [2000.0, 500.0, 500.0, 550.0, 500.0],
+            "aggregate_rating": [4.9, 4.6, np.nan, 4.2, 3.0],
+            "votes": [50, 10, 10, 5000, 10],
+        }
+    )
+
+
+def test_scores_follow_weighted_formula() -> None:
+    weights = ScoringWeights(rating=1.0, votes=0.5, price_distance=2.0)
+    scores = RuleBasedRecommender(weights=weights).scores(_user_input(), _candidates())
+
+    # "Far": 4.9 + 0.5 * log(51) - 2 * |2000 - 500| / 500
+    assert scores[0] == pytest.approx(4.9 + 0.5 * np.log(51) - 2.0 * 3.0)
+    # Missing ratings take the median of the known ones (4.4).
+    assert scores[2] == pytest.approx(4.4 + 0.5 * np.log(11))
+
+
+def test_rank_keeps_best_top_k_in_score_order() -> None:
+    ranked = RuleBasedRecommender(top_k=3).rank(_user_input(), _candidates())
+
+    assert list(ranked["name"]) == ["Popular", "Cheap Top", "Unrated"]
+    assert list(ranked.index) == [0, 1, 2]
+
+
+@pytest.mark.parametrize("top_k", [1, 3, 7, 40])
+def test_top_positions_match_a_stable_sort_with_ties(top_k: int) -> None:
+    rng = np.random.default_rng(3)
+    # Few distinct ratings, so many rows tie at the top-k boundary.
+    candidates = pd.DataFrame({"aggregate_rating": rng.integers(0, 4, size=50).astype(float)})
+    recommender = RuleBasedRecommender(top_k=top_k)
+
+    scores = recommender.scores(_user_input(price_range=None), candidates)
+    expected = np.argsort(-scores, kind="stable")[:top_k]
+
+    positions = recommender.top_positions(_user_input(price_range=None), candidates)
+    assert positions.tolist() == expected.tolist()
+
+
+def test_rank_without_budget_or_columns() -> None:
+    candidates = _candidates().drop(columns=["votes"])
+    ranked = RuleBasedRecommender(top_k=10).rank(_user_input(price_range=None), candidates)
+
+    assert list(ranked["name"]) == ["Far", "Cheap Top", "Unrated", "Popular", "Plain"]
+    assert RuleBasedRecommender().rank(_user_input(), candidates.iloc[:0]).empty
+
+
+def test_weights_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ZOMATO_SCORE_WEIGHTS", "votes=0.5, price_distance=2")
+    assert ScoringWeights.from_env() == ScoringWeights(rating=1.0, votes=0.5, price_distance=2.0)
+
+    monkeypatch.setenv("ZOMATO_SCORE_WEIGHTS", "stars=1")
+    with pytest.raises(ValueError):
+        ScoringWeights.from_env()
+
+
+def test_service_prompts_with_ranked_candidates() -> None:
+    class FakeLLMClient:
+        last_prompt = ""
+
+        def generate(self, prompt: str) -> str:
+            self.last_prompt = prompt
+            return json.dumps([])
+
+    client = FakeLLMClient()
+    service = LLMRecommendationService(llm_client=client, ranker=RuleBasedRecommender(top_k=1))
+    service.recommend(_user_input(), _candidates())
+
+    assert "Popular" in client.last_prompt
+    assert "Far" not in client.last_prompt
@@ -0,0 +1,135 @@
+"""
+Tests for coalescing identical concurrent LLM calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from phase2_user_input.models import NormalizedUserInput
+from phase4_recommendation.service import LLMRecommendationError, LLMRecommendationService
+from phase4_recommendation.single_flight import SingleFlight
+
+CALLERS = 8
+
+
+class GatedLLMClient:
+    """
+    Answers only once `followers` callers are waiting on the flight, so
+    every caller is concurrent with the one LLM call.
+    """
+
+    def __init__(self, flights: SingleFlight, followers: int, reply=None) -> None:
+        self.flights = flights
+        self.followers = followers
+        self.reply = reply if reply is not None else [{"name": "A", "reason": "shared"}]
+        self.calls = 0
+
+    def _ready(self) -> bool:
+        return self.flights.stats().followers >= self.followers
+
+    def generate(self, prompt: str) -> str:
+        self.calls += 1
+        while not self._ready():
+            time.sleep(0.001)
+        return json.dumps(self.reply)
+
+    async def agenerate(self, prompt: str) -> str:
+        self.calls += 1
+        while not self._ready():
+            await asyncio.sleep(0.001)
+        return json.dumps(self.reply)
+
+
+def _user_input(city: str = "bangalore") -> NormalizedUserInput:
+    return NormalizedUserInput(city=city, price_range=(500.0, 1000.0), price_bucket="mid")
+
+
+def _candidates() -> pd.DataFrame:
+    return pd.DataFrame({"name": ["A", "B"], "approx_cost(for two people)": [600.0, 900.0]})
+
+
+def test_concurrent_threads_share_one_call() -> None:
+    flights = SingleFlight()
+    client = GatedLLMClient(flights, followers=CALLERS - 1)
+    service = LLMRecommendationService(llm_client=client, ranker=None, flights=flights)
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as pool:
+        results = list(
+            pool.map(lambda _: service.recommend(_user_input(), _candidates()), range(CALLERS))
+        )
+
+    assert client.calls == 1
+    assert all(recs[0].reason == "shared" for recs in results)
+    # Each caller gets its own list.
+    assert len({id(recs) for recs in results}) == CALLERS
+    assert flights.stats().to_dict() == {"leaders": 1, "followers": CALLERS - 1, "in_flight": 0}
+
+
+def test_concurrent_coroutines_share_one_call_per_prompt() -> None:
+    flights = SingleFlight()
+    client = GatedLLMClient(flights, followers=2 * (CALLERS - 1))
+    service = LLMRecommendationService(llm_client=client, ranker=None, flights=flights)
+
+    async def run_all():
+        return await asyncio.gather(
+            *(
+                service.arecommend(_user_input(city), _candidates())
+                for city in ("bangalore", "delhi")
+                for _ in range(CALLERS)
+            )
+        )
+
+    results = asyncio.run(run_all())
+
+    # One call per distinct prompt.
+    assert client.calls == 2
+    assert len(results) == 2 * CALLERS
+    assert flights.stats().in_flight == 0
+
+
+def test_errors_are_shared_but_not_remembered() -> None:
+    flights = SingleFlight()
+    client = GatedLLMClient(flights, followers=CALLERS - 1, reply={"not": "a list"})
+    service = LLMRecommendationService(llm_client=client, ranker=None, flights=flights)
+
+    def call(_):
+        with pytest.raises(LLMRecommendationError):
+            service.recommend(_user_input(), _candidates())
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as pool:
+        list(pool.map(call, range(CALLERS)))
+    assert client.calls == 1
+
+    client.reply = [{"name": "B"}]
+    assert [r.name for r in service.recommend(_user_input(), _candidates())] == ["B"]
+    assert client.calls == 2
+
+
+def test_cancelled_leader_does_not_cancel_followers() -> None:
+    flights = SingleFlight()
+    release = threading.Event()
+
+    async def slow_call() -> str:
+        while not release.is_set():
+            await asyncio.sleep(0.001)
+        return "done"
+
+    async def run():
+        leader = asyncio.ensure_future(flights.ado("k", slow_call))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.ado("k", slow_call))
+        await asyncio.sleep(0)
+        leader.cancel()
+        release.set()
+        return await follower, leader.cancelled()
+
+    assert asyncio.run(run()) == ("done", True)
+    assert flights.stats().leaders == 1